@@ -0,0 +1,46 @@
+"""基准脚本共用的统计与环境信息工具。"""
+import os
+import platform
+import resource
+import statistics
+import sys
+from typing import Any, Dict, List
+
+
+def rss_mb() -> float:
+    """当前常驻内存（MB），优先读取 /proc，其他平台回退到峰值 RSS。"""
+    try:
+        with open('/proc/self/statm') as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except Exception:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def summarize_latencies(latencies_ms: List[float]) -> Dict[str, Any]:
+    """每个样本的耗时（毫秒）汇总为吞吐（每秒样本数）与 p50/p99/mean。"""
+    total_s = sum(latencies_ms) / 1000.0
+    return {
+        'samples': len(latencies_ms),
+        'per_sec': round(len(latencies_ms) / total_s, 1) if total_s > 0 else 0.0,
+        'ms_mean': round(statistics.mean(latencies_ms), 3) if latencies_ms else 0.0,
+        'ms_p50': round(percentile(latencies_ms, 50), 3),
+        'ms_p99': round(percentile(latencies_ms, 99), 3),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
@@ -0,0 +1,100 @@
+"""DOCX 提取基准：把合成简历写成 .docx（开头的个人信息放进表格，与常见中文模板一致），
+对比 python-docx（构建完整 Document 后拼接 doc.paragraphs）与 DocxText 的流式提取，报告吞吐与 p50/p99、
+峰值内存增量，以及两者各自漏掉的表格文本行数。
+
+需要 python-docx 生成样本。在仓库根目录运行：
+    python -m Benchmarks.DocxExtractBenchmark --count 40 --pages 10
+"""
+import argparse
+import io
+import time
+import tracemalloc
+from typing import Callable, List
+from Benchmarks.BenchmarkUtils import summarize_latencies, environment
+from Benchmarks.SyntheticResumes import generate_resume
+from Source.Utils.DocxText import extract_docx_text
+
+# 写入表格的开头行数（每行拆成 "标签 | 值" 两个单元格）
+TABLE_LINES = 6
+
+
+def build_docx(text: str) -> bytes:
+    import docx
+    doc = docx.Document()
+    lines = [ln for ln in text.splitlines() if ln.strip()]
+    table = doc.add_table(rows=0, cols=2)
+    for ln in lines[:TABLE_LINES]:
+        label, _, value = ln.partition('：')
+        cells = table.add_row().cells
+        cells[0].text = label if value else ''
+        cells[1].text = value or ln
+    for ln in lines[TABLE_LINES:]:
+        doc.add_paragraph(ln)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def python_docx_text(data: bytes) -> str:
+    import docx
+    doc = docx.Document(io.BytesIO(data))
+    return '\n'.join(p.text for p in doc.paragraphs if p.text)
+
+
+def _time_each(fn: Callable[[bytes], str], docs: List[bytes], repeat: int) -> List[float]:
+    for doc in docs[:3]:
+        fn(doc)
+    latencies = []
+    for _ in range(repeat):
+        for doc in docs:
+            t0 = time.perf_counter()
+            fn(doc)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies
+
+
+def _peak_kb(fn: Callable[[bytes], str], doc: bytes) -> float:
+    tracemalloc.start()
+    fn(doc)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def _missing_table_lines(texts: List[str], extracted: List[str]) -> int:
+    missing = 0
+    for text, out in zip(texts, extracted):
+        for ln in [ln for ln in text.splitlines() if ln.strip()][:TABLE_LINES]:
+            if ln.partition('：')[2].strip() not in out:
+                missing += 1
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the streaming DOCX extractor against python-docx.')
+    parser.add_argument('--count', type=int, default=40, help='number of synthetic resumes')
+    parser.add_argument('--pages', type=int, default=10, help='pages per synthetic resume')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    texts = [generate_resume(args.seed + i, lang='zh', pages=args.pages) for i in range(args.count)]
+    docs = [build_docx(t) for t in texts]
+    targets = (('python-docx', python_docx_text), ('docx-stream', extract_docx_text))
+    size_kb = sum(len(d) for d in docs) / max(1, len(docs)) / 1024
+    print(f"{len(docs)} docs x {args.repeat}, avg {size_kb:.1f} KB (synthetic:zh:{args.pages}pages:seed{args.seed}), "
+          f"{environment()['python']}")
+    print(f"{'target':<12} {'per sec':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KB':>9} {'missed table lines':>19}")
+    means = {}
+    for name, fn in targets:
+        m = summarize_latencies(_time_each(fn, docs, args.repeat))
+        means[name] = m['ms_mean']
+        missed = _missing_table_lines(texts, [fn(d) for d in docs])
+        print(f"{name:<12} {m['per_sec']:>10.1f} {m['ms_p50']:>9.3f} {m['ms_p99']:>9.3f} "
+              f"{_peak_kb(fn, docs[0]):>9.1f} {missed:>19}")
+    if means['docx-stream']:
+        print(f"speedup {means['python-docx'] / means['docx-stream']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""近似重复检测基准：报告 MinHash 签名计算耗时、在 --index-size 条签名的 SQLite 索引中查询近似重复的 p50/p99，
+以及合成简历的几类变体（重新导出的排版差异、刷新日期、调整行序）的召回率与不同简历之间的误报率。
+
+索引中除 --count 份合成简历外，其余为随机签名（与真实的不同简历一样几乎不产生 LSH 候选）。
+
+在仓库根目录运行：
+    python -m Benchmarks.NearDuplicateBenchmark --count 300 --index-size 100000
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from typing import Callable, Dict, List
+from Benchmarks.BenchmarkUtils import summarize_latencies, environment
+from Benchmarks.SyntheticResumes import generate_corpus
+from Source.System.ResumeInput.ResumeParseCache import ResumeParseCache, NEAR_DUP_MIN_SIMILARITY
+from Source.Utils.MinHash import minhash, lsh_keys, pack_signature, MINHASH_SLOTS
+
+_YEAR_RE = re.compile(r'(?<!\d)(20\d\d)(?!\d)')
+
+
+def _reexport(text: str, r: random.Random) -> str:
+    # 另一种导出：每行末尾多出空格、部分行被拆成两行，并带上页眉页码
+    lines = []
+    for ln in text.splitlines():
+        if len(ln) > 20 and r.random() < 0.2:
+            lines.extend([ln[:len(ln) // 2], ln[len(ln) // 2:]])
+        else:
+            lines.append(ln + '  ')
+    return '\n'.join(lines) + '\n第1页共2页'
+
+
+def _refresh_dates(text: str, r: random.Random) -> str:
+    return _YEAR_RE.sub(lambda m: str(int(m.group(1)) + 1), text, count=2)
+
+
+def _reorder(text: str, r: random.Random) -> str:
+    lines = text.splitlines()
+    i = len(lines) // 2
+    return '\n'.join(lines[:i] + lines[i:i + 3][::-1] + lines[i + 3:])
+
+
+VARIANTS: Dict[str, Callable[[str, random.Random], str]] = {
+    're-export': _reexport,
+    'dates': _refresh_dates,
+    'reorder': _reorder,
+}
+
+
+def _fill_index(cache: ResumeParseCache, signatures: Dict[str, tuple]):
+    now = time.time()
+    with cache._db.Transaction() as db:
+        db.ExecuteMany('INSERT OR REPLACE INTO parse_signatures (content_hash, signature, created_at) VALUES (?, ?, ?)',
+                       [(h, pack_signature(sig), now) for h, sig in signatures.items()])
+        db.ExecuteMany('INSERT INTO parse_signature_bands (key, content_hash) VALUES (?, ?)',
+                       [(k, h) for h, sig in signatures.items() for k in set(lsh_keys(sig))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark near-duplicate resume detection.')
+    parser.add_argument('--count', type=int, default=300, help='synthetic resumes')
+    parser.add_argument('--index-size', type=int, default=100000, help='signatures in the index')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    r = random.Random(args.seed)
+    docs = generate_corpus(args.count, args.seed)
+    latencies = []
+    signatures = {}
+    for i, doc in enumerate(docs):
+        t0 = time.perf_counter()
+        signatures[f'doc{i}'] = minhash(doc)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    sig_ms = summarize_latencies(latencies)
+    for i in range(max(0, args.index_size - len(docs))):
+        signatures[f'rand{i}'] = tuple(r.getrandbits(32) for _ in range(MINHASH_SLOTS))
+
+    print(f"{args.count} docs, index {len(signatures)} signatures, threshold {NEAR_DUP_MIN_SIMILARITY}, "
+          f"{environment()['python']}")
+    print(f"signature   p50 {sig_ms['ms_p50']:.3f} ms   p99 {sig_ms['ms_p99']:.3f} ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResumeParseCache(os.path.join(tmp, 'parse_cache.db'))
+        _fill_index(cache, signatures)
+        latencies = []
+        recall: Dict[str, List[bool]] = {name: [] for name in VARIANTS}
+        false_positives = 0
+        for i, doc in enumerate(docs):
+            for name, make in VARIANTS.items():
+                sig = minhash(make(doc, r))
+                t0 = time.perf_counter()
+                found = cache.FindNearDuplicates(sig)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                recall[name].append(bool(found) and found[0][0] == f'doc{i}')
+                false_positives += sum(1 for h, _ in found if h != f'doc{i}')
+        m = summarize_latencies(latencies)
+        print(f"lookup      p50 {m['ms_p50']:.3f} ms   p99 {m['ms_p99']:.3f} ms")
+        for name, hits in recall.items():
+            print(f'recall      {name:<10} {sum(hits) / len(hits):>7.1%}')
+        print(f'false positives {false_positives} in {len(latencies)} lookups')
+        cache._db.Close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""NER 后端基准：对比各后端的模型加载耗时、每份简历的 NER 延迟与常驻内存（RSS）。
+
+在仓库根目录运行：
+    python -m Benchmarks.NerBackendBenchmark --backends hub local quantized onnx --corpus <txt 目录>
+
+每个后端在独立的子进程中加载和运行，RSS 互不干扰；不可用的后端（缺少依赖或模型目录）会报告加载错误。
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import time
+from typing import Any, Dict, List
+from Benchmarks.BenchmarkUtils import rss_mb, percentile
+
+_BUILTIN_SAMPLES = [
+    '张三\n男 | 28岁 | 13558910629\n工作经历\n哲库（ZEKU）科技上海有限公司\n软件开发（高级主管工程师） 2022.12-至今\n'
+    '1. 负责 WiFi/BT 驱动开发与优化\n2. 使用 Python 搭建自动化测试平台\n教育背景\n某某大学 计算机科学 本科 2014-2018',
+    '李四\n邮箱：lisi@example.com\n项目经验\n项目名称：支付网关 2019.03-2021.06\n项目描述：基于 Go 和 Kubernetes 的微服务\n'
+    '负责核心交易链路，业绩提升 30%\n工作经历\n华为技术有限公司 2016.07-2019.02\n后端开发工程师',
+]
+
+
+def _run_backend(backend: str, docs: List[str], repeat: int, queue):
+    from Source.Utils import NerRuntime as ner_runtime
+    from Source.Utils import ResumeParseUtils
+    ner_runtime.NER_BACKEND = backend
+    runtime = ner_runtime.NerRuntime()
+    ResumeParseUtils._NER_RUNTIME = runtime
+    rss_before = rss_mb()
+    runtime.Warmup(background=False)
+    status = runtime.Status()
+    report: Dict[str, Any] = {
+        'backend': backend,
+        'model': status['model'],
+        'load_seconds': status['load_seconds'],
+        'rss_before_mb': round(rss_before, 1),
+        'rss_loaded_mb': round(rss_mb(), 1),
+    }
+    if status['status'] != ner_runtime.NER_STATUS_LOADED:
+        report['error'] = status['last_error']
+        queue.put(report)
+        return
+    # 预热一次推理（首批次会触发算子初始化）
+    ResumeParseUtils._run_ner_batch(docs[:1])
+    latencies = []
+    entity_counts = []
+    for _ in range(repeat):
+        for doc in docs:
+            t0 = time.perf_counter()
+            ents = ResumeParseUtils._run_ner_batch([doc])[0]
+            latencies.append((time.perf_counter() - t0) * 1000)
+            entity_counts.append(len(ents))
+    report.update({
+        'docs': len(docs) * repeat,
+        'ms_mean': round(statistics.mean(latencies), 2),
+        'ms_p50': round(percentile(latencies, 50), 2),
+        'ms_p99': round(percentile(latencies, 99), 2),
+        'entities_per_doc': round(statistics.mean(entity_counts), 2),
+        'rss_after_mb': round(rss_mb(), 1),
+        'rss_peak_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    })
+    queue.put(report)
+
+
+def load_corpus(path: str, limit: int) -> List[str]:
+    if not path:
+        return list(_BUILTIN_SAMPLES)
+    docs = []
+    for fn in sorted(glob.glob(os.path.join(path, '*.txt')))[:limit]:
+        with open(fn, encoding='utf-8') as fh:
+            docs.append(fh.read())
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare NER backends: load time, per-resume latency and RSS.')
+    parser.add_argument('--backends', nargs='+', default=['hub', 'local', 'quantized', 'onnx'])
+    parser.add_argument('--corpus', default='', help='directory of extracted resume .txt files (default: built-in samples)')
+    parser.add_argument('--limit', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', default='', help='optional path to write the report as JSON')
+    args = parser.parse_args()
+
+    docs = load_corpus(args.corpus, args.limit)
+    ctx = multiprocessing.get_context('spawn')
+    reports = []
+    for backend in args.backends:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_backend, args=(backend, docs, args.repeat, queue))
+        proc.start()
+        proc.join()
+        try:
+            reports.append(queue.get(timeout=5))
+        except Exception:
+            reports.append({'backend': backend, 'error': f'exit code {proc.exitcode}'})
+
+    header = f"{'backend':<10} {'load s':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'RSS MB':>8} {'peak MB':>8}"
+    print(header)
+    for r in reports:
+        if r.get('error'):
+            print(f"{r['backend']:<10} error: {r['error']}")
+            continue
+        print(f"{r['backend']:<10} {r['load_seconds']:>8.2f} {r['ms_p50']:>8.2f} {r['ms_p99']:>8.2f} "
+              f"{r['ms_mean']:>8.2f} {r['rss_after_mb']:>8.1f} {r['rss_peak_mb']:>8.1f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(reports, fh, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""ResumeParse 文本规范化基准：对比原先的逐步清洗（约十遍全文 re.sub + 逐行页码/十六进制检查）
+与 normalize_resume_text + label_lines 的去噪部分，在长文本（默认 50 页的合成简历）上报告吞吐与 p50/p99，
+并逐篇校验两者输出的文本与清洗后的行完全一致。
+
+在仓库根目录运行：
+    python -m Benchmarks.NormalizeBenchmark --count 40 --pages 50
+"""
+import argparse
+import re
+import time
+from typing import List, Tuple
+from Benchmarks.BenchmarkUtils import summarize_latencies, environment
+from Benchmarks.NerBackendBenchmark import load_corpus
+from Benchmarks.SyntheticResumes import generate_resume
+from Source.Utils import ResumeParseUtils
+
+
+def legacy_normalize(text: str) -> Tuple[str, List[str]]:
+    """原 ResumeParse 开头的清洗步骤（保留作对照），返回 (清洗后的全文, 去噪后的行)。"""
+    s = re.sub(r"\r", "\n", text or "").strip()
+    s = s.replace('​', '')
+    s = re.sub(r'([一-鿿])\s+(?=[一-鿿])', r"\1", s)
+    s = re.sub(r'第\s*\d+\s*页\s*共\s*\d+\s*页', '', s)
+    s = re.sub(r'第\s*\d+\s*页', '', s)
+    s = re.sub(r'共\s*\d+\s*页', '', s)
+    s = re.sub(r'Page\s*\d+', '', s, flags=re.I)
+    s = re.sub(r'[A-Fa-f0-9]{16,}', '', s)
+    s = re.sub(r'~{2,}', '', s)
+    s = re.sub(r"\b[A-Za-z0-9_\-]{12,}\b", '', s)
+    s = re.sub(r'\[object Object\]', '', s, flags=re.I)
+    clean_lines = []
+    long_hex_re = re.compile(r'[A-Fa-f0-9]{12,}')
+    page_re = re.compile(r'第\s*\d+\s*页|共\s*\d+\s*页|Page\s*\d+', re.I)
+    punct_re = re.compile(r'^[\W_~]+$')
+    for ln in s.splitlines():
+        t = ln.strip()
+        if not t:
+            clean_lines.append('')
+            continue
+        if page_re.search(t) or long_hex_re.search(t):
+            continue
+        if punct_re.match(t) and len(t) > 4:
+            continue
+        if len(t) < 4 and not re.search(r'[一-鿿A-Za-z0-9]', t):
+            continue
+        clean_lines.append(t)
+    return s, clean_lines
+
+
+def fused_normalize(text: str) -> Tuple[str, List[str]]:
+    s, line_noise = ResumeParseUtils.normalize_resume_text(text)
+    clean_lines = []
+    for ln in s.splitlines():
+        t = ln.strip()
+        if not t:
+            clean_lines.append('')
+        elif not ResumeParseUtils._is_noise_line(t, line_noise):
+            clean_lines.append(t)
+    return s, clean_lines
+
+
+def _time_each(fn, docs: List[str], repeat: int) -> List[float]:
+    for doc in docs[:3]:
+        fn(doc)
+    latencies = []
+    for _ in range(repeat):
+        for doc in docs:
+            t0 = time.perf_counter()
+            fn(doc)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the fused ResumeParse text normalizer against the legacy passes.')
+    parser.add_argument('--count', type=int, default=40, help='number of synthetic resumes')
+    parser.add_argument('--pages', type=int, default=50, help='pages per synthetic resume')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus', default='', help='directory of .txt resumes instead of the synthetic corpus')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus:
+        docs = load_corpus(args.corpus, args.count)
+    else:
+        docs = [generate_resume(args.seed + i, pages=args.pages) for i in range(args.count)]
+    mismatches = [i for i, doc in enumerate(docs) if legacy_normalize(doc) != fused_normalize(doc)]
+
+    legacy = summarize_latencies(_time_each(legacy_normalize, docs, args.repeat))
+    fused = summarize_latencies(_time_each(fused_normalize, docs, args.repeat))
+    chars = sum(len(d) for d in docs) // max(1, len(docs))
+    print(f"{len(docs)} docs x {args.repeat}, avg {chars} chars "
+          f"({args.corpus or f'synthetic:{args.pages}pages:seed{args.seed}'}), {environment()['python']}")
+    print(f"{'target':<10} {'per sec':>10} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for name, m in (('legacy', legacy), ('fused', fused)):
+        print(f"{name:<10} {m['per_sec']:>10.1f} {m['ms_p50']:>9.3f} {m['ms_p99']:>9.3f} {m['ms_mean']:>9.3f}")
+    if legacy['ms_mean']:
+        print(f"speedup {legacy['ms_mean'] / fused['ms_mean']:.2f}x")
+    if mismatches:
+        print(f'OUTPUT MISMATCH on {len(mismatches)} docs: {mismatches[:10]}')
+        raise SystemExit(1)
+    print('outputs identical')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""解析模式基准：在同一语料上分别以 accurate 与 fast 模式运行 ResumeParse，报告吞吐与 p50/p99、
+fast 相对 accurate 的加速比，以及两种模式输出的逐字段一致率（fast 模式的目标是不低于 accurate 的 10 倍吞吐）。
+
+每次解析前清空块记忆，使两种模式都按首次解析计时。accurate 模式在 NER 模型可加载时使用 NER，
+否则按无 NER 运行并注明原因（此时加速比只反映跳过 jieba 与词表识别的差异）。
+
+在仓库根目录运行：
+    python -m Benchmarks.ParseModeBenchmark --count 300
+    python -m Benchmarks.ParseModeBenchmark --corpus Saved/Benchmarks/corpus --count 500
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from Benchmarks.BenchmarkUtils import summarize_latencies, environment
+from Benchmarks.NerBackendBenchmark import load_corpus
+from Benchmarks.SyntheticResumes import generate_corpus
+from Source.Utils import ResumeParseUtils
+from Source.Utils.NerRuntime import NER_STATUS_LOADED
+from Source.Utils.ResumeParseUtils import ResumeParseResult, PARSE_MODE_ACCURATE, PARSE_MODE_FAST
+
+# 参与一致率统计的字段：联系方式逐项比较，经历按结构化结果中的公司/时间序列比较
+FIELDS: List[Tuple[str, Callable[[ResumeParseResult], Any]]] = [
+    ('name', lambda r: r.name),
+    ('age', lambda r: r.age),
+    ('sex', lambda r: r.sex),
+    ('phone', lambda r: r.phone),
+    ('email', lambda r: r.email),
+    ('careers', lambda r: len(r.careers)),
+    ('companies', lambda r: [c.get('company') for c in r.careers_struct]),
+    ('periods', lambda r: [c.get('period') for c in r.careers_struct]),
+    ('education', lambda r: r.education),
+]
+
+
+def _time_mode(docs: List[str], mode: str) -> Tuple[List[float], List[ResumeParseResult]]:
+    for doc in docs[:3]:
+        ResumeParseUtils.ResumeParse(doc, mode=mode)
+    latencies = []
+    results = []
+    for doc in docs:
+        ResumeParseUtils.clear_block_memo()
+        t0 = time.perf_counter()
+        results.append(ResumeParseUtils.ResumeParse(doc, mode=mode))
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies, results
+
+
+def agreement(accurate: List[ResumeParseResult], fast: List[ResumeParseResult]) -> Dict[str, float]:
+    """各字段在两种模式下取值相同的文档比例；all 为全部字段都相同的比例。"""
+    n = max(1, len(accurate))
+    rates = {}
+    same_all = [True] * len(accurate)
+    for name, get in FIELDS:
+        same = [get(a) == get(f) for a, f in zip(accurate, fast)]
+        rates[name] = sum(same) / n
+        same_all = [x and y for x, y in zip(same_all, same)]
+    rates['all'] = sum(same_all) / n
+    # 宽松的公司一致率：逐条公司名相同或一方包含另一方（无 NER 时 accurate 常把整行作为公司名）
+    rates['companies~'] = sum(_companies_overlap(a, f) for a, f in zip(accurate, fast)) / n
+    return rates
+
+
+def _companies_overlap(a: ResumeParseResult, f: ResumeParseResult) -> bool:
+    ca = [c.get('company') or '' for c in a.careers_struct]
+    cf = [c.get('company') or '' for c in f.careers_struct]
+    return len(ca) == len(cf) and all(x == y or (x and y and (x in y or y in x)) for x, y in zip(ca, cf))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ResumeParse accurate and fast modes: throughput and agreement.')
+    parser.add_argument('--count', type=int, default=200, help='number of synthetic resumes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus', default='', help='directory of .txt resumes instead of the synthetic corpus')
+    args = parser.parse_args()
+
+    docs = load_corpus(args.corpus, args.count) if args.corpus else generate_corpus(args.count, args.seed)
+    ResumeParseUtils._NER_RUNTIME.Warmup(background=False)
+    status = ResumeParseUtils._NER_RUNTIME.Status()
+    ner_note = '' if status['status'] == NER_STATUS_LOADED else \
+        f" (without NER: {status['last_error'] or status['status']})"
+    print(f"{len(docs)} docs ({args.corpus or f'synthetic:{args.count}:seed{args.seed}'}), {environment()['python']}")
+    print(f"{'mode':<10} {'per sec':>10} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    try:
+        timings = {}
+        outputs = {}
+        for mode in (PARSE_MODE_ACCURATE, PARSE_MODE_FAST):
+            latencies, outputs[mode] = _time_mode(docs, mode)
+            m = timings[mode] = summarize_latencies(latencies)
+            note = ner_note if mode == PARSE_MODE_ACCURATE else ''
+            print(f"{mode:<10} {m['per_sec']:>10.1f} {m['ms_p50']:>9.3f} {m['ms_p99']:>9.3f} {m['ms_mean']:>9.3f}{note}")
+    finally:
+        ResumeParseUtils.clear_block_memo()
+    print(f"speedup {timings[PARSE_MODE_FAST]['per_sec'] / timings[PARSE_MODE_ACCURATE]['per_sec']:.1f}x")
+    print('agreement (fast vs accurate):')
+    for name, rate in agreement(outputs[PARSE_MODE_ACCURATE], outputs[PARSE_MODE_FAST]).items():
+        print(f'  {name:<10} {rate:>7.1%}')
+
+
+if __name__ == '__main__':
+    main()
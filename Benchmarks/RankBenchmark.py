@@ -0,0 +1,92 @@
+"""职位描述排序基准：用合成简历的解析结果拼出 --count 份简历写入临时简历库，
+报告入库吞吐、排序索引首次载入耗时与内存、top-k 查询的 p50/p99，以及单份简历提交后增量加入索引的耗时。
+
+每份入库简历由两份模板简历的职业经历拼接而成（教育经历与联系方式取自第一份），
+模板由 ResumeParse（fast 模式）解析 --templates 份合成简历得到。
+
+在仓库根目录运行：
+    python -m Benchmarks.RankBenchmark --count 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List
+from Benchmarks.BenchmarkUtils import summarize_latencies, environment, rss_mb
+from Benchmarks.SyntheticResumes import generate_corpus
+from Source.System.ResumeStore.ResumeStore import ResumeStore
+from Source.Utils.ResumeParseUtils import ResumeParse, PARSE_MODE_FAST
+
+JOB_DESCRIPTIONS = [
+    '招聘后端开发工程师：熟悉 Python/Django 或 Go，有 MySQL、Redis、Kafka 使用经验，了解 Docker 与 Kubernetes，'
+    '负责支付网关与风控系统的设计和开发，本科及以上学历，计算机相关专业。',
+    '嵌入式软件工程师：精通 C/C++，熟悉 Linux 驱动开发与 OpenWrt，有 WiFi、蓝牙、5G 模组或以太网协议栈经验者优先。',
+    '算法工程师：负责推荐与日志分析平台，熟悉 Python、Spark、TensorFlow 或 PyTorch，硕士优先。',
+    'Senior Backend Engineer: Java, Spring Boot, Kafka and PostgreSQL; experience with AWS and microservices.',
+    '测试经理：负责车载网关与智能家居项目的测试体系建设，熟悉自动化测试，有团队管理经验。',
+]
+
+
+def synthesize(templates: List[Dict[str, Any]], count: int, seed: int) -> List[Dict[str, Any]]:
+    r = random.Random(seed)
+    docs = []
+    for i in range(count):
+        a, b = r.choice(templates), r.choice(templates)
+        data = dict(a)
+        data['name'] = f"{a.get('name') or '候选人'}{i}"
+        data['careers'] = list(a.get('careers') or []) + list(b.get('careers') or [])
+        data['careers_struct'] = list(a.get('careers_struct') or []) + list(b.get('careers_struct') or [])
+        docs.append(data)
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job-description ranking over a large resume store.')
+    parser.add_argument('--count', type=int, default=100000, help='resumes in the store')
+    parser.add_argument('--templates', type=int, default=300, help='synthetic resumes parsed as templates')
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--top-k', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    templates = [asdict(ResumeParse(doc, mode=PARSE_MODE_FAST)) for doc in generate_corpus(args.templates, args.seed)]
+    docs = synthesize(templates, args.count, args.seed)
+    print(f"{args.count} resumes ({args.templates} templates), {environment()['python']}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResumeStore(os.path.join(tmp, 'resumes.db'))
+        t0 = time.perf_counter()
+        for i in range(0, len(docs), 1000):
+            store.AddMany([(d, None, None) for d in docs[i:i + 1000]])
+        ingest_s = time.perf_counter() - t0
+        print(f'ingest      {len(docs) / ingest_s:>10.0f} resumes/s')
+
+        rss0 = rss_mb()
+        t0 = time.perf_counter()
+        store.Rank(JOB_DESCRIPTIONS[0], args.top_k)
+        stats = store._ranker.Stats()
+        print(f'index load  {time.perf_counter() - t0:>10.2f} s   {stats["terms"]} terms, {stats["postings"]} postings, '
+              f'+{rss_mb() - rss0:.0f} MB RSS')
+
+        latencies = []
+        for q in range(args.queries):
+            t0 = time.perf_counter()
+            store.Rank(JOB_DESCRIPTIONS[q % len(JOB_DESCRIPTIONS)], args.top_k)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        m = summarize_latencies(latencies)
+        print(f"rank top-{args.top_k:<3} p50 {m['ms_p50']:.1f} ms   p99 {m['ms_p99']:.1f} ms   mean {m['ms_mean']:.1f} ms")
+
+        # 增量：提交一份只有它会命中的简历，立即可被排序检索到
+        marker = dict(templates[0], name='增量简历', careers=['负责量子退火调度平台开发，使用 Erlang 与 Elixir'])
+        t0 = time.perf_counter()
+        new_id = store.Add(marker)
+        add_ms = (time.perf_counter() - t0) * 1000
+        top = store.Rank('量子退火 Erlang Elixir', 1)['results']
+        found = bool(top) and top[0]['id'] == new_id
+        print(f'incremental add+refresh {add_ms:.1f} ms, ranked first: {found}')
+        store._db.Close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""重新解析基准：模拟招聘人员在表单中修改一行文字后再次解析。每篇合成简历先解析一次（填充块记忆），
+随机改动正文中的一行后分别在清空块记忆（等价于关闭记忆化）与保留块记忆两种情况下计时重新解析，
+并校验两者输出完全一致。
+
+在仓库根目录运行：
+    python -m Benchmarks.ReparseBenchmark --count 200
+    python -m Benchmarks.ReparseBenchmark --count 200 --configs jieba nojieba
+"""
+import argparse
+import random
+import time
+from dataclasses import asdict
+from typing import List, Tuple
+from Benchmarks.BenchmarkUtils import summarize_latencies, environment
+from Benchmarks.SyntheticResumes import generate_corpus
+from Source.Utils import ResumeParseUtils
+
+
+def edit_one_line(text: str, r: random.Random) -> str:
+    """在正文中间随机挑一行追加几个字，模拟一次小修改。"""
+    lines = text.splitlines()
+    candidates = [i for i, ln in enumerate(lines) if len(ln.strip()) > 6][3:]
+    if not candidates:
+        return text + '\n补充说明'
+    i = r.choice(candidates)
+    lines[i] = lines[i] + r.choice(['（已修改）', '，负责上线', ' 等', '；团队5人'])
+    return '\n'.join(lines)
+
+
+def _time_reparse(pairs: List[Tuple[str, str]], memo: bool) -> Tuple[List[float], list]:
+    latencies = []
+    outputs = []
+    for original, edited in pairs:
+        ResumeParseUtils.clear_block_memo()
+        ResumeParseUtils.ResumeParse(original)
+        if not memo:
+            ResumeParseUtils.clear_block_memo()
+        t0 = time.perf_counter()
+        result = ResumeParseUtils.ResumeParse(edited)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        outputs.append(asdict(result))
+    return latencies, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark re-parsing an edited resume with and without the block memo.')
+    parser.add_argument('--count', type=int, default=200, help='number of synthetic resumes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--configs', nargs='+', default=['jieba', 'nojieba'], help='subset of: jieba nojieba')
+    args = parser.parse_args()
+
+    r = random.Random(args.seed)
+    docs = generate_corpus(args.count, args.seed)
+    pairs = [(doc, edit_one_line(doc, r)) for doc in docs]
+    has_jieba = ResumeParseUtils._HAS_JIEBA
+    print(f"{len(pairs)} edited docs (synthetic:{args.count}:seed{args.seed}), {environment()['python']}")
+    print(f"{'config':<10} {'target':<10} {'per sec':>10} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    mismatched = False
+    try:
+        for config in args.configs:
+            if config == 'jieba' and not has_jieba:
+                print(f'{config:<10} skipped: jieba not installed')
+                continue
+            ResumeParseUtils._HAS_JIEBA = has_jieba and config == 'jieba'
+            ResumeParseUtils.ResumeParse(docs[0])
+            cold, cold_out = _time_reparse(pairs, memo=False)
+            warm, warm_out = _time_reparse(pairs, memo=True)
+            for name, lat in (('no memo', cold), ('memo', warm)):
+                m = summarize_latencies(lat)
+                print(f"{config:<10} {name:<10} {m['per_sec']:>10.1f} {m['ms_p50']:>9.3f} {m['ms_p99']:>9.3f} {m['ms_mean']:>9.3f}")
+            print(f"{config:<10} speedup {sum(cold) / sum(warm):.2f}x")
+            if cold_out != warm_out:
+                diffs = sum(1 for a, b in zip(cold_out, warm_out) if a != b)
+                print(f'{config:<10} OUTPUT MISMATCH on {diffs} docs')
+                mismatched = True
+    finally:
+        ResumeParseUtils._HAS_JIEBA = has_jieba
+        ResumeParseUtils.clear_block_memo()
+    if mismatched:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""ResumeParse 微基准：在合成（或指定目录的）简历语料上分别计时 ResumeParse、normalize_cjk_spacing
+与 split_career_block，覆盖 jieba 开/关 × NER 开/关 四种配置，报告吞吐（每秒文档/块数）与 p50/p99，
+并可保存为基线、与已保存的基线对比。
+
+在仓库根目录运行：
+    python -m Benchmarks.ResumeParseBenchmark --count 300 --save-baseline main
+    python -m Benchmarks.ResumeParseBenchmark --count 300 --compare main
+
+对比时吞吐下降超过 --threshold（默认 10%）的项标记为 REGRESSION，且进程以退出码 1 结束。
+不可用的配置（未安装 jieba，或 NER 模型无法加载）会被跳过并注明原因。
+"""
+import argparse
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from Benchmarks.BenchmarkUtils import summarize_latencies, environment
+from Benchmarks.NerBackendBenchmark import load_corpus
+from Benchmarks.SyntheticResumes import generate_corpus
+from Source.Utils import ResumeParseUtils
+from Source.Utils.NerRuntime import NER_STATUS_LOADED
+
+DEFAULT_BASELINE_DIR = os.path.join('Saved', 'Benchmarks', 'baselines')
+CONFIGS = [('jieba', False), ('jieba', True), ('nojieba', False), ('nojieba', True)]
+
+
+def _config_name(jieba_mode: str, ner: bool) -> str:
+    return f"{jieba_mode}+{'ner' if ner else 'noner'}"
+
+
+def _time_each(fn: Callable[[Any], Any], samples: List[Any], repeat: int) -> List[float]:
+    # 先跑少量样本预热（正则编译、jieba 词典、模型首批推理）
+    for sample in samples[:3]:
+        fn(sample)
+    latencies = []
+    for _ in range(repeat):
+        for sample in samples:
+            t0 = time.perf_counter()
+            fn(sample)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies
+
+
+def _apply_config(jieba_mode: str, ner: bool, has_jieba: bool) -> Optional[str]:
+    """切换 ResumeParseUtils 的 jieba/NER 开关；配置不可用时返回原因。"""
+    if jieba_mode == 'jieba' and not has_jieba:
+        return 'jieba not installed'
+    ResumeParseUtils._HAS_JIEBA = has_jieba and jieba_mode == 'jieba'
+    ResumeParseUtils._USE_TRANSFORMERS_NER = ner
+    if ner:
+        ResumeParseUtils._NER_RUNTIME.Warmup(background=False)
+        status = ResumeParseUtils._NER_RUNTIME.Status()
+        if status['status'] != NER_STATUS_LOADED:
+            return f"NER unavailable: {status['last_error'] or status['status']}"
+    return None
+
+
+def run_benchmarks(docs: List[str], repeat: int, configs: List[Tuple[str, bool]]) -> Dict[str, Any]:
+    has_jieba = ResumeParseUtils._HAS_JIEBA
+    results: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    try:
+        for jieba_mode, ner in configs:
+            name = _config_name(jieba_mode, ner)
+            reason = _apply_config(jieba_mode, ner, has_jieba)
+            if reason:
+                skipped[name] = reason
+                continue
+            # split_career_block 的输入：该配置下解析得到的职业经历块及其 NER 结果（不计入计时）
+            blocks = [c for doc in docs for c in ResumeParseUtils.ResumeParse(doc).careers]
+            ents = ResumeParseUtils._run_ner_batch(blocks) if ner else [None] * len(blocks)
+            results[name] = {
+                'ResumeParse': summarize_latencies(_time_each(ResumeParseUtils.ResumeParse, docs, repeat)),
+                'normalize_cjk_spacing': summarize_latencies(
+                    _time_each(ResumeParseUtils.normalize_cjk_spacing, docs, repeat)),
+                'split_career_block': summarize_latencies(
+                    _time_each(lambda pair: ResumeParseUtils.split_career_block(*pair), list(zip(blocks, ents)), repeat)),
+            }
+    finally:
+        ResumeParseUtils._HAS_JIEBA = has_jieba
+        ResumeParseUtils._USE_TRANSFORMERS_NER = True
+    return {'results': results, 'skipped': skipped}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """打印与基线的差异，返回退化项列表（吞吐下降超过 threshold）。"""
+    regressions = []
+    print(f"\n{'config':<16} {'target':<22} {'base/s':>10} {'now/s':>10} {'delta':>8} {'base p99':>9} {'now p99':>9}")
+    for cfg, targets in current['results'].items():
+        for target, now in targets.items():
+            base = baseline.get('results', {}).get(cfg, {}).get(target)
+            if not base:
+                continue
+            delta = (now['per_sec'] - base['per_sec']) / base['per_sec'] if base['per_sec'] else 0.0
+            flag = ''
+            if delta < -threshold:
+                flag = '  REGRESSION'
+                regressions.append(f'{cfg}/{target}')
+            print(f"{cfg:<16} {target:<22} {base['per_sec']:>10.1f} {now['per_sec']:>10.1f} {delta:>+8.1%} "
+                  f"{base['ms_p99']:>9.3f} {now['ms_p99']:>9.3f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmarks for ResumeParse and its helpers.')
+    parser.add_argument('--count', type=int, default=200, help='number of synthetic resumes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--corpus', default='', help='directory of .txt resumes instead of the synthetic corpus')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--configs', nargs='+', default=[_config_name(*c) for c in CONFIGS],
+                        help='subset of: ' + ' '.join(_config_name(*c) for c in CONFIGS))
+    parser.add_argument('--save-baseline', default='', metavar='NAME')
+    parser.add_argument('--compare', default='', metavar='NAME')
+    parser.add_argument('--baseline-dir', default=DEFAULT_BASELINE_DIR)
+    parser.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args()
+
+    docs = load_corpus(args.corpus, args.count) if args.corpus else generate_corpus(args.count, args.seed)
+    configs = [c for c in CONFIGS if _config_name(*c) in args.configs]
+    report = run_benchmarks(docs, args.repeat, configs)
+    report.update({
+        'corpus': args.corpus or f'synthetic:{args.count}:seed{args.seed}',
+        'docs': len(docs),
+        'repeat': args.repeat,
+        'parser_version': ResumeParseUtils.RESUME_PARSER_VERSION,
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'environment': environment(),
+    })
+
+    print(f"{report['docs']} docs x {args.repeat} ({report['corpus']})")
+    print(f"{'config':<16} {'target':<22} {'per sec':>10} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for cfg, targets in report['results'].items():
+        for target, m in targets.items():
+            print(f"{cfg:<16} {target:<22} {m['per_sec']:>10.1f} {m['ms_p50']:>9.3f} {m['ms_p99']:>9.3f} {m['ms_mean']:>9.3f}")
+    for cfg, reason in report['skipped'].items():
+        print(f'{cfg:<16} skipped: {reason}')
+
+    if args.save_baseline:
+        os.makedirs(args.baseline_dir, exist_ok=True)
+        path = os.path.join(args.baseline_dir, f'{args.save_baseline}.json')
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+        print(f'\nbaseline saved to {path}')
+    if args.compare:
+        path = os.path.join(args.baseline_dir, f'{args.compare}.json')
+        with open(path, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        if baseline.get('corpus') != report['corpus']:
+            print(f"\nwarning: baseline corpus {baseline.get('corpus')} differs from {report['corpus']}")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: ' + ', '.join(regressions))
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
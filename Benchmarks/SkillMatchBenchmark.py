@@ -0,0 +1,82 @@
+"""技能词表匹配基准：在相同文本上比较不同规模词表（仓库自带词表，以及追加随机技能名到 1k/5k/20k 项）的
+构建耗时与扫描吞吐，并按文本长度（页数）分组，验证扫描代价与文本长度成线性、与词表规模无关。
+legacy 为原先 split_career_block 中硬编码约 20 个词的逐行正则，作为参照。
+
+在仓库根目录运行：
+    python -m Benchmarks.SkillMatchBenchmark --count 50 --sizes 1000 5000 20000
+"""
+import argparse
+import random
+import re
+import string
+import time
+from typing import Callable, Dict, List
+from Benchmarks.BenchmarkUtils import environment
+from Benchmarks.SyntheticResumes import generate_resume
+from Source.Utils.SkillTaxonomy import SkillTaxonomy, SKILLS_FILE, load_skills_file
+
+_LEGACY_RE = re.compile(r'\b(Python|Java|C\+\+|C#|Go|Golang|Django|Flask|Docker|Kubernetes|FPGA|WiFi|BT|5G|4G|SMF)\b', re.I)
+_CJK_CHARS = '数据平台服务系统网络智能分析管理引擎协议安全存储计算调度监控渲染编译算法'
+
+
+def legacy_match(text: str) -> List[str]:
+    techs = []
+    for ln in text.splitlines():
+        techs.extend(t for t in _LEGACY_RE.findall(ln) if t)
+    return list(dict.fromkeys(techs))
+
+
+def synthetic_skills(base: Dict[str, List[str]], size: int, seed: int) -> Dict[str, List[str]]:
+    """在 base 之外追加随机技能（英文名 + 一个同义词，约四分之一为中文名），直到共 size 项。"""
+    r = random.Random(seed)
+    skills = dict(base)
+    while len(skills) < size:
+        if r.random() < 0.25:
+            name = ''.join(r.choice(_CJK_CHARS) for _ in range(r.randint(3, 6)))
+            names = [name]
+        else:
+            name = ''.join(r.choice(string.ascii_lowercase) for _ in range(r.randint(4, 10)))
+            names = [name.capitalize(), name + 'js', name + ' ' + r.choice(['Pro', 'DB', 'Cloud', 'SDK'])]
+        skills.setdefault(f'x-{name}', names)
+    return skills
+
+
+def _chars_per_ms(fn: Callable[[str], List[str]], texts: List[str], repeat: int) -> float:
+    for t in texts[:3]:
+        fn(t)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts:
+            fn(t)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    return sum(len(t) for t in texts) * repeat / elapsed_ms if elapsed_ms else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the skill taxonomy matcher across taxonomy sizes.')
+    parser.add_argument('--count', type=int, default=50, help='synthetic resumes per length group')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000], help='synthetic taxonomy sizes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    base = load_skills_file(SKILLS_FILE)
+    groups = {pages: [generate_resume(args.seed + i, pages=pages) for i in range(args.count)] for pages in args.pages}
+    print(f"{args.count} docs per group, {environment()['python']}")
+    header = ''.join(f"{f'{p}p chars/ms':>14}" for p in args.pages)
+    print(f"{'matcher':<16} {'skills':>7} {'names':>7} {'build ms':>9}{header}")
+    targets = [('legacy', None, len(_LEGACY_RE.pattern.split('|')), 0.0, legacy_match)]
+    for label, skills in [('taxonomy', base)] + [(f'taxonomy-{s}', synthetic_skills(base, s, args.seed)) for s in args.sizes]:
+        t0 = time.perf_counter()
+        taxonomy = SkillTaxonomy(skills)
+        build_ms = (time.perf_counter() - t0) * 1000
+        names = sum(len(v) for v in skills.values())
+        targets.append((label, len(taxonomy), names, build_ms, taxonomy.Match))
+    for label, size, names, build_ms, fn in targets:
+        rates = ''.join(f'{_chars_per_ms(fn, groups[p], args.repeat):>14.0f}' for p in args.pages)
+        print(f"{label:<16} {size if size is not None else '-':>7} {names:>7} {build_ms:>9.1f}{rates}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,162 @@
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+# 每个连接建立后执行的 PRAGMA：WAL 让读写互不阻塞，NORMAL 同步在 WAL 下仍保证崩溃一致性；
+# busy_timeout 让多进程/多线程写入时排队等待而不是立即报 database is locked
+DEFAULT_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('busy_timeout', '10000'),
+    ('temp_store', 'MEMORY'),
+    ('cache_size', '-16000'),
+    ('foreign_keys', 'ON'),
+)
+
 
 class CCSqlite:
-    def __init__(self, db_name):
-        self.connection = sqlite3.connect(db_name)
-        self.cursor = self.connection.cursor()
+    """SQLite 封装：每个线程使用各自的连接与游标，可被多个 Flask 线程共享。
+
+    - Execute 在事务外按语句自动提交（与原行为一致），在 Transaction() 内则随事务一起提交；
+    - ExecuteMany 在一个事务中批量执行，只提交一次；
+    - Iterate 按批从独立游标流式读取，不把结果一次性读入内存；
+    - Shared(db_name) 返回进程内按路径共享的实例，避免每次操作重新建立连接。"""
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_name, pragmas=DEFAULT_PRAGMAS):
+        self.db_name = db_name
+        self.pragmas = pragmas
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    # 进程内按路径共享的实例
+    @classmethod
+    def Shared(cls, db_name):
+        key = os.path.abspath(db_name)
+        with cls._shared_lock:
+            db = cls._shared.get(key)
+            if db is None or db._pid != os.getpid():
+                db = cls._shared[key] = cls(db_name)
+            return db
+
+    # 关闭并移除所有共享实例（进程退出时调用）
+    @classmethod
+    def CloseShared(cls):
+        with cls._shared_lock:
+            shared, cls._shared = cls._shared, {}
+        for db in shared.values():
+            db.Close()
+
+    @property
+    def connection(self):
+        conn = getattr(self._local, 'connection', None)
+        if conn is None or self._pid != os.getpid():
+            conn = self._Connect()
+        return conn
+
+    @property
+    def cursor(self):
+        self.connection
+        return self._local.cursor
+
+    def _Connect(self):
+        if self._pid != os.getpid():
+            # fork 之后不能复用父进程的连接
+            self._pid = os.getpid()
+            self._connections = []
+        # isolation_level=None：由本类显式管理事务（BEGIN/COMMIT）
+        conn = sqlite3.connect(self.db_name, isolation_level=None, check_same_thread=False)
+        for name, value in self.pragmas:
+            if name == 'journal_mode' and self.db_name == ':memory:':
+                continue
+            conn.execute(f'PRAGMA {name}={value}')
+        self._local.connection = conn
+        self._local.cursor = conn.cursor()
+        self._local.depth = 0
+        with self._lock:
+            self._connections.append(conn)
+        return conn
 
     #执行SQL语句
     def Execute(self, query, params=()):
         self.cursor.execute(query, params)
-        self.connection.commit()
+
+    #批量执行同一条SQL语句（一个事务内，只提交一次）
+    def ExecuteMany(self, query, seq_of_params):
+        with self.Transaction():
+            self.cursor.executemany(query, seq_of_params)
 
     #获取查询结果
     def FetchAll(self):
         return self.cursor.fetchall()
 
-    #关闭数据库连接
+    def FetchOne(self):
+        return self.cursor.fetchone()
+
+    #流式读取查询结果，每次从数据库取 batch_size 行
+    def Iterate(self, query, params=(), batch_size=500):
+        cur = self.connection.cursor()
+        try:
+            cur.execute(query, params)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cur.close()
+
+    #显式事务：正常退出时提交，异常时回滚；嵌套调用并入最外层事务
+    @contextmanager
+    def Transaction(self, immediate=True):
+        conn = self.connection
+        if self._local.depth > 0:
+            self._local.depth += 1
+            try:
+                yield self
+            finally:
+                self._local.depth -= 1
+            return
+        # IMMEDIATE 在事务开始时就获取写锁，避免读后写升级时的死锁/重试
+        conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+        self._local.depth = 1
+        try:
+            yield self
+        except BaseException:
+            self._local.depth = 0
+            conn.rollback()
+            raise
+        self._local.depth = 0
+        conn.commit()
+
+    #按 PRAGMA user_version 依次执行尚未应用的迁移；migrations[i] 为第 i+1 版的 SQL 语句列表
+    def Migrate(self, migrations):
+        self.Execute('PRAGMA user_version')
+        version = self.FetchOne()[0]
+        if version >= len(migrations):
+            return version
+        with self.Transaction():
+            # 在写锁内重新读取，避免多个进程同时迁移
+            self.Execute('PRAGMA user_version')
+            version = self.FetchOne()[0]
+            for target in range(version + 1, len(migrations) + 1):
+                for statement in migrations[target - 1]:
+                    self.Execute(statement)
+                self.Execute(f'PRAGMA user_version = {target}')
+        return len(migrations)
+
+    #关闭数据库连接（所有线程的连接）
     def Close(self):
-        self.connection.close()
\ No newline at end of file
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
@@ -1,19 +1,72 @@
 import logging
 import os
 from Source.CCSqlite.CCSqlite import CCSqlite
+from Source.Utils.Metrics import flush_metrics, enable_metrics
+from Source.Utils.ResumeParseUtils import warmup_ner
+from Source.System.ResumeInput import ResumeInputHandler
+from Source.System.ResumeInput.ResumeParseCache import ResumeParseCache
+from Source.System.ResumeInput.UploadArchive import UPLOAD_DIR, ARCHIVE_UPLOADS, shutdown_archiver
 
 logger = logging.getLogger(__name__)
 
+DATABASE_DIR = os.path.join('Saved', 'DataBase')
+
+# example.db 的表结构迁移（按版本追加，不修改已发布的条目）
+EXAMPLE_DB_MIGRATIONS = [
+    ['CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT)'],
+]
+
 
 class ProgramInstance:
+    """应用生命周期：BeginPlay 在进程启动时执行一次（目录、表结构迁移、模型预热、进程池），
+    EndPlay 在退出时执行（停止工作进程、排空进程池与上传归档、关闭数据库连接）。
+    任务库与简历库在首次使用时才创建（已存在时启动即恢复未完成的任务、载入排序索引），只做同步解析时不写这两个库。"""
+
+    def __init__(self, start_workers: bool = True):
+        self.start_workers = start_workers
+        self.parse_cache = None
+        self.playing = False
+
     def BeginPlay(self):
+        if self.playing:
+            return
         logger.info('BeginPlay called.')
         # ensure directory exists
-        os.makedirs('Saved/DataBase', exist_ok=True)
-        db = CCSqlite('Saved/DataBase/example.db')
-        db.Execute('CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT)')
-        db.Close()
+        os.makedirs(DATABASE_DIR, exist_ok=True)
+        # 指标写库（/metrics 汇总各进程），之后启动的工作进程与解析进程池随之开启
+        enable_metrics()
+        if ARCHIVE_UPLOADS:
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+        CCSqlite.Shared(os.path.join(DATABASE_DIR, 'example.db')).Migrate(EXAMPLE_DB_MIGRATIONS)
+
+        try:
+            self.parse_cache = ResumeParseCache()
+        except Exception:
+            logger.exception('Parse cache unavailable, parsing without cache')
+            self.parse_cache = None
+        ResumeInputHandler.configure_resources(parse_cache=self.parse_cache)
+
+        # 后台预热 NER，首个请求不承担加载耗时（加载完成前解析不使用 NER）
+        warmup_ner()
+        # 后台载入职位描述排序索引（已有简历库时）
+        ResumeInputHandler.warmup_resume_ranker()
+        if self.start_workers:
+            ResumeInputHandler.start_job_workers(on_demand=True)
+            try:
+                ResumeInputHandler.warm_parse_pool()
+            except Exception:
+                logger.exception('Failed to start parse pool, multi-file uploads will start it on demand')
+        self.playing = True
 
     def EndPlay(self):
+        if not self.playing:
+            return
         logger.info('EndPlay called.')
-
+        self.playing = False
+        # 先停止认领新任务的工作进程（正在执行的任务完成后退出），再排空多文件解析进程池
+        ResumeInputHandler.stop_job_workers()
+        ResumeInputHandler.shutdown_parse_pool(wait=True)
+        # 写完已入队的上传归档
+        shutdown_archiver()
+        flush_metrics()
+        CCSqlite.CloseShared()
@@ -1,43 +1,432 @@
+import io
+import multiprocessing
 import os
-from Source.Utils.ResumeParseUtils import ResumeParse, ResumeParseResult
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, is_dataclass, replace
+from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from Source.Utils.ResumeParseUtils import ResumeParse, ResumeParseResult, warmup_ner, parser_version_tag, PARSE_MODE_ACCURATE
+from Source.Utils.DocxText import extract_docx_text
+from Source.Utils.PdfText import extract_pdf_pages, NoTextLayer, NO_TEXT_LAYER
+from Source.Utils.Metrics import EXTRACT_SECONDS, EXTRACT_FALLBACKS, EXTRACT_ERRORS, NEAR_DUPLICATES
+from Source.Utils.MinHash import minhash
+from Source.System.ResumeInput.ResumeParseCache import ResumeParseCache
+from Source.System.ResumeInput.ResumeJobQueue import ResumeJobQueue, ResumeJobWorkers, DEFAULT_JOB_DB
+from Source.System.ResumeStore.ResumeStore import ResumeStore, DEFAULT_RESUME_DB
+
+# 解析结果缓存（懒加载，进程内共享；初始化失败时禁用缓存）
+_PARSE_CACHE = None
+_USE_PARSE_CACHE = True
+def _get_parse_cache():
+    global _PARSE_CACHE
+    if _PARSE_CACHE is not None or not _USE_PARSE_CACHE:
+        return _PARSE_CACHE
+    try:
+        _PARSE_CACHE = ResumeParseCache()
+    except Exception:
+        _PARSE_CACHE = None
+    return _PARSE_CACHE
+
+
+# 近似重复上传（同一份简历的另一种导出、只刷新了日期等）的处理：flag 照常解析并在结果中标记 duplicate_of，
+# 由人工决定是否合并；reuse 在此基础上对规范化文本完全相同的上传直接复用之前的解析结果；off 不检测。
+# 可通过环境变量 CCRESUME_NEAR_DUP 覆盖。近似重复只在解析缓存中（当前解析器版本与模式下）仍有结果的上传之间查找
+NEAR_DUP_POLICY = os.environ.get('CCRESUME_NEAR_DUP', 'flag')
+
+
+# 多文件解析的进程池（懒创建，大小有上限；可通过环境变量 CCRESUME_PARSE_WORKERS 覆盖）
+PARSE_POOL_WORKERS = int(os.environ.get('CCRESUME_PARSE_WORKERS', min(4, os.cpu_count() or 1)))
+_PARSE_POOL = None
+_PARSE_POOL_LOCK = threading.Lock()
+def _get_parse_pool():
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            # 使用 spawn，避免 fork 已加载模型/后台线程的 Web 进程
+            _PARSE_POOL = ProcessPoolExecutor(max_workers=PARSE_POOL_WORKERS,
+                                              mp_context=multiprocessing.get_context('spawn'),
+                                              initializer=_init_parse_worker)
+        return _PARSE_POOL
+
+
+def shutdown_parse_pool(wait: bool = True):
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        pool, _PARSE_POOL = _PARSE_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def warm_parse_pool():
+    """预先启动全部解析工作进程（各自在初始化时预热 NER/jieba），首个多文件请求不承担进程启动耗时。"""
+    pool = _get_parse_pool()
+    for fut in [pool.submit(_noop) for _ in range(PARSE_POOL_WORKERS)]:
+        fut.result()
+
+
+def _page_pool_options():
+    """长 PDF 按页并行提取的参数（见 extract_pdf_pages）。只有 Web 进程使用共享的解析进程池；
+    解析池与后台任务的工作进程内串行提取，避免嵌套进程池。"""
+    if multiprocessing.parent_process() is not None:
+        return {}
+    return {'get_pool': _get_parse_pool, 'workers': PARSE_POOL_WORKERS,
+            'reset_pool': lambda: shutdown_parse_pool(wait=False)}
+
+
+def _noop():
+    return None
+
+
+def _init_parse_worker():
+    # 工作进程启动即在后台预热 NER/jieba
+    warmup_ner()
+
+
+def _parse_file_task(source, mode=PARSE_MODE_ACCURATE):
+    """进程池任务：解析单个文件（路径或 UploadedResume），返回 (parsed, elapsed_ms)。"""
+    t0 = time.perf_counter()
+    parsed = ResumeInputHandler().PerformDragResume(source, mode=mode)
+    return parsed, (time.perf_counter() - t0) * 1000
+
+
+@dataclass
+class UploadedResume:
+    """内存中的上传文件：原文件名（用于判断类型与入库）与文件内容。可以直接传给进程池。"""
+    filename: str
+    data: bytes
+
+
+# 没有文件名（或文件名不带扩展名）时按文件头判断类型
+_MAGIC_EXTS = ((b'%PDF-', '.pdf'), (b'PK\x03\x04', '.docx'))
+
+
+def read_upload(source, filename=None) -> Tuple[bytes, str]:
+    """把解析输入统一为 (内容, 文件名)。source 可以是文件路径、UploadedResume、bytes，
+    或任意带 read() 的文件对象（werkzeug 的 FileStorage、SpooledTemporaryFile 等，从头读取）。"""
+    if isinstance(source, UploadedResume):
+        return source.data, filename or source.filename
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source), filename or ''
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as fh:
+            return fh.read(), filename or os.path.basename(source)
+    if hasattr(source, 'seek'):
+        try:
+            source.seek(0)
+        except Exception:
+            pass
+    data = source.read()
+    if not filename:
+        name = getattr(source, 'filename', None) or getattr(source, 'name', None)
+        filename = os.path.basename(name) if isinstance(name, str) else ''
+    return data, filename
+
+
+def _as_uploaded(source) -> UploadedResume:
+    data, filename = read_upload(source)
+    return UploadedResume(filename, data)
+
+
+_CONTACT_SEPARATORS_RE = re.compile(r'[\s\-()]+')
+
+
+def _same_contacts(previous: ResumeParseResult, text: str) -> bool:
+    """近似重复的两份文本中，之前解析出的手机号与邮箱仍出现在新文本里（只刷新了日期/排版的同一份简历）；
+    联系方式变化时可能是套用同一模板的另一位候选人，不视为重复。"""
+    compact = _CONTACT_SEPARATORS_RE.sub('', text).lower()
+    for value in (_CONTACT_SEPARATORS_RE.sub('', previous.phone or ''), (previous.email or '').lower()):
+        if value and value not in compact:
+            return False
+    return True
+
+
+def _source_label(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, 'filename', None) or f'<{type(source).__name__}>'
+
+
+# 后台解析任务队列与本地工作进程（懒创建，进程内共享）；任务库在首次提交任务时才创建，
+# 只做同步解析的部署不会产生任务库文件
+_JOB_QUEUE = None
+_JOB_WORKERS = None
+_JOB_WORKERS_ON_DEMAND = False
+_JOB_LOCK = threading.Lock()
+def _get_job_queue():
+    global _JOB_QUEUE
+    with _JOB_LOCK:
+        if _JOB_QUEUE is None:
+            _JOB_QUEUE = ResumeJobQueue()
+        return _JOB_QUEUE
+
+
+def _job_queue_exists():
+    return _JOB_QUEUE is not None or os.path.exists(DEFAULT_JOB_DB)
+
+
+# 简历库（懒加载，进程内共享；首次提交、检索或排序时才创建库文件）
+_RESUME_STORE = None
+def _get_resume_store():
+    global _RESUME_STORE
+    with _JOB_LOCK:
+        if _RESUME_STORE is None:
+            _RESUME_STORE = ResumeStore()
+        return _RESUME_STORE
+
+
+def warmup_resume_ranker():
+    """简历库已存在时在后台载入职位描述排序索引；尚无简历库时不创建。"""
+    if _RESUME_STORE is not None or os.path.exists(DEFAULT_RESUME_DB):
+        _get_resume_store().WarmupRanker()
+
+
+def configure_resources(parse_cache=None, job_queue=None, resume_store=None):
+    """由 ProgramInstance.BeginPlay 注入启动时创建的共享资源，请求处理时直接复用；未注入的资源在首次使用时创建。"""
+    global _PARSE_CACHE, _JOB_QUEUE, _RESUME_STORE
+    with _JOB_LOCK:
+        _PARSE_CACHE = parse_cache
+        _JOB_QUEUE = job_queue
+        _RESUME_STORE = resume_store
+
+
+def start_job_workers(on_demand: bool = False):
+    """启动（或补齐）本地解析工作进程，可重复调用。on_demand 为 True 且任务库尚不存在（没有待恢复的任务）时，
+    推迟到首次提交任务时再启动。"""
+    global _JOB_WORKERS, _JOB_WORKERS_ON_DEMAND
+    with _JOB_LOCK:
+        if on_demand and _JOB_WORKERS is None and not (_JOB_QUEUE is not None or os.path.exists(DEFAULT_JOB_DB)):
+            _JOB_WORKERS_ON_DEMAND = True
+            return
+        _JOB_WORKERS_ON_DEMAND = False
+        if _JOB_WORKERS is None:
+            _JOB_WORKERS = ResumeJobWorkers()
+        workers = _JOB_WORKERS
+    workers.Start()
+
+
+def stop_job_workers(timeout: float = 30.0):
+    global _JOB_WORKERS, _JOB_WORKERS_ON_DEMAND
+    with _JOB_LOCK:
+        workers, _JOB_WORKERS = _JOB_WORKERS, None
+        _JOB_WORKERS_ON_DEMAND = False
+    if workers is not None:
+        workers.Stop(timeout)
+
 
 class ResumeInputHandler:
+    def __init__(self, parse_cache=None, job_queue=None, resume_store=None):
+        self.parse_cache = parse_cache if parse_cache is not None else _get_parse_cache()
+        self._job_queue = job_queue
+        self._resume_store = resume_store
+
     # 处理拖拽上传的简历
-    def PerformDragResume(self, file_path):
-        """尝试从 file_path 中提取文本（支持 .pdf 和 .docx），返回提取的字符串。
-        若无法提取则返回文件名或错误信息。"""
-        print(f"Processing dragged resume: {file_path}")
-        _, ext = os.path.splitext(file_path)
+    def PerformDragResume(self, source, filename=None, mode=PARSE_MODE_ACCURATE):
+        """从 source 中提取文本（支持 .pdf 和 .docx）并解析，返回 ResumeParse 的结构化结果。
+        source 可以是文件路径，也可以是内存中的上传内容（见 read_upload），后者全程不经过磁盘。
+        若无法提取，结果中附带 error 字段。mode 为解析模式（见 ResumeParse）。
+        相同内容的文件（按字节哈希）直接返回缓存的解析结果，不再提取和解析；
+        提取出的文本与之前某次上传近似重复时按 NEAR_DUP_POLICY 标记（duplicate_of 为最早那次上传的内容哈希），
+        只有规范化文本完全相同时才可能复用之前的解析结果。"""
+        data, filename = read_upload(source, filename)
+        return self._ParseUpload(data, filename, mode)
+
+    def _ParseUpload(self, data, filename, mode=PARSE_MODE_ACCURATE):
+        print(f"Processing dragged resume: {filename} ({len(data)} bytes)")
+        content_hash = None
+        if self.parse_cache is not None:
+            try:
+                content_hash = self.parse_cache.ContentHash(data)
+                cached = self.parse_cache.Get(content_hash, mode)
+            except Exception:
+                content_hash = None
+                cached = None
+            if cached is not None:
+                print(f"[ResumeInput]解析缓存命中: {filename}")
+                return cached
+
+        text, extraction_error = self._ExtractText(data, filename)
+        version_tag = parser_version_tag(mode)
+
+        # 近似重复检测：提取后立即按文本签名查找之前解析过的上传
+        signature = ()
+        text_hash = None
+        duplicate_of = None
+        if content_hash and not extraction_error and NEAR_DUP_POLICY in ('reuse', 'flag'):
+            same = found = None
+            try:
+                signature = minhash(text)
+                text_hash = self.parse_cache.TextHash(text)
+                if NEAR_DUP_POLICY == 'reuse':
+                    same = self.parse_cache.GetSameText(text_hash, mode, exclude=content_hash)
+                if same is None:
+                    found = self.parse_cache.GetNearDuplicate(signature, mode, exclude=content_hash)
+            except Exception:
+                signature = ()
+                text_hash = None
+            if same is not None:
+                # 规范化文本完全相同，解析结果必然相同
+                other, previous = same
+                duplicate_of = previous.duplicate_of or other
+                print(f"[ResumeInput]文本相同的上传，复用解析结果: {filename} = {duplicate_of[:12]}")
+                NEAR_DUPLICATES.Inc(action='reused')
+                reused = replace(previous, duplicate_of=duplicate_of)
+                try:
+                    self.parse_cache.Put(content_hash, reused, mode, signature, text_hash)
+                except Exception:
+                    pass
+                return reused
+            if found is not None and not _same_contacts(found[2], text):
+                print(f"[ResumeInput]近似上传的联系方式不同，按新简历解析: {filename}")
+                found = None
+            if found is not None:
+                other, sim, previous = found
+                duplicate_of = previous.duplicate_of or other
+                print(f"[ResumeInput]近似重复上传: {filename} ~ {duplicate_of[:12]} (相似度 {sim:.2f})")
+
+        print(f"[ResumeInput]执行简历拖拽，text: {text[:30]}... error={extraction_error}")
+        # 始终返回 ResumeParse 的结构化结果；若提取出错，在返回值中附加 error 字段
+        try:
+            parsed = ResumeParse(text, mode=mode)
+        except Exception as e:
+            parsed = {"name": None, "age": None, "phone": None, "careers": [], "education": [], "error": f"parse_failed: {str(e)}"}
+
+        # 如果有提取错误，确保 parsed 是可下标赋值的 dict，然后附加 error 信息
+        if extraction_error:
+            if not isinstance(parsed, dict):
+                try:
+                    from dataclasses import asdict
+                    parsed = asdict(parsed)
+                except Exception:
+                    try:
+                        parsed = parsed.to_dict()
+                    except Exception:
+                        # 作为最后手段，覆盖为包含 error 的 dict
+                        parsed = {"name": None, "age": None, "phone": None, "careers": [], "education": [], "error": extraction_error}
+            parsed['error'] = extraction_error
+        elif content_hash and isinstance(parsed, ResumeParseResult) and parser_version_tag(mode) == version_tag:
+            if duplicate_of:
+                NEAR_DUPLICATES.Inc(action='flagged')
+                parsed.duplicate_of = duplicate_of
+            # 只缓存成功提取并解析的结果，提取失败（如缺少依赖）不应被持久化；
+            # 解析期间 NER 状态发生变化时无法确定结果属于哪个版本，也不缓存
+            try:
+                self.parse_cache.Put(content_hash, parsed, mode, signature, text_hash)
+            except Exception:
+                pass
+
+        return parsed
+
+    # 并行处理一次拖拽上传的多个简历
+    def PerformDragResumes(self, sources, mode=PARSE_MODE_ACCURATE):
+        """在有上限的进程池中并行提取并解析全部文件（路径或内存中的上传内容），按上传顺序返回
+        [{'file': 路径或文件名, 'result': parsed, 'elapsed_ms': ms}, ...]；单个文件失败时其 result 为 None。
+        只有一个文件时直接在当前进程解析，省去进程间传输。"""
+        if len(sources) <= 1:
+            outcomes = []
+            for source in sources:
+                out = {'file': _source_label(source), 'result': None, 'elapsed_ms': None}
+                t0 = time.perf_counter()
+                try:
+                    out['result'] = self.PerformDragResume(source, mode=mode)
+                except Exception as e:
+                    print(f"[ResumeInput]解析失败 {out['file']}: {e}")
+                out['elapsed_ms'] = (time.perf_counter() - t0) * 1000
+                outcomes.append(out)
+            return outcomes
+        # 文件对象不能跨进程传递，先读成 UploadedResume（路径仍由工作进程自己读取）
+        sources = [s if isinstance(s, (str, os.PathLike, UploadedResume)) else _as_uploaded(s) for s in sources]
+        outcomes = [{'file': _source_label(s), 'result': None, 'elapsed_ms': None} for s in sources]
+        try:
+            pool = _get_parse_pool()
+            futures = [pool.submit(_parse_file_task, s, mode) for s in sources]
+        except Exception as e:
+            # 进程池不可用（例如受限环境），退回逐个解析
+            print(f"[ResumeInput]解析进程池不可用，改为串行: {e}")
+            return [self.PerformDragResumes([s], mode)[0] for s in sources]
+        for source, out, fut in zip(sources, outcomes, futures):
+            try:
+                out['result'], out['elapsed_ms'] = fut.result()
+            except BrokenProcessPool:
+                shutdown_parse_pool(wait=False)
+                out.update(self.PerformDragResumes([source], mode)[0])
+            except Exception as e:
+                print(f"[ResumeInput]解析失败 {out['file']}: {e}")
+        return outcomes
+
+    # 提交后台解析任务，立即返回任务 id
+    def SubmitDragResumes(self, file_paths, filenames=None):
+        """把已保存的文件作为一个任务写入持久化队列，由后台工作进程解析；通过 GetJob 轮询结果。"""
+        job_id = self._GetJobQueue().Enqueue(file_paths, filenames)
+        if _JOB_WORKERS_ON_DEMAND:
+            start_job_workers()
+        return job_id
+
+    # 查询后台解析任务的状态与结果（尚未创建任务库时没有任何任务）
+    def GetJob(self, job_id):
+        if self._job_queue is None and not _job_queue_exists():
+            return None
+        return self._GetJobQueue().Get(job_id)
+
+    # 各状态的后台任务数
+    def GetJobCounts(self):
+        if self._job_queue is None and not _job_queue_exists():
+            return {}
+        return self._GetJobQueue().Counts()
+
+    def _GetJobQueue(self):
+        if self._job_queue is None:
+            self._job_queue = _get_job_queue()
+        return self._job_queue
+
+    # 从内存中的文件内容提取纯文本，返回 (text, extraction_error)；filename 只用于判断类型与错误信息
+    def _ExtractText(self, data, filename):
+        _, ext = os.path.splitext(filename or '')
         ext = ext.lower()
+        if not ext:
+            ext = next((e for magic, e in _MAGIC_EXTS if data.startswith(magic)), '')
         text = ''
         extraction_error = None
         try:
             if ext == '.docx':
+                # 流式提取（含表格、页眉页脚与文本框）；zip/XML 损坏等情况回退到 python-docx
                 try:
-                    import docx
+                    with EXTRACT_SECONDS.Time(extractor='docx-stream'):
+                        text = extract_docx_text(data)
                 except Exception:
-                    extraction_error = f"missing_python_docx: {os.path.basename(file_path)}"
-                else:
-                    doc = docx.Document(file_path)
-                    paragraphs = [p.text for p in doc.paragraphs if p.text]
-                    text = '\n'.join(paragraphs)
+                    EXTRACT_FALLBACKS.Inc(extractor='docx-stream', fallback='python-docx')
+                    try:
+                        import docx
+                    except Exception:
+                        extraction_error = f"missing_python_docx: {filename}"
+                    else:
+                        with EXTRACT_SECONDS.Time(extractor='python-docx'):
+                            doc = docx.Document(io.BytesIO(data))
+                            paragraphs = [p.text for p in doc.paragraphs if p.text]
+                            text = '\n'.join(paragraphs)
             elif ext == '.pdf':
-                # 尝试 PyPDF2 提取；若不可用，回退到 pdfplumber
+                # PyPDF2 逐页提取，单页失败时只对该页改用 pdfplumber；没有文本层（扫描件）直接报错；
+                # PyPDF2 不可用或无法打开文件时，整份回退到 pdfplumber
                 tried = False
                 try:
                     import PyPDF2
                     tried = True
-                    with open(file_path, 'rb') as fh:
-                        reader = PyPDF2.PdfReader(fh)
-                        parts = []
-                        for page in reader.pages:
-                            parts.append(page.extract_text() or '')
-                        text = '\n'.join(parts)
+                    with EXTRACT_SECONDS.Time(extractor='PyPDF2'):
+                        pages, page_fallbacks = extract_pdf_pages(data, **_page_pool_options())
+                        text = '\n'.join(pages)
+                    if page_fallbacks:
+                        EXTRACT_FALLBACKS.Inc(page_fallbacks, extractor='PyPDF2', fallback='pdfplumber_page')
+                except NoTextLayer:
+                    extraction_error = f"{NO_TEXT_LAYER}: {filename}"
                 except Exception:
                     # 回退到 pdfplumber（更健壮于一些 PDF）
+                    if tried:
+                        EXTRACT_FALLBACKS.Inc(extractor='PyPDF2', fallback='pdfplumber')
                     try:
                         import pdfplumber
-                        with pdfplumber.open(file_path) as pdf:
+                        with EXTRACT_SECONDS.Time(extractor='pdfplumber'), pdfplumber.open(io.BytesIO(data)) as pdf:
                             parts = []
                             for p in pdf.pages:
                                 txt = p.extract_text() or ''
@@ -46,36 +435,70 @@ class ResumeInputHandler:
                         tried = True
                     except Exception:
                         if not tried:
-                            extraction_error = f"missing_pypdf2_or_pdfplumber: {os.path.basename(file_path)}"
+                            extraction_error = f"missing_pypdf2_or_pdfplumber: {filename}"
             else:
-                extraction_error = f"unsupported_type: {os.path.basename(file_path)}"
+                extraction_error = f"unsupported_type: {filename}"
         except Exception as e:
             extraction_error = f"parse_exception: {str(e)}"
+        if extraction_error:
+            # 错误类型为 extraction_error 冒号前的前缀（missing_python_docx / unsupported_type / ...）
+            EXTRACT_ERRORS.Inc(type=extraction_error.split(':', 1)[0])
+        return text, extraction_error
 
-        print(f"[ResumeInput]执行简历拖拽，text: {text[:30]}... error={extraction_error}")
-        # 始终返回 ResumeParse 的结构化结果；若提取出错，在返回值中附加 error 字段
-        try:
-            parsed = ResumeParse(text)
-        except Exception as e:
-            parsed = {"name": None, "age": None, "phone": None, "careers": [], "education": [], "error": f"parse_failed: {str(e)}"}
+    # 处理表单提交
+    def PerformSubmit(self, file_paths, form=None):
+        """解析提交的简历文件（路径或内存中的上传内容，见 read_upload）并存入简历库，
+        返回新建（或按内容覆盖）的简历 id 列表。
+        表单中用户确认/修改过的字段（姓名、年龄、性别、联系方式、邮箱、职业与教育经历）优先于解析结果；
+        每份简历按其自身的内容哈希入库，与之前上传近似重复的简历另存一条并记录 duplicate_of，不自动合并；
+        没有附件时仅按表单内容保存一条记录。"""
+        if isinstance(file_paths, (str, os.PathLike, UploadedResume)):
+            file_paths = [file_paths]
+        print(f"Processing submission with file: {[_source_label(s) for s in file_paths or []]}")
+        form = form or {}
+        items = []
+        for source in file_paths or []:
+            content, filename = read_upload(source)
+            parsed = self._ParseUpload(content, filename)
+            data = asdict(parsed) if is_dataclass(parsed) else dict(parsed or {})
+            if data.get('error'):
+                print(f"[ResumeInput]提交的简历解析失败，不入库: {filename} {data['error']}")
+                continue
+            items.append((self._ApplyForm(data, form), ResumeParseCache.ContentHash(content), filename))
+        if not items and any((form.get(k) or '').strip() for k in ('name', 'contact', 'email', 'career', 'edu')):
+            items.append((self._ApplyForm(asdict(ResumeParseResult()), form), None, None))
+        if not items:
+            return []
+        return self._GetResumeStore().AddMany(items)
 
-        # 如果有提取错误，确保 parsed 是可下标赋值的 dict，然后附加 error 信息
-        if extraction_error:
-            if not isinstance(parsed, dict):
-                try:
-                    from dataclasses import asdict
-                    parsed = asdict(parsed)
-                except Exception:
-                    try:
-                        parsed = parsed.to_dict()
-                    except Exception:
-                        # 作为最后手段，覆盖为包含 error 的 dict
-                        parsed = {"name": None, "age": None, "phone": None, "careers": [], "education": [], "error": extraction_error}
-            parsed['error'] = extraction_error
+    @staticmethod
+    def _ApplyForm(data, form):
+        for field_name, key in (('name', 'name'), ('age', 'age'), ('sex', 'sex'), ('phone', 'contact'), ('email', 'email')):
+            value = (form.get(key) or '').strip()
+            if value:
+                data[field_name] = value
+        # 表单中的职业经历以分隔线拼接（与拖拽回填格式一致），教育经历以空行分隔
+        career = (form.get('career') or '').strip()
+        if career:
+            data['careers'] = [c.strip() for c in career.split('-----') if c.strip()]
+        edu = (form.get('edu') or '').strip()
+        if edu:
+            data['education'] = [e.strip() for e in edu.split('\n\n') if e.strip()]
+        return data
 
-        return parsed
+    # 在简历库中检索，参数见 ResumeStore.Search
+    def SearchResumes(self, **criteria):
+        return self._GetResumeStore().Search(**criteria)
 
-    # 处理表单提交
-    def PerformSubmit(self, file_path):
-        print(f"Processing submission with file: {file_path}")
+    # 按与职位描述的相关度排序简历库，参数见 ResumeStore.Rank
+    def RankResumes(self, job_description, top_k=20):
+        return self._GetResumeStore().Rank(job_description, top_k)
+
+    def GetResume(self, resume_id):
+        return self._GetResumeStore().Get(resume_id)
+
+    def _GetResumeStore(self):
+        if self._resume_store is None:
+            self._resume_store = _get_resume_store()
+        return self._resume_store
         
\ No newline at end of file
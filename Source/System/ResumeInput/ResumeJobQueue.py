@@ -0,0 +1,299 @@
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict, is_dataclass
+from typing import Optional, Dict, Any, List
+from Source.CCSqlite.CCSqlite import CCSqlite
+from Source.Utils.Metrics import JOB_SECONDS, JOB_WAIT_SECONDS, JOBS_RECOVERED, enable_metrics
+
+logger = logging.getLogger(__name__)
+
+# 任务库位置；任务状态
+DEFAULT_JOB_DB = os.path.join('Saved', 'DataBase', 'jobs.db')
+JOB_STATUS_QUEUED = 'queued'
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_DONE = 'done'
+JOB_STATUS_FAILED = 'failed'
+
+# 租约：运行中的任务由工作进程定期刷新 heartbeat，超过 JOB_LEASE_SECONDS 未刷新视为工作进程已退出，重新排队；
+# 同一任务最多尝试 JOB_MAX_ATTEMPTS 次，之后标记为失败
+JOB_LEASE_SECONDS = 120.0
+JOB_HEARTBEAT_SECONDS = 20.0
+JOB_MAX_ATTEMPTS = 3
+JOB_POLL_SECONDS = 0.5
+# 已完成（done/failed）的任务及其上传文件（含简历原文）保留的天数，过期后由工作进程删除；设为 0 或负数不删除
+JOB_RETENTION_DAYS = float(os.environ.get('CCRESUME_JOB_RETENTION_DAYS', 7))
+# 任务库的表结构迁移（按版本追加，不修改已发布的条目）
+JOB_MIGRATIONS = [
+    [
+        'CREATE TABLE IF NOT EXISTS resume_jobs ('
+        'id TEXT PRIMARY KEY, status TEXT NOT NULL, files TEXT NOT NULL, filenames TEXT NOT NULL, '
+        'result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, lease TEXT, '
+        'created_at REAL NOT NULL, started_at REAL, finished_at REAL, heartbeat REAL)',
+        'CREATE INDEX IF NOT EXISTS idx_resume_jobs_status ON resume_jobs(status, created_at)',
+    ],
+    [
+        'CREATE INDEX IF NOT EXISTS idx_resume_jobs_finished ON resume_jobs(finished_at)',
+    ],
+]
+# 后台解析工作进程数（可通过环境变量 CCRESUME_JOB_WORKERS 覆盖，0 表示不启动）
+JOB_WORKERS = int(os.environ.get('CCRESUME_JOB_WORKERS', 2))
+
+
+class ResumeJobQueue:
+    """持久化在 SQLite 中的简历解析任务队列。
+
+    Web 进程保存上传文件后 Enqueue，立即返回任务 id；工作进程通过单条 UPDATE 原子地认领任务
+    （多个工作进程/多个 Web 进程共享同一个库也不会重复认领），完成后写回结果。
+    任务与结果都在库中，Web 进程重启后未完成的任务会在租约过期后被重新认领。"""
+
+    def __init__(self, db_path: str = DEFAULT_JOB_DB):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._db = CCSqlite.Shared(db_path)
+        self._db.Migrate(JOB_MIGRATIONS)
+
+    # 新建任务，返回任务 id
+    def Enqueue(self, file_paths: List[str], filenames: Optional[List[str]] = None) -> str:
+        job_id = uuid.uuid4().hex
+        filenames = filenames or [os.path.basename(p) for p in file_paths]
+        db = self._db
+        db.Execute('INSERT INTO resume_jobs (id, status, files, filenames, created_at) VALUES (?, ?, ?, ?, ?)',
+                   (job_id, JOB_STATUS_QUEUED, json.dumps(file_paths, ensure_ascii=False),
+                    json.dumps(filenames, ensure_ascii=False), time.time()))
+        return job_id
+
+    # 认领最早排队的任务；没有可认领的任务时返回 None
+    def Claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        lease = uuid.uuid4().hex
+        now = time.time()
+        db = self._db
+        # 子查询与更新在同一条语句中执行，SQLite 的写锁保证同一任务只会被一个租约认领
+        db.Execute('UPDATE resume_jobs SET status = ?, worker = ?, lease = ?, started_at = ?, heartbeat = ?, '
+                   'attempts = attempts + 1 '
+                   'WHERE id = (SELECT id FROM resume_jobs WHERE status = ? ORDER BY created_at LIMIT 1) '
+                   'AND status = ?',
+                   (JOB_STATUS_RUNNING, worker, lease, now, now, JOB_STATUS_QUEUED, JOB_STATUS_QUEUED))
+        db.Execute('SELECT id, files, filenames, attempts, created_at FROM resume_jobs WHERE lease = ?', (lease,))
+        rows = db.FetchAll()
+        if not rows:
+            return None
+        job_id, files, filenames, attempts, created_at = rows[0]
+        JOB_WAIT_SECONDS.Observe(max(0.0, now - created_at))
+        return {'id': job_id, 'lease': lease, 'files': json.loads(files),
+                'filenames': json.loads(filenames), 'attempts': attempts}
+
+    # 刷新租约；租约已被回收（任务被重新排队）时返回 False
+    def Heartbeat(self, job_id: str, lease: str) -> bool:
+        db = self._db
+        db.Execute('UPDATE resume_jobs SET heartbeat = ? WHERE id = ? AND lease = ? AND status = ?',
+                   (time.time(), job_id, lease, JOB_STATUS_RUNNING))
+        return db.cursor.rowcount > 0
+
+    def Complete(self, job_id: str, lease: str, result: Dict[str, Any]):
+        self._Finish(job_id, lease, JOB_STATUS_DONE, json.dumps(result, ensure_ascii=False, default=_json_default), None)
+
+    def Fail(self, job_id: str, lease: str, error: str):
+        self._Finish(job_id, lease, JOB_STATUS_FAILED, None, error)
+
+    def _Finish(self, job_id: str, lease: str, status: str, result: Optional[str], error: Optional[str]):
+        db = self._db
+        # 只有仍持有租约的工作进程才能写回结果
+        db.Execute('UPDATE resume_jobs SET status = ?, result = ?, error = ?, finished_at = ? '
+                   'WHERE id = ? AND lease = ? AND status = ?',
+                   (status, result, error, time.time(), job_id, lease, JOB_STATUS_RUNNING))
+
+    # 回收租约过期的运行中任务：未超过最大尝试次数的重新排队，否则标记失败。返回回收的任务数
+    def RequeueStale(self, lease_seconds: float = JOB_LEASE_SECONDS) -> int:
+        cutoff = time.time() - lease_seconds
+        with self._db.Transaction() as db:
+            db.Execute('UPDATE resume_jobs SET status = ?, error = ?, finished_at = ? '
+                       'WHERE status = ? AND heartbeat < ? AND attempts >= ?',
+                       (JOB_STATUS_FAILED, 'worker_lost', time.time(), JOB_STATUS_RUNNING, cutoff, JOB_MAX_ATTEMPTS))
+            failed = db.cursor.rowcount
+            db.Execute('UPDATE resume_jobs SET status = ?, worker = NULL, lease = NULL '
+                       'WHERE status = ? AND heartbeat < ?',
+                       (JOB_STATUS_QUEUED, JOB_STATUS_RUNNING, cutoff))
+            requeued = db.cursor.rowcount
+        if failed:
+            JOBS_RECOVERED.Inc(failed, outcome=JOB_STATUS_FAILED)
+        if requeued:
+            JOBS_RECOVERED.Inc(requeued, outcome=JOB_STATUS_QUEUED)
+        if failed or requeued:
+            logger.info('Recovered stale resume jobs: %d requeued, %d failed', requeued, failed)
+        return failed + requeued
+
+    # 删除完成时间早于 retention_seconds 的已完成任务及其上传文件，返回删除的任务数
+    def PurgeFinished(self, retention_seconds: float, batch_size: int = 500) -> int:
+        cutoff = time.time() - retention_seconds
+        db = self._db
+        db.Execute('SELECT id, files FROM resume_jobs WHERE finished_at < ? AND status IN (?, ?) LIMIT ?',
+                   (cutoff, JOB_STATUS_DONE, JOB_STATUS_FAILED, batch_size))
+        purged = []
+        for job_id, files in db.FetchAll():
+            try:
+                for path in json.loads(files):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            except OSError:
+                # 文件删不掉时保留任务记录，下次清理时重试
+                logger.exception('Failed to delete files of resume job %s', job_id)
+                continue
+            purged.append((job_id,))
+        if purged:
+            db.ExecuteMany('DELETE FROM resume_jobs WHERE id = ?', purged)
+            logger.info('Purged %d finished resume jobs older than %.1f days', len(purged), retention_seconds / 86400)
+        return len(purged)
+
+    # 各状态的任务数（供 /metrics 输出队列长度）
+    def Counts(self) -> Dict[str, int]:
+        db = self._db
+        db.Execute('SELECT status, COUNT(*) FROM resume_jobs GROUP BY status')
+        counts = {status: 0 for status in (JOB_STATUS_QUEUED, JOB_STATUS_RUNNING, JOB_STATUS_DONE, JOB_STATUS_FAILED)}
+        counts.update(dict(db.FetchAll()))
+        return counts
+
+    # 查询任务状态与结果；任务不存在时返回 None
+    def Get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        db = self._db
+        db.Execute('SELECT id, status, filenames, result, error, attempts, created_at, started_at, finished_at '
+                   'FROM resume_jobs WHERE id = ?', (job_id,))
+        rows = db.FetchAll()
+        if not rows:
+            return None
+        job_id, status, filenames, result, error, attempts, created_at, started_at, finished_at = rows[0]
+        job = {
+            'id': job_id,
+            'status': status,
+            'filenames': json.loads(filenames),
+            'attempts': attempts,
+            'error': error,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at,
+        }
+        if result is not None:
+            job.update(json.loads(result))
+        return job
+
+
+def _json_default(obj):
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
+
+
+def _heartbeat_loop(queue: ResumeJobQueue, job_id: str, lease: str, done: threading.Event):
+    while not done.wait(JOB_HEARTBEAT_SECONDS):
+        try:
+            if not queue.Heartbeat(job_id, lease):
+                return
+        except Exception:
+            logger.exception('Failed to refresh lease for job %s', job_id)
+
+
+def run_job(queue: ResumeJobQueue, job: Dict[str, Any], handler=None):
+    """在当前进程中执行一个已认领的任务：逐个解析文件并写回 texts/timings。"""
+    if handler is None:
+        from Source.System.ResumeInput.ResumeInputHandler import ResumeInputHandler
+        handler = ResumeInputHandler()
+    done = threading.Event()
+    beat = threading.Thread(target=_heartbeat_loop, args=(queue, job['id'], job['lease'], done), daemon=True)
+    beat.start()
+    t0 = time.perf_counter()
+    status = JOB_STATUS_DONE
+    try:
+        texts = []
+        timings = []
+        for path, name in zip(job['files'], job['filenames']):
+            file_t0 = time.perf_counter()
+            try:
+                parsed = handler.PerformDragResume(path)
+            except Exception as e:
+                logger.exception('Job %s failed to parse %s', job['id'], path)
+                parsed = {"name": None, "age": None, "phone": None, "careers": [], "education": [],
+                          "error": f"parse_failed: {str(e)}"}
+            texts.append(asdict(parsed) if is_dataclass(parsed) else parsed)
+            timings.append({'filename': name, 'elapsed_ms': round((time.perf_counter() - file_t0) * 1000, 1)})
+        queue.Complete(job['id'], job['lease'], {'texts': texts, 'timings': timings})
+    except Exception as e:
+        logger.exception('Job %s failed', job['id'])
+        status = JOB_STATUS_FAILED
+        queue.Fail(job['id'], job['lease'], f"job_failed: {str(e)}")
+    finally:
+        done.set()
+        JOB_SECONDS.Observe(time.perf_counter() - t0, status=status)
+
+
+def _job_worker_main(db_path: str, stop_event):
+    """工作进程入口：循环认领并执行任务，空闲时轮询，stop_event 置位后退出。"""
+    from Source.Utils.ResumeParseUtils import warmup_ner
+    enable_metrics()
+    warmup_ner()
+    queue = ResumeJobQueue(db_path)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    last_sweep = 0.0
+    while not stop_event.is_set():
+        try:
+            # 空闲工作进程顺带回收过期租约（例如上一次 Web 进程退出时未完成的任务），并清理超过保留期的已完成任务
+            if time.time() - last_sweep > JOB_LEASE_SECONDS / 4:
+                last_sweep = time.time()
+                queue.RequeueStale()
+                if JOB_RETENTION_DAYS > 0:
+                    queue.PurgeFinished(JOB_RETENTION_DAYS * 86400)
+            job = queue.Claim(worker)
+        except Exception:
+            logger.exception('Failed to claim resume job')
+            job = None
+        if job is None:
+            stop_event.wait(JOB_POLL_SECONDS)
+            continue
+        run_job(queue, job)
+
+
+class ResumeJobWorkers:
+    """本地解析工作进程组（spawn 启动），Start 可重复调用，Stop 通知退出并等待。"""
+
+    def __init__(self, db_path: str = DEFAULT_JOB_DB, workers: int = JOB_WORKERS):
+        self.db_path = db_path
+        self.workers = workers
+        self._ctx = multiprocessing.get_context('spawn')
+        self._stop = self._ctx.Event()
+        self._procs: List[Any] = []
+        self._lock = threading.Lock()
+
+    def Start(self):
+        with self._lock:
+            self._procs = [p for p in self._procs if p.is_alive()]
+            if self.workers <= 0 or len(self._procs) >= self.workers:
+                return
+            # 启动前回收一次：上一次运行留下的 running 任务若租约已过期，立即重新排队
+            ResumeJobQueue(self.db_path).RequeueStale()
+            self._stop.clear()
+            for _ in range(self.workers - len(self._procs)):
+                proc = self._ctx.Process(target=_job_worker_main, args=(self.db_path, self._stop),
+                                         name='resume-job-worker', daemon=True)
+                proc.start()
+                self._procs.append(proc)
+            logger.info('Started %d resume job workers', len(self._procs))
+
+    def Stop(self, timeout: float = 30.0):
+        with self._lock:
+            self._stop.set()
+            deadline = time.time() + timeout
+            for proc in self._procs:
+                proc.join(max(0.0, deadline - time.time()))
+                if proc.is_alive():
+                    proc.terminate()
+            self._procs = []
+
+    def Alive(self) -> int:
+        with self._lock:
+            return sum(1 for p in self._procs if p.is_alive())
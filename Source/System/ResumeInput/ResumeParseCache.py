@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from Source.CCSqlite.CCSqlite import CCSqlite
+from Source.Utils.ResumeParseUtils import ResumeParseResult, parser_version_tag, normalize_resume_text, PARSE_MODE_ACCURATE
+from Source.Utils.MinHash import lsh_keys, similarity, pack_signature, unpack_signature
+
+# 默认缓存库位置与容量上限（按结果 JSON 字节数计）
+DEFAULT_CACHE_DB = os.path.join('Saved', 'DataBase', 'parse_cache.db')
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# 近似重复：MinHash 估计相似度不低于该值的两次上传标记为疑似重复（由人工确认），不据此复用解析结果；
+# 每次查询最多校验的候选数
+NEAR_DUP_MIN_SIMILARITY = float(os.environ.get('CCRESUME_NEAR_DUP_SIMILARITY', 0.75))
+NEAR_DUP_MAX_CANDIDATES = 32
+
+# 缓存库的表结构迁移（按版本追加，不修改已发布的条目）
+PARSE_CACHE_MIGRATIONS = [
+    [
+        'CREATE TABLE IF NOT EXISTS parse_cache ('
+        'key TEXT PRIMARY KEY, result TEXT NOT NULL, size INTEGER NOT NULL, '
+        'created_at REAL NOT NULL, last_access REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS idx_parse_cache_last_access ON parse_cache(last_access)',
+    ],
+    # 近似重复索引：成功解析的上传保存 MinHash 签名，以及每个 LSH 分段的哈希键（按键等值查询候选）
+    [
+        'CREATE TABLE IF NOT EXISTS parse_signatures ('
+        'content_hash TEXT PRIMARY KEY, signature BLOB NOT NULL, created_at REAL NOT NULL)',
+        'CREATE TABLE IF NOT EXISTS parse_signature_bands (key INTEGER NOT NULL, content_hash TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS idx_parse_signature_bands_key ON parse_signature_bands(key)',
+        'CREATE INDEX IF NOT EXISTS idx_parse_signature_bands_hash ON parse_signature_bands(content_hash)',
+    ],
+    # 条目单独记录内容哈希（键的最后 64 位十六进制），淘汰时据此判断该上传是否还有其他模式/版本的结果
+    [
+        'ALTER TABLE parse_cache ADD COLUMN content_hash TEXT',
+        'UPDATE parse_cache SET content_hash = substr(key, -64)',
+        'CREATE INDEX IF NOT EXISTS idx_parse_cache_content_hash ON parse_cache(content_hash)',
+    ],
+    # 规范化文本的哈希：文本完全相同的上传（例如同一文档的重新导出）解析结果相同，可直接复用
+    [
+        'ALTER TABLE parse_signatures ADD COLUMN text_hash TEXT',
+        'CREATE INDEX IF NOT EXISTS idx_parse_signatures_text_hash ON parse_signatures(text_hash)',
+    ],
+]
+
+
+class ResumeParseCache:
+    """以「上传文件字节哈希 + 解析器版本」为键的 ResumeParseResult 持久化缓存。
+    结果序列化为 JSON 存入 SQLite，按 last_access 做 LRU 淘汰，总大小不超过 max_bytes。
+    同时维护近似重复索引：按提取文本的 MinHash 签名查找内容不同但文本几乎相同的已解析上传。"""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_DB, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._db = CCSqlite.Shared(db_path)
+        self._db.Migrate(PARSE_CACHE_MIGRATIONS)
+
+    @staticmethod
+    def ContentHash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def TextHash(text: str) -> str:
+        """提取文本经 ResumeParse 全文规范化后的 sha256；ResumeParse 只依赖规范化结果，哈希相同则解析结果相同。"""
+        return hashlib.sha256(normalize_resume_text(text)[0].encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def MakeKey(content_hash: str, mode: str = PARSE_MODE_ACCURATE) -> str:
+        """缓存键：当前解析器版本标记 + 内容 sha256，版本变化（或 NER 可用性变化）后旧条目不再命中；
+        fast 模式的版本标记不同，两种模式的结果分别缓存。"""
+        return f"{parser_version_tag(mode)}:{content_hash}"
+
+    # 查询缓存，命中时刷新 last_access 并返回 ResumeParseResult
+    def Get(self, content_hash: str, mode: str = PARSE_MODE_ACCURATE) -> Optional[ResumeParseResult]:
+        result = self._Load(self.MakeKey(content_hash, mode))
+        with self._lock:
+            if result is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return result
+
+    def _Load(self, key: str) -> Optional[ResumeParseResult]:
+        db = self._db
+        db.Execute('SELECT result FROM parse_cache WHERE key = ?', (key,))
+        rows = db.FetchAll()
+        if not rows:
+            return None
+        db.Execute('UPDATE parse_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+        try:
+            return ResumeParseResult(**json.loads(rows[0][0]))
+        except Exception:
+            # 条目损坏或字段已变更，视为未命中
+            return None
+
+    def FindNearDuplicates(self, signature: Sequence[int], exclude: Optional[str] = None,
+                           min_similarity: float = NEAR_DUP_MIN_SIMILARITY) -> List[Tuple[str, float]]:
+        """签名与 signature 近似（估计相似度不低于 min_similarity）的已解析上传，
+        返回 [(内容哈希, 相似度), ...] 按相似度降序；exclude 为当前上传自身的内容哈希。
+        候选按命中的 LSH 分段数从多到少取前 NEAR_DUP_MAX_CANDIDATES 个（命中段数越多，相似度通常越高）。"""
+        if not signature:
+            return []
+        keys = lsh_keys(signature)
+        marks = ','.join('?' * len(keys))
+        self._db.Execute(f'SELECT b.content_hash, s.signature FROM parse_signature_bands b '
+                         f'JOIN parse_signatures s ON s.content_hash = b.content_hash '
+                         f'WHERE b.key IN ({marks}) AND b.content_hash != ? '
+                         f'GROUP BY b.content_hash ORDER BY COUNT(*) DESC LIMIT ?',
+                         keys + [exclude or '', NEAR_DUP_MAX_CANDIDATES])
+        found = [(other, similarity(signature, unpack_signature(sig))) for other, sig in self._db.FetchAll()]
+        return sorted((f for f in found if f[1] >= min_similarity), key=lambda f: -f[1])
+
+    def GetSameText(self, text_hash: str, mode: str = PARSE_MODE_ACCURATE,
+                    exclude: Optional[str] = None) -> Optional[Tuple[str, ResumeParseResult]]:
+        """规范化文本与 text_hash 相同且在当前解析器版本下仍有缓存结果的另一次上传：(内容哈希, 解析结果)。"""
+        self._db.Execute('SELECT content_hash FROM parse_signatures WHERE text_hash = ? AND content_hash != ? '
+                         'LIMIT ?', (text_hash, exclude or '', NEAR_DUP_MAX_CANDIDATES))
+        for (other,) in self._db.FetchAll():
+            result = self._Load(self.MakeKey(other, mode))
+            if result is not None:
+                return other, result
+        return None
+
+    def GetNearDuplicate(self, signature: Sequence[int], mode: str = PARSE_MODE_ACCURATE,
+                         exclude: Optional[str] = None) -> Optional[Tuple[str, float, ResumeParseResult]]:
+        """最相似且在当前解析器版本下仍有缓存结果的近似重复上传：(内容哈希, 相似度, 解析结果)。"""
+        for other, sim in self.FindNearDuplicates(signature, exclude):
+            result = self._Load(self.MakeKey(other, mode))
+            if result is not None:
+                return other, sim, result
+        return None
+
+    # 写入缓存（signature 非空时同时写入近似重复索引，text_hash 见 TextHash），并在超出容量时按 LRU 淘汰
+    def Put(self, content_hash: str, result: ResumeParseResult, mode: str = PARSE_MODE_ACCURATE,
+            signature: Sequence[int] = (), text_hash: Optional[str] = None):
+        # 写入时重新取版本标记：解析过程中 NER 可能刚完成加载
+        key = self.MakeKey(content_hash, mode)
+        payload = json.dumps(asdict(result), ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._db.Transaction() as db:
+            db.Execute('INSERT OR REPLACE INTO parse_cache (key, content_hash, result, size, created_at, last_access) '
+                       'VALUES (?, ?, ?, ?, ?, ?)', (key, content_hash, payload, size, now, now))
+            if signature:
+                db.Execute('INSERT OR REPLACE INTO parse_signatures (content_hash, signature, text_hash, created_at) '
+                           'VALUES (?, ?, ?, ?)', (content_hash, pack_signature(signature), text_hash, now))
+                db.Execute('DELETE FROM parse_signature_bands WHERE content_hash = ?', (content_hash,))
+                db.ExecuteMany('INSERT INTO parse_signature_bands (key, content_hash) VALUES (?, ?)',
+                               [(k, content_hash) for k in set(lsh_keys(signature))])
+            self._Evict(db)
+
+    def _Evict(self, db: CCSqlite):
+        db.Execute('SELECT COALESCE(SUM(size), 0) FROM parse_cache')
+        total = db.FetchAll()[0][0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        hashes = set()
+        for key, content_hash, size in db.Iterate('SELECT key, content_hash, size FROM parse_cache '
+                                                  'ORDER BY last_access ASC', batch_size=64):
+            if excess <= 0:
+                break
+            victims.append((key,))
+            hashes.add(content_hash)
+            excess -= size
+        db.ExecuteMany('DELETE FROM parse_cache WHERE key = ?', victims)
+        # 上传的全部结果（各模式、各版本）都被淘汰后，才不再作为近似重复的候选
+        orphans = []
+        for content_hash in hashes:
+            db.Execute('SELECT 1 FROM parse_cache WHERE content_hash = ? LIMIT 1', (content_hash,))
+            if db.FetchOne() is None:
+                orphans.append((content_hash,))
+        db.ExecuteMany('DELETE FROM parse_signature_bands WHERE content_hash = ?', orphans)
+        db.ExecuteMany('DELETE FROM parse_signatures WHERE content_hash = ?', orphans)
+
+    # 命中率统计（hits/misses 为当前进程内计数）
+    def Stats(self) -> Dict[str, Any]:
+        self._db.Execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache')
+        entries, total = self._db.FetchAll()[0]
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': (hits / lookups) if lookups else 0.0,
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,116 @@
+import logging
+import os
+import queue
+import threading
+import uuid
+from typing import Optional, Tuple
+from werkzeug.utils import secure_filename
+from Source.Utils.Metrics import UPLOADS_ARCHIVED
+
+logger = logging.getLogger(__name__)
+
+# 上传原件的归档目录。解析直接读取内存中的上传内容，原件落盘只是归档：由后台线程异步写入，不在请求的延迟路径上。
+# 只读或 tmpfs 受限的容器可设置 CCRESUME_ARCHIVE_UPLOADS=0 关闭归档（提交-轮询模式仍需要把文件交给工作进程，
+# 这时会同步写入 UPLOAD_DIR）
+UPLOAD_DIR = os.environ.get('CCRESUME_UPLOAD_DIR', os.path.join('Saved', 'Uploads'))
+ARCHIVE_UPLOADS = os.environ.get('CCRESUME_ARCHIVE_UPLOADS', '1') != '0'
+# 待写入的归档上限；磁盘跟不上时丢弃新的归档（计入 ccresume_upload_archive_total{outcome="dropped"}），不阻塞请求
+ARCHIVE_MAX_PENDING = int(os.environ.get('CCRESUME_ARCHIVE_MAX_PENDING', '64'))
+
+
+def upload_name(filename: str) -> Tuple[str, str]:
+    """返回 (安全的原文件名, 带随机前缀的落盘文件名)，同名上传互不覆盖。"""
+    short_name = secure_filename(filename or '')
+    return short_name, f'{uuid.uuid4().hex}_{short_name}'
+
+
+def save_upload(data: bytes, stored_name: str, directory: str = UPLOAD_DIR) -> str:
+    """同步写入 directory/stored_name 并返回路径；先写临时文件再改名，读者不会看到写了一半的文件。"""
+    os.makedirs(directory, exist_ok=True)
+    dest = os.path.join(directory, stored_name)
+    tmp = dest + '.tmp'
+    with open(tmp, 'wb') as fh:
+        fh.write(data)
+    os.replace(tmp, dest)
+    return dest
+
+
+class UploadArchiver:
+    """单个后台线程顺序写入上传原件。Submit 只入队即返回；Stop 写完已入队的文件后退出。"""
+
+    def __init__(self, directory: str = UPLOAD_DIR, max_pending: int = ARCHIVE_MAX_PENDING):
+        self.directory = directory
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max(1, max_pending))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # 异步归档，返回将写入的路径；队列已满时丢弃并返回 None
+    def Submit(self, data: bytes, stored_name: str) -> Optional[str]:
+        self._EnsureThread()
+        try:
+            self._queue.put_nowait((data, stored_name))
+        except queue.Full:
+            logger.warning('Upload archive queue full, dropping %s', stored_name)
+            UPLOADS_ARCHIVED.Inc(outcome='dropped')
+            return None
+        return os.path.join(self.directory, stored_name)
+
+    # 等待已入队的文件全部写完
+    def Flush(self):
+        self._queue.join()
+
+    def Stop(self, timeout: float = 30.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _EnsureThread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._Run, name='upload-archiver', daemon=True)
+                self._thread.start()
+
+    def _Run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                data, stored_name = item
+                try:
+                    save_upload(data, stored_name, self.directory)
+                    UPLOADS_ARCHIVED.Inc(outcome='saved')
+                except Exception:
+                    logger.exception('Failed to archive upload %s', stored_name)
+                    UPLOADS_ARCHIVED.Inc(outcome='failed')
+            finally:
+                self._queue.task_done()
+
+
+# 进程内共享的归档线程（懒创建）
+_ARCHIVER = None
+_ARCHIVER_LOCK = threading.Lock()
+def _get_archiver():
+    global _ARCHIVER
+    with _ARCHIVER_LOCK:
+        if _ARCHIVER is None:
+            _ARCHIVER = UploadArchiver()
+        return _ARCHIVER
+
+
+def archive_upload(data: bytes, stored_name: str) -> Optional[str]:
+    """归档开启时把上传原件交给后台线程写入 UPLOAD_DIR，返回将写入的路径；关闭或丢弃时返回 None。"""
+    if not ARCHIVE_UPLOADS:
+        return None
+    return _get_archiver().Submit(data, stored_name)
+
+
+def shutdown_archiver(timeout: float = 30.0):
+    global _ARCHIVER
+    with _ARCHIVER_LOCK:
+        archiver, _ARCHIVER = _ARCHIVER, None
+    if archiver is not None:
+        archiver.Stop(timeout)
@@ -0,0 +1,265 @@
+import math
+import re
+import sys
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+from Source.CCSqlite.CCSqlite import CCSqlite
+from Source.Utils.SkillTaxonomy import get_skill_taxonomy
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except Exception:
+    np = None
+    _HAS_NUMPY = False
+
+# BM25 参数
+RANK_K1 = 1.2
+RANK_B = 0.75
+# 职位描述中识别出的技能（技能词表规范 id）相对普通词项的查询权重
+RANK_SKILL_WEIGHT = 3.0
+# 职位描述最多保留的词项数（按 idf × 权重取最高的若干个）；长 JD 中的常见双字（负责、工作、要求……）
+# 对排序贡献很小，却要遍历很长的倒排表，截断后查询代价与 JD 长度无关
+RANK_MAX_QUERY_TERMS = 64
+RANK_MAX_TOP_K = 100
+# 增量段的倒排项数超过 max(该值, 主段的 1/8) 时并入主段
+RANK_DELTA_MIN = 200_000
+# 载入时每累积这么多倒排项就转换为一组 NumPy 数组（避免大量 Python 整数对象占用内存）
+_CHUNK_POSTINGS = 100_000
+
+# 词项：技能为 skill:<规范 id>；文本中 ASCII 单词按小写整词，连续汉字按重叠双字切分（单个汉字保留为一个词项）
+SKILL_PREFIX = 'skill:'
+_CJK = r'\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+# 三种词项各用一个正则扫描（重叠双字用零宽前瞻捕获），切分全部在正则引擎内完成
+_BIGRAM_RE = re.compile(f'(?=([{_CJK}]{{2}}))')
+_SINGLE_CJK_RE = re.compile(f'(?<![{_CJK}])[{_CJK}](?![{_CJK}])')
+_ASCII_WORD_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def text_terms(text: str) -> List[str]:
+    text = (text or '').lower()
+    return _BIGRAM_RE.findall(text) + _SINGLE_CJK_RE.findall(text) + _ASCII_WORD_RE.findall(text)
+
+
+def document_terms(careers: Iterable[str], education: Iterable[str],
+                   technologies: Iterable[Iterable[str]]) -> Dict[str, int]:
+    """一份简历的词频：职业/教育经历文本的词项，以及每段经历的技术栈（已规范化的 id，词频为提到该技能的经历数）。"""
+    counts = Counter(text_terms('\n'.join(careers or [])))
+    counts.update(text_terms('\n'.join(education or [])))
+    for techs in technologies:
+        counts.update({SKILL_PREFIX + t for t in techs})
+    return dict(counts)
+
+
+def pack_terms(terms: Dict[str, int]) -> Tuple[int, str, bytes]:
+    """resume_terms 中的存储形式：(文档长度, 空格分隔的词项, 小端 uint16 词频数组)；词项本身不含空白字符。"""
+    tfs = array('H', (min(tf, 65535) for tf in terms.values()))
+    if sys.byteorder == 'big':
+        tfs.byteswap()
+    return sum(terms.values()), ' '.join(terms), tfs.tobytes()
+
+
+def query_terms(job_description: str) -> Dict[str, float]:
+    """职位描述的查询词项与权重：文本词项各计一次，词表中识别出的技能按 RANK_SKILL_WEIGHT 加权。"""
+    weights = {t: 1.0 for t in text_terms(job_description)}
+    for skill_id in get_skill_taxonomy().Match(job_description or ''):
+        weights[SKILL_PREFIX + skill_id] = RANK_SKILL_WEIGHT
+    return weights
+
+
+class ResumeRanker:
+    """职位描述到简历的 BM25 排序，倒排索引常驻内存（NumPy 数组）。
+
+    每份简历的词频由 ResumeStore 在入库时写入 resume_terms 表（seq 单调递增，覆盖入库会得到新的 seq）。
+    索引首次使用时载入全部行，之后 Refresh 只读取 seq 大于已载入水位的新行，
+    因此本进程与其他进程（后台工作进程、其他 Web 进程）提交的简历都能增量加入。
+    倒排表分为主段与增量段，两者都是按词项排序的 CSR 数组；新载入的倒排项先按块暂存，
+    查询前并入较小的增量段，增量段较大时再并入主段。被覆盖或删除的简历只标记槽位失效，合并时清除。"""
+
+    def __init__(self, db: CCSqlite):
+        if not _HAS_NUMPY:
+            raise RuntimeError('numpy is required for resume ranking')
+        self._db = db
+        self._lock = threading.Lock()
+        self._term_ids: Dict[str, int] = {}
+        # 文档槽位：简历 id、文档长度、是否有效（容量按倍数增长）
+        self._size = 0
+        self._resume_ids = np.zeros(0, dtype=np.int64)
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._slot_of: Dict[int, int] = {}
+        self._alive_count = 0
+        self._total_length = 0.0
+        # 主段/增量段为 (offsets, docs, tfs)：第 t 个词项的倒排为 docs/tfs[offsets[t]:offsets[t + 1]]
+        self._main = _empty_segment()
+        self._delta = _empty_segment()
+        # 暂存的倒排项：已转换的数组块，以及尚未转换的词项 id/槽位列表与每份简历的词频数组
+        self._chunks: List[Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']] = []
+        self._buffer: Tuple[List[int], List[int], List['np.ndarray']] = ([], [], [])
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return self._alive_count
+
+    def Refresh(self):
+        """载入 resume_terms 中尚未载入的行，并同步其他连接删除的简历。"""
+        with self._lock:
+            self._Refresh()
+
+    def _Refresh(self):
+        db = self._db
+        db.Execute('SELECT COALESCE(MAX(seq), 0), COUNT(*) FROM resume_terms')
+        max_seq, count = db.FetchOne()
+        if max_seq > self._seq:
+            for seq, resume_id, length, terms, tfs in db.Iterate(
+                    'SELECT seq, resume_id, length, terms, tfs FROM resume_terms WHERE seq > ? ORDER BY seq',
+                    (self._seq,)):
+                self._AddDoc(resume_id, length, terms.split(' ') if terms else [], np.frombuffer(tfs, dtype='<u2'))
+                self._seq = seq
+        if count != self._alive_count:
+            # 其他连接删除了简历：按表中现存的 id 重新标记
+            live = {resume_id for (resume_id,) in db.Iterate('SELECT resume_id FROM resume_terms')}
+            for resume_id in [r for r in self._slot_of if r not in live]:
+                self._Kill(self._slot_of.pop(resume_id))
+        self._Fold()
+
+    def _AddDoc(self, resume_id: int, length: int, terms: List[str], tfs: 'np.ndarray'):
+        old = self._slot_of.get(resume_id)
+        if old is not None:
+            self._Kill(old)
+        if self._size == len(self._resume_ids):
+            capacity = max(1024, self._size * 2)
+            self._resume_ids = np.resize(self._resume_ids, capacity)
+            self._lengths = np.resize(self._lengths, capacity)
+            self._alive = np.resize(self._alive, capacity)
+        slot = self._size
+        self._size += 1
+        self._resume_ids[slot] = resume_id
+        self._lengths[slot] = length
+        self._alive[slot] = True
+        self._slot_of[resume_id] = slot
+        self._alive_count += 1
+        self._total_length += length
+        term_ids = self._term_ids
+        buf_tids, buf_docs, buf_tfs = self._buffer
+        ids = list(map(term_ids.get, terms))
+        if None in ids:
+            ids = [term_ids.setdefault(term, len(term_ids)) for term in terms]
+        buf_tids.extend(ids)
+        buf_docs.extend([slot] * len(terms))
+        buf_tfs.append(tfs)
+        if len(buf_tids) >= _CHUNK_POSTINGS:
+            self._Flush()
+
+    def _Kill(self, slot: int):
+        if self._alive[slot]:
+            self._alive[slot] = False
+            self._alive_count -= 1
+            self._total_length -= float(self._lengths[slot])
+
+    def _Flush(self):
+        tids, docs, tfs = self._buffer
+        if tids:
+            self._chunks.append((np.array(tids, dtype=np.int32), np.array(docs, dtype=np.int32),
+                                 np.concatenate(tfs).astype(np.uint16)))
+            self._buffer = ([], [], [])
+
+    def _Fold(self):
+        """暂存的倒排项并入增量段；增量段超过 max(RANK_DELTA_MIN, 主段的 1/8) 时再并入主段。"""
+        self._Flush()
+        if not self._chunks:
+            return
+        parts = [_segment_triples(self._delta)] + self._chunks
+        self._chunks = []
+        if sum(len(p[0]) for p in parts) > max(RANK_DELTA_MIN, len(self._main[1]) // 8):
+            parts.insert(0, _segment_triples(self._main))
+            self._main = self._BuildSegment(parts)
+            self._delta = _empty_segment()
+        else:
+            self._delta = self._BuildSegment(parts)
+
+    def _BuildSegment(self, parts):
+        """按词项稳定排序重建 CSR，并丢弃失效槽位的倒排项。"""
+        tids = np.concatenate([p[0] for p in parts])
+        docs = np.concatenate([p[1] for p in parts])
+        tfs = np.concatenate([p[2] for p in parts])
+        keep = self._alive[docs]
+        if not keep.all():
+            tids, docs, tfs = tids[keep], docs[keep], tfs[keep]
+        order = np.argsort(tids, kind='stable')
+        n_terms = len(self._term_ids)
+        offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tids, minlength=n_terms), out=offsets[1:])
+        return offsets, docs[order], tfs[order]
+
+    def _Postings(self, tid: int):
+        parts = [_segment_postings(seg, tid) for seg in (self._main, self._delta)]
+        if not len(parts[1][0]):
+            return parts[0]
+        return np.concatenate([parts[0][0], parts[1][0]]), np.concatenate([parts[0][1], parts[1][1]])
+
+    def Rank(self, job_description: str, top_k: int = 20) -> Tuple[List[Tuple[int, float]], List[str]]:
+        """返回 ([(简历 id, 分数), ...] 按分数降序, 实际参与打分的查询词项)。"""
+        top_k = max(1, min(RANK_MAX_TOP_K, int(top_k)))
+        weights = query_terms(job_description)
+        with self._lock:
+            self._Refresh()
+            n = self._alive_count
+            if not n or not weights:
+                return [], []
+            alive = self._alive[:self._size]
+            has_dead = n != self._size
+            candidates = []
+            for term, weight in weights.items():
+                tid = self._term_ids.get(term)
+                if tid is None:
+                    continue
+                docs, tfs = self._Postings(tid)
+                if has_dead:
+                    live = alive[docs]
+                    docs, tfs = docs[live], tfs[live]
+                if len(docs):
+                    idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                    candidates.append((idf * weight, term, docs, tfs))
+            candidates.sort(key=lambda c: -c[0])
+            candidates = candidates[:RANK_MAX_QUERY_TERMS]
+            if not candidates:
+                return [], []
+            avgdl = self._total_length / n
+            norm = RANK_K1 * (1 - RANK_B + RANK_B * self._lengths[:self._size] / np.float32(avgdl))
+            scores = np.zeros(self._size, dtype=np.float32)
+            for w, _, docs, tfs in candidates:
+                tfs = tfs.astype(np.float32)
+                # 同一词项的倒排中槽位不重复，可以直接按下标累加
+                scores[docs] += np.float32(w * (RANK_K1 + 1)) * tfs / (tfs + norm[docs])
+            hits = np.flatnonzero(scores)
+            if len(hits) > top_k:
+                hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            hits = hits[np.lexsort((-self._resume_ids[hits], -scores[hits]))]
+            ranked = [(int(self._resume_ids[s]), float(scores[s])) for s in hits]
+            return ranked, [c[1] for c in candidates]
+
+    def Stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'resumes': self._alive_count, 'terms': len(self._term_ids),
+                    'postings': len(self._main[1]) + len(self._delta[1]), 'delta_postings': len(self._delta[1])}
+
+
+def _empty_segment():
+    return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.uint16)
+
+
+def _segment_triples(segment):
+    offsets, docs, tfs = segment
+    tids = np.repeat(np.arange(len(offsets) - 1, dtype=np.int32), np.diff(offsets))
+    return tids, docs, tfs
+
+
+def _segment_postings(segment, tid: int):
+    offsets, docs, tfs = segment
+    if tid + 1 < len(offsets):
+        lo, hi = offsets[tid], offsets[tid + 1]
+        return docs[lo:hi], tfs[lo:hi]
+    return docs[:0], tfs[:0]
@@ -0,0 +1,406 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+from Source.CCSqlite.CCSqlite import CCSqlite
+from Source.Utils.SkillTaxonomy import get_skill_taxonomy
+from Source.System.ResumeStore.ResumeRanker import ResumeRanker, document_terms, pack_terms, RANK_MAX_TOP_K
+
+logger = logging.getLogger(__name__)
+
+# 简历库位置；分页上限
+DEFAULT_RESUME_DB = os.path.join('Saved', 'DataBase', 'resumes.db')
+SEARCH_MAX_PER_PAGE = 100
+# 命中总数最多精确统计到该值，超过时返回 total=SEARCH_COUNT_LIMIT、total_exact=False（界面显示为「1000+」）。
+# 全文命中数在此范围内时按 bm25 相关度排序；命中过多（例如常见词）时对全部命中打分/计数的代价与命中数成正比，
+# 改为按入库时间倒序，使每页查询保持毫秒级
+SEARCH_COUNT_LIMIT = 1000
+# 公司/技术栈条件命中的行数超过该值时改用相关子查询（见 ResumeStore._ChildFilter）
+SEARCH_IN_LIMIT = 5000
+
+# 简历库的表结构迁移（按版本追加，不修改已发布的条目）
+# - resumes：每份简历一行，姓名/电话/邮箱建索引，result 保存完整的 ResumeParseResult JSON；
+# - resume_careers / resume_technologies：careers_struct 拆出的公司与技术栈，按值建索引；
+# - resume_fts：职业经历与教育经历全文索引（FTS5，rowid 即 resumes.id）。
+#   unicode61 分词器把连续汉字视为一个词，因此写入和查询前都把每个汉字用空格隔开，
+#   查询词作为短语匹配，等价于按子串检索中文。
+# - resume_terms：职位描述排序（ResumeRanker）使用的每份简历词频，seq 单调递增，供各进程增量载入。
+RESUME_STORE_MIGRATIONS = [
+    [
+        'CREATE TABLE IF NOT EXISTS resumes ('
+        'id INTEGER PRIMARY KEY, content_hash TEXT, source_file TEXT, '
+        'name TEXT COLLATE NOCASE, age TEXT, sex TEXT, phone TEXT, email TEXT COLLATE NOCASE, '
+        'result TEXT NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS idx_resumes_name ON resumes(name)',
+        'CREATE INDEX IF NOT EXISTS idx_resumes_phone ON resumes(phone)',
+        'CREATE INDEX IF NOT EXISTS idx_resumes_email ON resumes(email)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes(content_hash)',
+        'CREATE TABLE IF NOT EXISTS resume_careers ('
+        'id INTEGER PRIMARY KEY, resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE, '
+        'ord INTEGER NOT NULL, company TEXT COLLATE NOCASE, title TEXT, period TEXT)',
+        'CREATE INDEX IF NOT EXISTS idx_resume_careers_company ON resume_careers(company, resume_id)',
+        'CREATE INDEX IF NOT EXISTS idx_resume_careers_resume ON resume_careers(resume_id)',
+        'CREATE TABLE IF NOT EXISTS resume_technologies ('
+        'resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE, '
+        'career_id INTEGER REFERENCES resume_careers(id) ON DELETE CASCADE, technology TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS idx_resume_technologies_tech ON resume_technologies(technology, resume_id)',
+        'CREATE INDEX IF NOT EXISTS idx_resume_technologies_resume ON resume_technologies(resume_id)',
+        'CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(careers, education, '
+        "tokenize = 'unicode61 remove_diacritics 2')",
+    ],
+    # 技术栈改为技能词表的规范 id（见 SkillTaxonomy）：旧版固定词表中名称与 id 不同的几项改写，并去掉由此产生的重复行
+    [
+        "UPDATE resume_technologies SET technology = 'cpp' WHERE technology = 'c++'",
+        "UPDATE resume_technologies SET technology = 'csharp' WHERE technology = 'c#'",
+        "UPDATE resume_technologies SET technology = 'go' WHERE technology = 'golang'",
+        "UPDATE resume_technologies SET technology = 'bluetooth' WHERE technology = 'bt'",
+        'DELETE FROM resume_technologies WHERE rowid NOT IN ('
+        'SELECT MIN(rowid) FROM resume_technologies GROUP BY resume_id, career_id, technology)',
+    ],
+    [
+        'CREATE TABLE IF NOT EXISTS resume_terms ('
+        'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+        'resume_id INTEGER NOT NULL UNIQUE REFERENCES resumes(id) ON DELETE CASCADE, '
+        'length INTEGER NOT NULL, terms TEXT NOT NULL, tfs BLOB NOT NULL)',
+    ],
+    # 疑似重复：与之前某次上传近似重复的简历记录那次上传的内容哈希，是否合并由人工决定
+    [
+        'ALTER TABLE resumes ADD COLUMN duplicate_of TEXT',
+        'CREATE INDEX IF NOT EXISTS idx_resumes_duplicate_of ON resumes(duplicate_of)',
+    ],
+]
+
+_CJK = r'\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+# 每个汉字映射为「空格+汉字+空格」的转换表（str.translate 逐字符查表，比逐个正则替换快一个数量级）
+_FTS_TABLE = {cp: f' {chr(cp)} ' for lo, hi in ((0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF))
+              for cp in range(lo, hi + 1)}
+# snippet 高亮标记（先用控制字符，去掉汉字间的空格后再替换为方括号）
+_HL_OPEN, _HL_CLOSE = '\x02', '\x03'
+_CJK_SPACES_RE = re.compile(f'(?<=[{_CJK}{_HL_OPEN}{_HL_CLOSE}]) +(?=[{_CJK}{_HL_OPEN}{_HL_CLOSE}])')
+_SNIPPET_SQL = f"snippet(resume_fts, -1, '{_HL_OPEN}', '{_HL_CLOSE}', '…', 24)"
+_PHONE_DIGITS_RE = re.compile(r'\D')
+
+
+def fts_text(text: str) -> str:
+    """写入/查询 FTS 前的规范化：每个汉字前后加空格，使 unicode61 按单字切分。"""
+    return (text or '').translate(_FTS_TABLE)
+
+
+def _format_snippet(text: str) -> str:
+    text = _CJK_SPACES_RE.sub('', re.sub(r' {2,}', ' ', text)).replace('\n ', '\n').strip()
+    # 相邻的高亮片段合并：[开][发] -> [开发]
+    return text.replace(_HL_CLOSE + _HL_OPEN, '').replace(_HL_OPEN, '[').replace(_HL_CLOSE, ']')
+
+
+def fts_query(query: str) -> Optional[str]:
+    """把用户输入的空格分隔关键词转换为 FTS5 查询：每个关键词是一个短语，关键词之间为 AND。"""
+    phrases = []
+    for term in query.split():
+        tokens = fts_text(term).split()
+        if tokens:
+            phrases.append('"' + ' '.join(tokens).replace('"', '""') + '"')
+    return ' AND '.join(phrases) if phrases else None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    if not phone:
+        return None
+    digits = _PHONE_DIGITS_RE.sub('', phone)
+    # 去掉中国大陆国家码，便于与用户输入的 11 位号码匹配
+    if len(digits) == 13 and digits.startswith('86'):
+        digits = digits[2:]
+    return digits or None
+
+
+def normalize_technology(tech: str) -> str:
+    """技术栈的入库/检索形式：技能词表中的名称与同义词统一为规范 id（Golang、go 都检索到 go），其余转为小写。"""
+    tech = tech.strip()
+    return get_skill_taxonomy().CanonicalId(tech) or tech.lower()
+
+
+def _career_technologies(data: Dict[str, Any]) -> List[List[str]]:
+    """careers_struct 中每段经历规范化、去重后的技术栈。"""
+    return [sorted({normalize_technology(t) for t in item.get('technologies') or [] if t and t.strip()})
+            for item in data.get('careers_struct') or []]
+
+
+def _rank_terms_row(resume_id: int, data: Dict[str, Any], techs: List[List[str]]) -> Tuple[int, int, str, bytes]:
+    return (resume_id,) + pack_terms(document_terms(data.get('careers') or [], data.get('education') or [], techs))
+
+
+def _like_prefix(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+class ResumeStore:
+    """持久化的简历库：ResumeParseResult 拆分写入规范化表，支持全文（职业/教育经历）与字段检索、分页。"""
+
+    def __init__(self, db_path: str = DEFAULT_RESUME_DB):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._db = CCSqlite.Shared(db_path)
+        self._db.Migrate(RESUME_STORE_MIGRATIONS)
+        self._ranker: Optional[ResumeRanker] = None
+        self._ranker_lock = threading.Lock()
+
+    # 保存一份解析结果，返回简历 id；content_hash 相同的简历会被覆盖（保留原 id）
+    def Add(self, result, content_hash: Optional[str] = None, source_file: Optional[str] = None) -> int:
+        return self.AddMany([(result, content_hash, source_file)])[0]
+
+    # 批量保存（一个事务），返回与输入顺序一致的简历 id
+    def AddMany(self, items: Iterable[Tuple[Any, Optional[str], Optional[str]]]) -> List[int]:
+        ids = []
+        now = time.time()
+        with self._db.Transaction() as db:
+            for result, content_hash, source_file in items:
+                data = asdict(result) if is_dataclass(result) else dict(result)
+                resume_id = None
+                if content_hash:
+                    db.Execute('SELECT id FROM resumes WHERE content_hash = ?', (content_hash,))
+                    row = db.FetchOne()
+                    if row:
+                        resume_id = row[0]
+                        self._DeleteChildren(db, resume_id)
+                values = (content_hash, source_file, data.get('name'), data.get('age'), data.get('sex'),
+                          normalize_phone(data.get('phone')), data.get('email'), data.get('duplicate_of'),
+                          json.dumps(data, ensure_ascii=False))
+                if resume_id is None:
+                    db.Execute('INSERT INTO resumes (content_hash, source_file, name, age, sex, phone, email, duplicate_of, '
+                               'result, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                               values + (now, now))
+                    resume_id = db.cursor.lastrowid
+                else:
+                    db.Execute('UPDATE resumes SET content_hash = ?, source_file = ?, name = ?, age = ?, sex = ?, '
+                               'phone = ?, email = ?, duplicate_of = ?, result = ?, updated_at = ? WHERE id = ?',
+                               values + (now, resume_id))
+                ids.append(resume_id)
+                career_techs = _career_technologies(data)
+                for ord_, (item, techs) in enumerate(zip(data.get('careers_struct') or [], career_techs)):
+                    db.Execute('INSERT INTO resume_careers (resume_id, ord, company, title, period) '
+                               'VALUES (?, ?, ?, ?, ?)',
+                               (resume_id, ord_, item.get('company'), item.get('title'), item.get('period')))
+                    career_id = db.cursor.lastrowid
+                    db.ExecuteMany('INSERT INTO resume_technologies (resume_id, career_id, technology) '
+                                   'VALUES (?, ?, ?)', [(resume_id, career_id, t) for t in techs])
+                db.Execute('INSERT INTO resume_fts (rowid, careers, education) VALUES (?, ?, ?)',
+                           (resume_id, fts_text('\n'.join(data.get('careers') or [])),
+                            fts_text('\n'.join(data.get('education') or []))))
+                db.Execute('INSERT INTO resume_terms (resume_id, length, terms, tfs) VALUES (?, ?, ?, ?)',
+                           _rank_terms_row(resume_id, data, career_techs))
+        # 排序索引已载入时增量加入新简历
+        if self._ranker is not None:
+            self._ranker.Refresh()
+        return ids
+
+    def _DeleteChildren(self, db: CCSqlite, resume_id: int):
+        db.Execute('DELETE FROM resume_terms WHERE resume_id = ?', (resume_id,))
+        db.Execute('DELETE FROM resume_technologies WHERE resume_id = ?', (resume_id,))
+        db.Execute('DELETE FROM resume_careers WHERE resume_id = ?', (resume_id,))
+        db.Execute('DELETE FROM resume_fts WHERE rowid = ?', (resume_id,))
+
+    def Delete(self, resume_id: int):
+        with self._db.Transaction() as db:
+            self._DeleteChildren(db, resume_id)
+            db.Execute('DELETE FROM resumes WHERE id = ?', (resume_id,))
+        if self._ranker is not None:
+            self._ranker.Refresh()
+
+    # 读取完整的解析结果；不存在时返回 None
+    def Get(self, resume_id: int) -> Optional[Dict[str, Any]]:
+        self._db.Execute('SELECT id, source_file, result, created_at FROM resumes WHERE id = ?', (resume_id,))
+        row = self._db.FetchOne()
+        if row is None:
+            return None
+        data = json.loads(row[2])
+        data.update({'id': row[0], 'source_file': row[1], 'created_at': row[3]})
+        return data
+
+    def Count(self) -> int:
+        self._db.Execute('SELECT COUNT(*) FROM resumes')
+        return self._db.FetchOne()[0]
+
+    def Search(self, q: Optional[str] = None, name: Optional[str] = None, phone: Optional[str] = None,
+               email: Optional[str] = None, company: Optional[str] = None, technology: Optional[str] = None,
+               page: int = 1, per_page: int = 20) -> Dict[str, Any]:
+        """关键词与字段组合检索，条件之间为 AND。
+        q 在职业/教育经历中全文检索，只有关键词条件且命中数不超过 SEARCH_COUNT_LIMIT 时按相关度排序（ranked=True），
+        否则按入库时间倒序；name/company 为前缀匹配（忽略大小写），phone/email/technology 为精确匹配。
+        返回 {'total', 'total_exact', 'page', 'per_page', 'ranked', 'results'}。"""
+        page = max(1, int(page))
+        per_page = max(1, min(SEARCH_MAX_PER_PAGE, int(per_page)))
+        where = []
+        params: List[Any] = []
+        # selective：存在命中较少的字段条件时，由该条件驱动查询，全文条件逐行校验
+        selective = False
+        match = fts_query(q) if q else None
+        if name:
+            where.append("r.name LIKE ? ESCAPE '\\'")
+            params.append(_like_prefix(name.strip()))
+            selective = True
+        if phone:
+            where.append('r.phone = ?')
+            params.append(normalize_phone(phone))
+            selective = True
+        if email:
+            where.append('r.email = ?')
+            params.append(email.strip())
+            selective = True
+        for table, condition, value in (
+                ('resume_careers', "company LIKE ? ESCAPE '\\'", _like_prefix(company.strip()) if company else None),
+                ('resume_technologies', 'technology = ?', normalize_technology(technology) if technology else None)):
+            if value is None:
+                continue
+            clause, few = self._ChildFilter(table, condition, value)
+            where.append(clause)
+            params.append(value)
+            selective = selective or few
+
+        ranked = False
+        if match and not selective:
+            source = 'resume_fts JOIN resumes r ON r.id = resume_fts.rowid'
+            where.insert(0, 'resume_fts MATCH ?')
+            params.insert(0, match)
+        else:
+            source = 'resumes r'
+            if match:
+                # FTS5 对「MATCH + rowid =」只定位该文档的倒排项，逐行校验的代价与候选数成正比
+                where.append('EXISTS (SELECT 1 FROM resume_fts WHERE resume_fts MATCH ? AND resume_fts.rowid = r.id)')
+                params.append(match)
+        clause = ('WHERE ' + ' AND '.join(where)) if where else ''
+
+        db = self._db
+        db.Execute(f'SELECT COUNT(*) FROM (SELECT 1 FROM {source} {clause} LIMIT ?)', params + [SEARCH_COUNT_LIMIT + 1])
+        total = db.FetchOne()[0]
+        total_exact = total <= SEARCH_COUNT_LIMIT
+        total = min(total, SEARCH_COUNT_LIMIT)
+        if match and not selective and total_exact:
+            ranked = True
+            order = 'ORDER BY bm25(resume_fts), r.id DESC'
+        elif match and not selective:
+            # 命中过多时让 FTS5 直接按 rowid 倒序产出命中，无需对全部命中打分排序
+            order = 'ORDER BY resume_fts.rowid DESC'
+        else:
+            order = 'ORDER BY r.id DESC'
+        fts_driven = bool(match) and not selective
+        snippet = _SNIPPET_SQL if fts_driven else 'NULL'
+        db.Execute(f'SELECT r.id, r.name, r.phone, r.email, r.source_file, r.created_at, r.duplicate_of, {snippet} '
+                   f'FROM {source} {clause} {order} LIMIT ? OFFSET ?',
+                   params + [per_page, (page - 1) * per_page])
+        rows = db.FetchAll()
+        ids = [row[0] for row in rows]
+        companies = self._CompaniesOf(ids)
+        if fts_driven:
+            snippets = {row[0]: _format_snippet(row[7]) for row in rows}
+        elif match:
+            snippets = self._Snippets(match, ids)
+        else:
+            snippets = {}
+        results = []
+        for resume_id, name_, phone_, email_, source_file, created_at, duplicate_of, _ in rows:
+            item = {'id': resume_id, 'name': name_, 'phone': phone_, 'email': email_,
+                    'source_file': source_file, 'created_at': created_at, 'duplicate_of': duplicate_of,
+                    'companies': companies.get(resume_id, [])}
+            if resume_id in snippets:
+                item['snippet'] = snippets[resume_id]
+            results.append(item)
+        return {'total': total, 'total_exact': total_exact, 'page': page, 'per_page': per_page,
+                'ranked': ranked, 'results': results}
+
+    def Rank(self, job_description: str, top_k: int = 20) -> Dict[str, Any]:
+        """按与职位描述的 BM25 相关度（职业/教育经历文本与技术栈）返回前 top_k 份简历。
+        返回 {'total', 'top_k', 'terms', 'results'}，results 中附带 score 与命中的技能 id（matched_skills）。"""
+        top_k = max(1, min(RANK_MAX_TOP_K, int(top_k)))
+        ranked, terms = self._GetRanker().Rank(job_description, top_k)
+        ids = [resume_id for resume_id, _ in ranked]
+        rows = {}
+        skills: Dict[int, List[str]] = {}
+        if ids:
+            marks = ','.join('?' * len(ids))
+            for row in self._db.Iterate(f'SELECT id, name, phone, email, source_file, created_at FROM resumes '
+                                        f'WHERE id IN ({marks})', ids):
+                rows[row[0]] = row
+            wanted = [t.split(':', 1)[1] for t in terms if t.startswith('skill:')]
+            if wanted:
+                for resume_id, tech in self._db.Iterate(
+                        f'SELECT DISTINCT resume_id, technology FROM resume_technologies WHERE resume_id IN ({marks}) '
+                        f"AND technology IN ({','.join('?' * len(wanted))})", ids + wanted):
+                    skills.setdefault(resume_id, []).append(tech)
+        companies = self._CompaniesOf(ids)
+        results = []
+        for resume_id, score in ranked:
+            row = rows.get(resume_id)
+            if row is None:
+                continue
+            results.append({'id': resume_id, 'name': row[1], 'phone': row[2], 'email': row[3],
+                            'source_file': row[4], 'created_at': row[5], 'score': round(score, 4),
+                            'companies': companies.get(resume_id, []),
+                            'matched_skills': sorted(skills.get(resume_id, []))})
+        return {'total': len(self._ranker), 'top_k': top_k, 'terms': terms, 'results': results}
+
+    def _GetRanker(self) -> ResumeRanker:
+        """懒创建排序索引：先为尚无词频的简历（升级前入库的）补写 resume_terms，再载入全部词频。"""
+        with self._ranker_lock:
+            if self._ranker is None:
+                self._BackfillTerms()
+                ranker = ResumeRanker(self._db)
+                ranker.Refresh()
+                self._ranker = ranker
+            return self._ranker
+
+    def WarmupRanker(self, background: bool = True):
+        """预先载入排序索引（10 万份简历约需十几秒），首个排序请求不承担载入耗时。"""
+        def run():
+            try:
+                self._GetRanker()
+            except RuntimeError as e:
+                logger.warning('Resume ranking unavailable: %s', e)
+            except Exception:
+                logger.exception('Failed to load resume rank index')
+        if background:
+            threading.Thread(target=run, name='ResumeRankerWarmup', daemon=True).start()
+        else:
+            run()
+
+    def _BackfillTerms(self, batch_size: int = 500):
+        while True:
+            self._db.Execute('SELECT r.id, r.result FROM resumes r LEFT JOIN resume_terms t ON t.resume_id = r.id '
+                             'WHERE t.resume_id IS NULL LIMIT ?', (batch_size,))
+            rows = self._db.FetchAll()
+            if not rows:
+                return
+            with self._db.Transaction() as db:
+                db.ExecuteMany('INSERT OR IGNORE INTO resume_terms (resume_id, length, terms, tfs) '
+                               'VALUES (?, ?, ?, ?)',
+                               [_rank_terms_row(resume_id, data, _career_technologies(data))
+                                for resume_id, data in ((i, json.loads(r)) for i, r in rows)])
+
+    def _ChildFilter(self, table: str, condition: str, value: Any) -> Tuple[str, bool]:
+        """公司/技术栈条件，返回 (SQL 条件, 是否命中较少)。命中少时用 IN（先取出全部命中的简历 id），
+        命中多时用 EXISTS（按简历 id 倒序逐行检查，凑满一页即停），两种写法在各自场景下都是毫秒级。"""
+        self._db.Execute(f'SELECT COUNT(*) FROM (SELECT 1 FROM {table} WHERE {condition} LIMIT ?)',
+                         (value, SEARCH_IN_LIMIT + 1))
+        if self._db.FetchOne()[0] <= SEARCH_IN_LIMIT:
+            return f'r.id IN (SELECT resume_id FROM {table} WHERE {condition})', True
+        return f'EXISTS (SELECT 1 FROM {table} c WHERE c.resume_id = r.id AND c.{condition})', False
+
+    def _Snippets(self, match: str, resume_ids: List[int]) -> Dict[int, str]:
+        if not resume_ids:
+            return {}
+        marks = ','.join('?' * len(resume_ids))
+        self._db.Execute(f'SELECT rowid, {_SNIPPET_SQL} FROM resume_fts WHERE resume_fts MATCH ? AND rowid IN ({marks})', [match] + resume_ids)
+        return {resume_id: _format_snippet(snip) for resume_id, snip in self._db.FetchAll()}
+
+    def _CompaniesOf(self, resume_ids: List[int]) -> Dict[int, List[str]]:
+        if not resume_ids:
+            return {}
+        marks = ','.join('?' * len(resume_ids))
+        companies: Dict[int, List[str]] = {}
+        for resume_id, company in self._db.Iterate(
+                f'SELECT resume_id, company FROM resume_careers WHERE resume_id IN ({marks}) '
+                f'AND company IS NOT NULL ORDER BY resume_id, ord', resume_ids):
+            companies.setdefault(resume_id, []).append(company)
+        return companies
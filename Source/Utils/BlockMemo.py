@@ -0,0 +1,56 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from Source.Utils.Metrics import BLOCK_MEMO_LOOKUPS
+
+# 块级记忆化：同一份简历修改少量文字后重新解析时，大部分块内容不变，按块内容哈希复用块的归类、
+# 结构化拆分与 NER 结果，只重新计算改动过的块。进程内有界 LRU，条目数可通过环境变量覆盖（0 表示关闭）
+BLOCK_MEMO_SIZE = int(os.environ.get('CCRESUME_BLOCK_MEMO_SIZE', '4096'))
+
+
+def block_key(*parts: str) -> bytes:
+    """块内容与影响结果的上下文（例如 jieba 是否可用、年龄、NER 实体）的哈希，作为记忆化的键。"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode('utf-8', 'surrogatepass'))
+        h.update(b'\0')
+    return h.digest()
+
+
+class BlockMemo:
+    """按 (kind, key) 存取的有界 LRU，线程安全。值由调用方保证不会被修改（或存取时自行复制）；
+    不存储 None，Get 返回 None 表示未命中。"""
+
+    def __init__(self, max_entries: int = BLOCK_MEMO_SIZE):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[str, bytes], Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def Get(self, kind: str, key: bytes) -> Optional[Any]:
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            value = self._entries.get((kind, key))
+            if value is not None:
+                self._entries.move_to_end((kind, key))
+        BLOCK_MEMO_LOOKUPS.Inc(kind=kind, outcome='hit' if value is not None else 'miss')
+        return value
+
+    def Put(self, kind: str, key: bytes, value: Any):
+        if self.max_entries <= 0 or value is None:
+            return
+        with self._lock:
+            self._entries[(kind, key)] = value
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def Clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def Stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries}
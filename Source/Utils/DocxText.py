@@ -0,0 +1,163 @@
+import io
+import re
+import zipfile
+from typing import IO, List, Optional, Union
+from xml.parsers import expat
+
+# 流式 DOCX 文本提取：直接从 zip 中按块读取 word/document.xml 与页眉/页脚部件，用 expat 增量解析，
+# 不构建 DOM，内存只与输出文本成正比。按阅读顺序输出段落、表格单元格与文本框（python-docx 的
+# doc.paragraphs 会漏掉表格和文本框，而很多中文简历模板把联系方式与工作经历都放在表格里）。
+
+# expat 以 "命名空间 本地名" 报告元素名；Transitional 与 Strict 两种 OOXML 命名空间都映射到本地名
+_W_NAMESPACES = ('http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+                 'http://purl.oclc.org/ooxml/wordprocessingml/main')
+_MC = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+_TAGS = {f'{ns} {local}': local for ns in _W_NAMESPACES
+         for local in ('p', 't', 'tab', 'br', 'cr', 'noBreakHyphen', 'tbl', 'tr', 'tc')}
+# 文本框在 mc:AlternateContent 中同时有 DrawingML（mc:Choice）与 VML（mc:Fallback）两份，只读前者
+_TAGS[f'{_MC} Fallback'] = 'Fallback'
+_BREAKS = {'tab': '\t', 'br': '\n', 'cr': '\n', 'noBreakHyphen': '-'}
+
+_MAIN_PART = 'word/document.xml'
+_HEADER_RE = re.compile(r'word/header\d*\.xml')
+_FOOTER_RE = re.compile(r'word/footer\d*\.xml')
+_READ_CHUNK = 64 * 1024
+# 同一行的单元格都只有一个段落时（例如 "姓名 | 张三 | 性别 | 男"），整行以该分隔符合并为一行输出；
+# ResumeParse 会把头部以 | 分隔的短项拆开识别
+CELL_SEPARATOR = ' | '
+
+
+class _PartText:
+    """一个 XML 部件的 expat 回调：段落结束时把文本交给最内层打开的表格单元格，不在表格中则直接输出。
+    段落内的换行（w:br/w:cr）保留为 '\n'，与 python-docx 的 Paragraph.text 一致。"""
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self._paragraphs: List[List[str]] = []   # 打开的段落（文本框段落嵌套在外层段落中）
+        self._tables: List[List[List[List[str]]]] = []   # 每层表格的当前行：[单元格行列表, ...]
+        self._cell_open: List[bool] = []
+        self._in_text = False
+        self._skip_depth = 0
+
+    def Start(self, name, attrs):
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        tag = _TAGS.get(name)
+        if tag is None:
+            return
+        if tag == 't':
+            self._in_text = True
+        elif tag == 'p':
+            self._paragraphs.append([])
+        elif tag in _BREAKS:
+            if self._paragraphs:
+                self._paragraphs[-1].append(_BREAKS[tag])
+        elif tag == 'tc':
+            if self._tables:
+                self._tables[-1].append([])
+                self._cell_open[-1] = True
+        elif tag == 'tr':
+            if self._tables:
+                self._tables[-1].clear()
+        elif tag == 'tbl':
+            self._tables.append([])
+            self._cell_open.append(False)
+        elif tag == 'Fallback':
+            self._skip_depth = 1
+
+    def End(self, name):
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        tag = _TAGS.get(name)
+        if tag == 't':
+            self._in_text = False
+        elif tag == 'p':
+            if self._paragraphs:
+                self._Emit(''.join(self._paragraphs.pop()))
+        elif tag == 'tc':
+            if self._cell_open:
+                self._cell_open[-1] = False
+        elif tag == 'tr':
+            if self._tables:
+                self._EmitRow(self._tables[-1])
+        elif tag == 'tbl':
+            if self._tables:
+                self._tables.pop()
+                self._cell_open.pop()
+
+    def Text(self, data):
+        if self._in_text and not self._skip_depth and self._paragraphs:
+            self._paragraphs[-1].append(data)
+
+    def _Emit(self, line: str, depth: Optional[int] = None):
+        # depth：输出到前 depth 层表格中最内层打开的单元格（默认全部层），都未打开时直接输出
+        depth = len(self._tables) if depth is None else depth
+        if depth and self._cell_open[depth - 1]:
+            self._tables[depth - 1][-1].append(line)
+        else:
+            self.lines.append(line)
+
+    def _EmitRow(self, cells: List[List[str]]):
+        cells = [[ln for ln in cell if ln.strip()] for cell in cells]
+        cells = [cell for cell in cells if cell]
+        if all(len(cell) == 1 for cell in cells):
+            row = [CELL_SEPARATOR.join(cell[0].strip() for cell in cells)] if cells else []
+        else:
+            row = [ln for cell in cells for ln in cell]
+        # 嵌套表格的行归入外层表格当前的单元格
+        for line in row:
+            self._Emit(line, len(self._tables) - 1)
+
+
+def _parse_part(stream: IO[bytes], lines: List[str]):
+    handler = _PartText(lines)
+    parser = expat.ParserCreate(namespace_separator=' ')
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.Start
+    parser.EndElementHandler = handler.End
+    parser.CharacterDataHandler = handler.Text
+    while True:
+        chunk = stream.read(_READ_CHUNK)
+        if not chunk:
+            break
+        parser.Parse(chunk, False)
+    parser.Parse(b'', True)
+
+
+def _part_order(name: str) -> int:
+    digits = re.sub(r'\D', '', name)
+    return int(digits) if digits else 0
+
+
+def extract_docx_paragraphs(source: Union[bytes, str, IO[bytes]], headers: bool = True) -> List[str]:
+    """按阅读顺序返回 DOCX 中的段落文本：页眉、正文（段落、表格行、文本框）、页脚。
+    内容相同的页眉/页脚部件（首页/奇偶页常重复）只输出一次。source 为文件内容、路径或文件对象。"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    with zipfile.ZipFile(source) as zf:
+        names = zf.namelist()
+        parts = [_MAIN_PART]
+        if headers:
+            parts = (sorted((n for n in names if _HEADER_RE.fullmatch(n)), key=_part_order) + parts +
+                     sorted((n for n in names if _FOOTER_RE.fullmatch(n)), key=_part_order))
+        paragraphs: List[str] = []
+        seen: List[List[str]] = []
+        for part in parts:
+            part_paragraphs: List[str] = []
+            with zf.open(part) as stream:
+                _parse_part(stream, part_paragraphs)
+            if part != _MAIN_PART:
+                part_paragraphs = [ln for ln in part_paragraphs if ln.strip()]
+                if not part_paragraphs or part_paragraphs in seen:
+                    continue
+                seen.append(part_paragraphs)
+            paragraphs.extend(part_paragraphs)
+    return paragraphs
+
+
+def extract_docx_text(source: Union[bytes, str, IO[bytes]], headers: bool = True) -> str:
+    """extract_docx_paragraphs 的文本形式，丢弃空段落（与原先只拼接非空的 doc.paragraphs 一致）。"""
+    return '\n'.join(ln for ln in extract_docx_paragraphs(source, headers) if ln)
+
@@ -0,0 +1,130 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from Source.Utils.KeywordScanner import build_trie_pattern, fold_case
+
+# 机构名词表（公司/学校），快速解析模式用它代替 transformers NER 识别 ORG。
+# 词表为可编辑的纯文本文件（每行一个名称，# 开头为注释），目录可通过环境变量 CCRESUME_GAZETTEER_DIR 覆盖；
+# 首次使用时合并构建为一棵字典树正则（见 KeywordScanner.build_trie_pattern），修改词表后调用 reload_gazetteer()
+GAZETTEER_DIR = os.environ.get('CCRESUME_GAZETTEER_DIR',
+                               os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Gazetteers'))
+GAZETTEER_FILES = {'company': 'companies.txt', 'school': 'schools.txt'}
+
+# 词表之外的机构名：以后缀结尾、位于行首（前面只有日期/编号/标点）的片段，
+# 公司后缀与 split_career_block 判断公司行的关键词一致
+_COMPANY_SUFFIX = '有限公司|公司|科技|集团|股份'
+_SCHOOL_SUFFIX = '大学|学院|学校'
+# 先定位后缀，再向前取至多 N 个非分隔符字符作为名称；
+# 后缀须在分隔符/空白/括号/数字前结束，避免截取句子中间的「…公司内部系统的科技」
+_SPAN_END = r'(?=[\s，,。；;：:|/、（(\d]|$)'
+_SUFFIX_SPANS: List[Tuple[str, 're.Pattern', 're.Pattern']] = [
+    ('company', re.compile(f'(?:{_COMPANY_SUFFIX}){_SPAN_END}'), re.compile(r'[^\s，,。；;：:|/、]{1,30}$')),
+    ('school', re.compile(f'(?:{_SCHOOL_SUFFIX}){_SPAN_END}'), re.compile(r'[^\s，,。；;：:|/、]{1,20}$')),
+]
+# 片段开头需去掉的日期/编号，以及片段之前允许出现的内容
+_LEADING_JUNK_RE = re.compile(r'^[\d\.\-—–~年月日至今]*')
+_LINE_PREFIX_RE = re.compile(r'[\s\d\.\-—–~/年月日至今:：、()（）|*•·]*')
+# 词表命中的打分高于后缀启发式，与 pipeline 输出的 score 字段含义一致
+_GAZETTEER_SCORE = 1.0
+_SUFFIX_SCORE = 0.6
+
+
+def load_word_list(path: str) -> List[str]:
+    words = []
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            w = line.strip()
+            if w and not w.startswith('#'):
+                words.append(w)
+    return words
+
+
+def _is_ascii_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+class Gazetteer:
+    """公司/学校名称识别：词表命中（字典树正则，同一起点取最长）加后缀启发式，重叠时保留较长的片段。
+    Match 返回 (word, kind, start, end)，kind 为 company / school；Entities 返回与 NER pipeline 相同格式的 ORG 实体。"""
+
+    def __init__(self, words: Dict[str, Iterable[str]]):
+        self._kind_of: Dict[str, str] = {}
+        for kind, names in words.items():
+            for name in names:
+                self._kind_of.setdefault(fold_case(name), kind)
+        self._regex = None
+        if self._kind_of:
+            # 起始字符集前置检查，使正则引擎能快速跳过不可能命中的位置（同 KeywordScanner）
+            first = '[' + ''.join(sorted({re.escape(ch) for k in self._kind_of for ch in (k[0], k[0].upper())})) + ']'
+            self._regex = re.compile(f'(?={first}){build_trie_pattern(self._kind_of)}')
+        h = hashlib.blake2b(digest_size=4)
+        for key in sorted(self._kind_of):
+            h.update(f'{self._kind_of[key]}:{key}\n'.encode('utf-8'))
+        # 词表内容的指纹，用于区分不同词表下的解析结果（见 parser_version_tag）
+        self.version = h.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._kind_of)
+
+    def Match(self, text: str) -> List[Tuple[str, str, int, int]]:
+        if not text:
+            return []
+        spans: List[Tuple[int, int, str, float]] = []
+        if self._regex is not None:
+            for m in self._regex.finditer(text):
+                start, end = m.span()
+                # 英文名称要求完整单词（避免 MIT 命中 SUBMIT）
+                if (start > 0 and _is_ascii_word_char(text[start]) and _is_ascii_word_char(text[start - 1])) or \
+                        (end < len(text) and _is_ascii_word_char(text[end - 1]) and _is_ascii_word_char(text[end])):
+                    continue
+                spans.append((start, end, self._kind_of[fold_case(m.group())], _GAZETTEER_SCORE))
+        # 后缀片段与词表命中在同一位置结束时，以词表确定名称的起点（例如「…技术分享腾讯科技」取「腾讯科技」）
+        listed_ends = {end for _, end, _, _ in spans}
+        for kind, suffix, prefix in _SUFFIX_SPANS:
+            for m in suffix.finditer(text):
+                p = prefix.search(text, max(0, m.start() - 30), m.start())
+                if p is None:
+                    continue
+                start = p.start() + len(_LEADING_JUNK_RE.match(p.group()).group())
+                line_start = text.rfind('\n', 0, start) + 1
+                if m.end() - start < 4 or m.end() in listed_ends or \
+                        not _LINE_PREFIX_RE.fullmatch(text, line_start, start):
+                    continue
+                spans.append((start, m.end(), kind, _SUFFIX_SCORE))
+        # 重叠片段保留较长者（等长时保留词表命中），再按出现顺序输出
+        kept: List[Tuple[int, int, str, float]] = []
+        for span in sorted(spans, key=lambda s: (s[0] - s[1], -s[3], s[0])):
+            if all(span[1] <= k[0] or span[0] >= k[1] for k in kept):
+                kept.append(span)
+        return [(text[s:e], kind, s, e) for s, e, kind, _ in sorted(kept)]
+
+    def Entities(self, text: str) -> List[Dict[str, object]]:
+        out = []
+        for word, kind, start, end in self.Match(text):
+            out.append({'entity_group': 'ORG', 'word': word, 'start': start, 'end': end,
+                        'score': _GAZETTEER_SCORE if fold_case(word) in self._kind_of else _SUFFIX_SCORE})
+        return out
+
+
+_GAZETTEER: Optional[Gazetteer] = None
+_GAZETTEER_LOCK = threading.Lock()
+def get_gazetteer() -> Gazetteer:
+    """懒加载 GAZETTEER_DIR 下的词表；缺失的文件视为空词表（只使用后缀启发式）。"""
+    global _GAZETTEER
+    with _GAZETTEER_LOCK:
+        if _GAZETTEER is None:
+            words = {}
+            for kind, filename in GAZETTEER_FILES.items():
+                path = os.path.join(GAZETTEER_DIR, filename)
+                words[kind] = load_word_list(path) if os.path.exists(path) else []
+            _GAZETTEER = Gazetteer(words)
+        return _GAZETTEER
+
+
+def reload_gazetteer() -> Gazetteer:
+    global _GAZETTEER
+    with _GAZETTEER_LOCK:
+        _GAZETTEER = None
+    return get_gazetteer()
@@ -0,0 +1,147 @@
+import re
+import string
+from typing import Dict, Iterable, List, Optional, Set
+from dataclasses import dataclass, field
+
+# 忽略大小写匹配 ASCII 字母时与 re.I 等价的字符集合（re.I 还会让 4 个非 ASCII 字母匹配 i/k/s）
+_CASE_EXTRAS = 'İıſK'
+_CASE_VARIANTS: Dict[str, str] = {
+    c: ''.join(sorted({c.lower(), c.upper()} | {x for x in _CASE_EXTRAS if re.fullmatch(c, x, re.I)}))
+    for c in string.ascii_letters
+}
+# 把上述变体统一折叠回小写 ASCII，用于查表
+_FOLD_TABLE = str.maketrans({x: c for c in string.ascii_lowercase for x in _CASE_VARIANTS[c] if x != c})
+
+
+def fold_case(text: str) -> str:
+    """与 _CASE_VARIANTS 配套的大小写折叠（ASCII 小写化，兼容 re.I 的额外字母）。"""
+    return text.translate(_FOLD_TABLE)
+
+
+def _char_pattern(ch: str) -> str:
+    variants = _CASE_VARIANTS.get(ch)
+    if variants:
+        return '[' + variants + ']'
+    return re.escape(ch)
+
+
+def _literal_pattern(word: str) -> str:
+    return ''.join(_char_pattern(ch) for ch in word)
+
+
+# ASCII 单词边界（与 \\b 不同，汉字不算单词字符，因此「熟悉Python开发」中的 Python 也能命中）
+_NOT_WORD_BEFORE = '(?<![0-9A-Za-z_])'
+_NOT_WORD_AFTER = '(?![0-9A-Za-z_])'
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and (ch.isalnum() or ch == '_')
+
+
+def build_trie_pattern(words: Iterable[str], word_boundaries: bool = False) -> str:
+    """把一组字面量关键词构建成字典树形状的正则（例如 项目(?:经验|描述)?），ASCII 字母忽略大小写。
+    同一起点上总是优先匹配最长的关键词；匹配代价只与树深相关，与关键词数量无关。
+    word_boundaries=True 时，以 ASCII 字母/数字开头（结尾）的关键词要求前面（后面）不是 ASCII 字母/数字，
+    边界检查放在字典树内部：最长的关键词不满足边界时回退到同一起点上较短的关键词（例如 C++ 与 C）。"""
+    trie: Dict[str, dict] = {}
+    for w in words:
+        if not w:
+            continue
+        node = trie
+        for ch in fold_case(w):
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def lead(ch: str, root: bool) -> str:
+        return _NOT_WORD_BEFORE if word_boundaries and root and _is_word_char(ch) else ''
+
+    def emit(node: Dict[str, dict], last: str = '') -> str:
+        terminal = '' in node
+        alts = [lead(ch, not last) + _char_pattern(ch) + emit(child, ch) for ch, child in sorted(node.items()) if ch]
+        if word_boundaries and terminal and _is_word_char(last):
+            # 在此结束时检查右边界；优先尝试更长的关键词
+            return '(?:' + '|'.join(alts + [_NOT_WORD_AFTER]) + ')' if alts else _NOT_WORD_AFTER
+        if not alts:
+            return ''
+        body = alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+        if terminal:
+            # 贪婪可选：先尝试更长的关键词，失败时退回当前前缀
+            single_atom = len(alts) == 1 and re.fullmatch(r'\[[^\]]+\]|\\?.', body)
+            if len(alts) == 1 and not single_atom:
+                body = '(?:' + body + ')'
+            body += '?'
+        return body
+
+    return emit(trie)
+
+
+@dataclass
+class KeywordScan:
+    """一次扫描的结果：每个类别命中的关键词集合（小写归一），以及计数词的命中次数。"""
+    hits: Dict[str, Set[str]] = field(default_factory=dict)
+    term_count: int = 0
+
+    def count(self, category: str) -> int:
+        return len(self.hits.get(category, ()))
+
+    def has(self, category: str) -> bool:
+        return bool(self.hits.get(category))
+
+
+class KeywordScanner:
+    """多类别关键词的单遍扫描器。
+
+    所有类别的关键词合并为一棵字典树并编译成一个正则，在文本上只扫描一遍：
+    用零宽前瞻捕获每个起点上的最长关键词，再通过预计算的前缀闭包补齐被其包含的短关键词
+    （例如命中「项目经验」同时记为命中「项目」），因此结果等价于对每个关键词分别 re.search(kw, text, re.I)。
+    counted_terms 为可选的计数词表（例如技术栈），两端按 \\b 约束，在同一遍扫描中统计不重叠命中次数，
+    等价于 len(re.findall(r'\\b(t1|t2|...)\\b', text, re.I))。"""
+
+    def __init__(self, categories: Dict[str, Iterable[str]], counted_terms: Optional[List[str]] = None):
+        self._categories_of: Dict[str, Set[str]] = {}
+        for cat, words in categories.items():
+            for w in words:
+                self._categories_of.setdefault(fold_case(w), set()).add(cat)
+        keys = list(self._categories_of)
+        # 前缀闭包：某个关键词被命中时，以它为前缀的所有更短关键词也在同一位置命中
+        self._closure: Dict[str, List[str]] = {
+            k: [p for p in keys if k.startswith(p)] for k in keys
+        }
+        first_chars = {k[0] for k in keys}
+        kw = '(?=(?P<kw>' + build_trie_pattern(keys) + '))'
+        self._counted = bool(counted_terms)
+        if counted_terms:
+            # 保持原有顺序的交替（与原正则的优先级一致），而不是按字典树重排
+            terms = r'\b(?:' + '|'.join(_literal_pattern(t) for t in counted_terms) + r')\b'
+            first_chars |= {fold_case(t[0]) for t in counted_terms}
+            body = f'{kw}(?=(?P<cnt>{terms})?)|(?=(?P<cnt_only>{terms}))'
+        else:
+            body = kw
+        # 起始字符集前置检查，使正则引擎能快速跳过不可能命中的位置
+        first = '[' + ''.join(_CASE_VARIANTS.get(c, re.escape(c)) for c in sorted(first_chars)) + ']'
+        self._regex = re.compile(f'(?={first})(?:{body})')
+
+    def scan(self, text: str) -> KeywordScan:
+        result = KeywordScan()
+        if not text:
+            return result
+        found = set()
+        count = 0
+        counted_end = -1
+        for m in self._regex.finditer(text):
+            kw = m.group('kw')
+            if kw:
+                found.add(kw)
+            if self._counted:
+                end = m.end('cnt') if m.group('cnt') else m.end('cnt_only')
+                # 与 findall 一致：只统计不与上一个计数命中重叠的匹配
+                if end > m.start() >= counted_end:
+                    count += 1
+                    counted_end = end
+        hits = result.hits
+        for kw in found:
+            for k in self._closure.get(fold_case(kw), ()):
+                for cat in self._categories_of[k]:
+                    hits.setdefault(cat, set()).add(k)
+        result.term_count = count
+        return result
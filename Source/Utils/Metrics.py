@@ -0,0 +1,378 @@
+import atexit
+import logging
+import multiprocessing.util
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, List, Sequence, Tuple
+from Source.CCSqlite.CCSqlite import CCSqlite
+
+logger = logging.getLogger(__name__)
+
+# 多进程指标：每个进程在内存中累加自己的计数，后台线程每 METRICS_FLUSH_SECONDS 把本进程的累计值
+# （绝对值，可重复写入）写入共享的 SQLite 库；/metrics 抓取时按序列把所有进程的值合并输出为 Prometheus 文本格式。
+# Web 进程、解析进程池与后台工作进程共用同一个库，因此任意一个 Web 进程都能给出全局视图。
+# 写库默认关闭（脚本、基准直接调用 ResumeParse 时只在内存中计数，不产生文件），由应用或工作进程调用 enable_metrics() 开启；
+# 开启时同时设置环境变量 METRICS_ENABLED_ENV，之后启动的子进程（解析进程池、后台工作进程）随之开启。
+METRICS_DB = os.environ.get('CCRESUME_METRICS_DB', os.path.join('Saved', 'DataBase', 'metrics.db'))
+METRICS_ENABLED_ENV = 'CCRESUME_METRICS_PERSIST'
+METRICS_FLUSH_SECONDS = 1.0
+# 已退出进程的计数在抓取时折叠进 RETIRED_INSTANCE（保证计数单调），其 gauge 直接丢弃；两次折叠之间的最小间隔
+METRICS_COMPACT_SECONDS = 30.0
+RETIRED_INSTANCE = 'retired'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024)
+
+# 指标库的表结构迁移（按版本追加，不修改已发布的条目）
+METRICS_MIGRATIONS = [
+    [
+        'CREATE TABLE IF NOT EXISTS metric_values ('
+        'instance TEXT NOT NULL, pid INTEGER NOT NULL, name TEXT NOT NULL, labels TEXT NOT NULL, '
+        'kind TEXT NOT NULL, value REAL NOT NULL, updated_at REAL NOT NULL, '
+        'PRIMARY KEY (instance, name, labels))',
+    ],
+]
+
+_FAMILIES: Dict[str, '_Metric'] = {}
+_VALUES: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+_LOCK = threading.Lock()
+_DIRTY = False
+_INSTANCE = None
+_FLUSHER_PID = None
+_DB = None
+_LAST_COMPACT = 0.0
+_PERSIST = os.environ.get(METRICS_ENABLED_ENV) == '1'
+# 写库失败一次后（例如只读文件系统）本进程不再重试，指标只保留在内存中
+_PERSIST_FAILED = False
+_FLUSH_THREAD_PID = None
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ','.join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _FAMILIES[name] = self
+
+    def _Key(self, labels: Dict[str, Any]) -> Tuple[str, Tuple[str, ...]]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return self.name, tuple(str(labels[n]) for n in self.labelnames)
+
+    def _Samples(self, labelvalues: Tuple[str, ...], value: Any) -> List[Tuple[str, str, float]]:
+        return [(self.name, _format_labels(self.labelnames, labelvalues), value)]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def Inc(self, amount: float = 1.0, **labels):
+        key = self._Key(labels)
+        with _LOCK:
+            values = _local_values()
+            values[key] = values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """aggregate 决定多进程合并方式：'sum' 对存活进程求和（例如各进程的在途请求数），
+    'latest' 取最近一次写入的值（例如由抓取进程查询得到的队列长度）。"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), aggregate: str = 'sum'):
+        super().__init__(name, documentation, labelnames)
+        self.aggregate = aggregate
+
+    def Set(self, value: float, **labels):
+        key = self._Key(labels)
+        with _LOCK:
+            _local_values()[key] = float(value)
+
+    def Inc(self, amount: float = 1.0, **labels):
+        key = self._Key(labels)
+        with _LOCK:
+            values = _local_values()
+            values[key] = values.get(key, 0.0) + amount
+
+    def Dec(self, amount: float = 1.0, **labels):
+        self.Inc(-amount, **labels)
+
+    @contextmanager
+    def TrackInProgress(self, **labels):
+        self.Inc(**labels)
+        try:
+            yield
+        finally:
+            self.Dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def Observe(self, value: float, **labels):
+        key = self._Key(labels)
+        idx = bisect_left(self.buckets, value)
+        with _LOCK:
+            # 内存中按桶分别计数（最后一格为 +Inf），写库时再展开为累积的 _bucket 序列
+            values = _local_values()
+            state = values.get(key)
+            if state is None:
+                state = values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[idx] += 1
+            state[-1] += value
+
+    @contextmanager
+    def Time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.Observe(time.perf_counter() - t0, **labels)
+
+    def _Samples(self, labelvalues: Tuple[str, ...], state: Any) -> List[Tuple[str, str, float]]:
+        base = _format_labels(self.labelnames, labelvalues)
+        prefix = base + ',' if base else ''
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), state[:-1]):
+            cumulative += count
+            samples.append((self.name + '_bucket', f'{prefix}le="{_format_value(bound)}"', cumulative))
+        samples.append((self.name + '_sum', base, state[-1]))
+        samples.append((self.name + '_count', base, cumulative))
+        return samples
+
+
+def _local_values() -> Dict[Tuple[str, Tuple[str, ...]], Any]:
+    """返回本进程的指标值并标记为待写入。调用方已持有 _LOCK。
+    已开启写库时，本进程首次写入时启动刷新线程；fork 出的子进程丢弃继承自父进程的计数，以新的 instance 重新开始。"""
+    global _DIRTY, _FLUSHER_PID, _INSTANCE
+    _DIRTY = True
+    if _FLUSHER_PID != os.getpid():
+        _VALUES.clear()
+        _FLUSHER_PID = os.getpid()
+        _INSTANCE = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+    if _PERSIST:
+        _start_flusher()
+    return _VALUES
+
+
+def _start_flusher():
+    """本进程的刷新线程（每个进程只启动一次）。调用方已持有 _LOCK。"""
+    global _FLUSH_THREAD_PID
+    if _FLUSH_THREAD_PID == os.getpid() or _PERSIST_FAILED:
+        return
+    _FLUSH_THREAD_PID = os.getpid()
+    threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True).start()
+    atexit.register(flush_metrics)
+    # multiprocessing 子进程以 os._exit 退出，不执行 atexit，需注册 Finalize
+    multiprocessing.util.Finalize(None, flush_metrics, exitpriority=10)
+
+
+def enable_metrics():
+    """开启本进程（及之后启动的子进程）的指标写库，供 /metrics 汇总多进程的值；应用启动与工作进程入口调用。"""
+    global _PERSIST
+    os.environ[METRICS_ENABLED_ENV] = '1'
+    with _LOCK:
+        _PERSIST = True
+        if _FLUSHER_PID == os.getpid():
+            _start_flusher()
+
+
+def _flush_loop():
+    while not _PERSIST_FAILED:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        flush_metrics()
+
+
+def _get_db() -> CCSqlite:
+    global _DB
+    if _DB is None or _DB._pid != os.getpid():
+        os.makedirs(os.path.dirname(METRICS_DB) or '.', exist_ok=True)
+        db = CCSqlite(METRICS_DB)
+        db.Migrate(METRICS_MIGRATIONS)
+        _DB = db
+    return _DB
+
+
+def flush_metrics():
+    """把本进程的累计值写入指标库（只在开启写库且有变化时写入）。写入失败时记录一次日志，之后不再写库。"""
+    global _DIRTY, _PERSIST_FAILED
+    with _LOCK:
+        if not _PERSIST or _PERSIST_FAILED or not _DIRTY or _FLUSHER_PID != os.getpid():
+            return
+        _DIRTY = False
+        snapshot = [(key, list(v) if isinstance(v, list) else v) for key, v in _VALUES.items()]
+        instance = _INSTANCE
+    now = time.time()
+    rows = []
+    for (name, labelvalues), value in snapshot:
+        family = _FAMILIES[name]
+        for sample, labels, v in family._Samples(labelvalues, value):
+            rows.append((instance, os.getpid(), sample, labels, family.kind, v, now))
+    try:
+        with _get_db().Transaction() as db:
+            db.ExecuteMany('INSERT INTO metric_values (instance, pid, name, labels, kind, value, updated_at) '
+                           'VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(instance, name, labels) '
+                           'DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at', rows)
+    except Exception:
+        with _LOCK:
+            _PERSIST_FAILED = True
+        logger.exception('Failed to write metrics to %s, keeping them in memory only', METRICS_DB)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _compact(db: CCSqlite):
+    """把已退出进程的 counter/histogram 累加进 RETIRED_INSTANCE 后删除其全部行（gauge 随之丢弃）。"""
+    db.Execute('SELECT DISTINCT instance, pid FROM metric_values WHERE instance != ?', (RETIRED_INSTANCE,))
+    dead = [instance for instance, pid in db.FetchAll() if not _pid_alive(pid)]
+    if not dead:
+        return
+    with db.Transaction():
+        for instance in dead:
+            db.Execute('INSERT INTO metric_values (instance, pid, name, labels, kind, value, updated_at) '
+                       'SELECT ?, 0, name, labels, kind, value, updated_at FROM metric_values '
+                       'WHERE instance = ? AND kind != ? AND true '
+                       'ON CONFLICT(instance, name, labels) DO UPDATE SET value = value + excluded.value',
+                       (RETIRED_INSTANCE, instance, 'gauge'))
+            db.Execute('DELETE FROM metric_values WHERE instance = ?', (instance,))
+    logger.info('Retired metrics of %d exited processes', len(dead))
+
+
+def collect_metrics() -> Dict[Tuple[str, str], float]:
+    """合并所有进程的指标：{(sample_name, labels): value}；未开启写库（或写库已失败）时只有本进程的值。"""
+    global _LAST_COMPACT
+    flush_metrics()
+    if not _PERSIST or _PERSIST_FAILED:
+        return _local_metrics()
+    try:
+        db = _get_db()
+    except Exception:
+        logger.exception('Metrics database %s unavailable, reporting this process only', METRICS_DB)
+        return _local_metrics()
+    if time.time() - _LAST_COMPACT > METRICS_COMPACT_SECONDS:
+        _LAST_COMPACT = time.time()
+        try:
+            _compact(db)
+        except Exception:
+            logger.exception('Failed to compact metrics')
+    merged: Dict[Tuple[str, str], float] = {}
+    latest: Dict[Tuple[str, str], float] = {}
+    alive: Dict[int, bool] = {}
+    for instance, pid, name, labels, kind, value, updated_at in db.Iterate(
+            'SELECT instance, pid, name, labels, kind, value, updated_at FROM metric_values'):
+        key = (name, labels)
+        if kind == 'gauge':
+            if pid not in alive:
+                alive[pid] = _pid_alive(pid)
+            if not alive[pid]:
+                continue
+            family = _FAMILIES.get(name)
+            if family is not None and getattr(family, 'aggregate', 'sum') == 'latest':
+                if updated_at >= latest.get(key, -1.0):
+                    latest[key] = updated_at
+                    merged[key] = value
+                continue
+        merged[key] = merged.get(key, 0.0) + value
+    return merged
+
+
+def _local_metrics() -> Dict[Tuple[str, str], float]:
+    with _LOCK:
+        snapshot = [(key, list(v) if isinstance(v, list) else v) for key, v in _VALUES.items()] \
+            if _FLUSHER_PID == os.getpid() else []
+    merged: Dict[Tuple[str, str], float] = {}
+    for (name, labelvalues), value in snapshot:
+        for sample, labels, v in _FAMILIES[name]._Samples(labelvalues, value):
+            merged[(sample, labels)] = v
+    return merged
+
+
+def render_metrics() -> str:
+    """Prometheus 文本格式（text/plain; version=0.0.4）。"""
+    merged = collect_metrics()
+    by_family: Dict[str, List[Tuple[str, str, float]]] = {}
+    for (name, labels), value in merged.items():
+        family = name
+        for suffix in ('_bucket', '_sum', '_count'):
+            if name.endswith(suffix) and name[:-len(suffix)] in _FAMILIES:
+                family = name[:-len(suffix)]
+                break
+        by_family.setdefault(family, []).append((name, labels, value))
+    lines = []
+    for name, metric in _FAMILIES.items():
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.kind}')
+        samples = by_family.get(name, [])
+        if not samples and not metric.labelnames and metric.kind != 'histogram':
+            samples = [(name, '', 0.0)]
+        for sample, labels, value in sorted(samples, key=_sample_order):
+            lines.append(f'{sample}{{{labels}}} {_format_value(value)}' if labels else f'{sample} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _sample_order(sample: Tuple[str, str, float]):
+    # 同一序列的 _bucket 按 le 数值排序，其后依次为 _sum、_count
+    name, labels, _ = sample
+    base, _, le = labels.rpartition('le="')
+    if name.endswith('_bucket') and le:
+        bound = le.rstrip('"')
+        return (base.rstrip(','), 0, float('inf') if bound == '+Inf' else float(bound))
+    return (labels, 1 if name.endswith('_sum') else 2 if name.endswith('_count') else 0, 0.0)
+
+
+# 指标定义（各模块直接引用）
+EXTRACT_SECONDS = Histogram('ccresume_extract_seconds', 'Text extraction latency by extractor.', ['extractor'])
+EXTRACT_FALLBACKS = Counter('ccresume_extract_fallbacks_total',
+                            'Extractor failovers, e.g. PyPDF2 failing over to pdfplumber.', ['extractor', 'fallback'])
+EXTRACT_ERRORS = Counter('ccresume_extract_errors_total', 'Extraction errors by extraction_error type.', ['type'])
+PARSE_SECONDS = Histogram('ccresume_parse_seconds', 'ResumeParse latency.')
+NER_SECONDS = Histogram('ccresume_ner_seconds', 'Batched NER inference latency.')
+NER_SERVICE_BATCH_TEXTS = Histogram('ccresume_ner_service_batch_texts', 'Texts per micro-batch run by the NER service.',
+                                    buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+NER_SERVICE_REQUESTS = Counter('ccresume_ner_service_requests_total', 'NER service requests by outcome.', ['outcome'])
+BLOCK_MEMO_LOOKUPS = Counter('ccresume_block_memo_total', 'ResumeParse block memo lookups by kind and outcome.',
+                             ['kind', 'outcome'])
+NEAR_DUPLICATES = Counter('ccresume_near_duplicates_total',
+                          'Uploads matched to an earlier near-duplicate upload, by action taken.', ['action'])
+UPLOAD_BYTES = Histogram('ccresume_upload_bytes', 'Size of uploaded resume files.', buckets=BYTES_BUCKETS)
+UPLOADS_ARCHIVED = Counter('ccresume_upload_archive_total', 'Asynchronous upload archive writes by outcome.',
+                           ['outcome'])
+REQUESTS_IN_FLIGHT = Gauge('ccresume_requests_in_flight', 'HTTP requests currently being served.', ['endpoint'])
+JOB_SECONDS = Histogram('ccresume_job_seconds', 'Background resume job run time by final status.', ['status'])
+JOB_WAIT_SECONDS = Histogram('ccresume_job_wait_seconds', 'Time background jobs spent queued before being claimed.')
+JOBS_RECOVERED = Counter('ccresume_jobs_recovered_total', 'Stale running jobs requeued or failed after lease expiry.',
+                         ['outcome'])
+JOBS = Gauge('ccresume_jobs', 'Background resume jobs by status.', ['status'], aggregate='latest')
@@ -0,0 +1,120 @@
+import re
+import sys
+from array import array
+from typing import List, Sequence, Tuple
+from Source.Utils.ResumeParseUtils import normalize_resume_text
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except Exception:
+    np = None
+    _HAS_NUMPY = False
+
+# 近似重复检测的签名：规范化文本（去掉空白与标点、ASCII 小写）的 4 字符片段集合的 MinHash。
+# 使用单次哈希分桶（one permutation hashing）：每个片段哈希一次，按高 6 位分入 64 个桶，每桶取最小值，
+# 两份简历签名中相同桶的比例即片段集合 Jaccard 相似度的估计。
+# 同一份简历的不同导出（换行、空格、页眉页码不同）或只刷新了日期时相似度接近 1，不同候选人的简历通常低于 0.5
+MINHASH_SLOTS = 64
+SHINGLE_SIZE = 4
+# LSH：签名切成 16 段、每段 4 个桶，任一段完全相同即为候选；相似度 0.75 的两份签名成为候选的概率约 99.8%
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_SLOTS // LSH_BANDS
+EMPTY_SLOT = 0xFFFFFFFF
+
+_MASK64 = (1 << 64) - 1
+_VALUE_MASK = (1 << 58) - 1
+# 片段哈希的多项式基数与 splitmix64 终结器常数
+_BASE = 0x100000001B3
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+_NON_CONTENT_RE = re.compile(r'[^0-9a-z\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+
+
+def canonical_text(text: str) -> str:
+    """签名的输入：ResumeParse 的全文规范化结果，再去掉全部空白与标点并把 ASCII 字母转为小写。"""
+    s, _ = normalize_resume_text(text)
+    return _NON_CONTENT_RE.sub('', s.lower())
+
+
+def _mix64(h: int) -> int:
+    h = ((h ^ (h >> 30)) * _MIX1) & _MASK64
+    h = ((h ^ (h >> 27)) * _MIX2) & _MASK64
+    return h ^ (h >> 31)
+
+
+def _minhash_py(codes: List[int]) -> Tuple[int, ...]:
+    hashes = set()
+    for i in range(len(codes) - SHINGLE_SIZE + 1):
+        h = 0
+        for c in codes[i:i + SHINGLE_SIZE]:
+            h = (h * _BASE + c) & _MASK64
+        hashes.add(_mix64(h))
+    slots = [EMPTY_SLOT] * MINHASH_SLOTS
+    for h in hashes:
+        b = h >> 58
+        v = (h & _VALUE_MASK) >> 26
+        if v < slots[b]:
+            slots[b] = v
+    return tuple(slots)
+
+
+def _minhash_np(codes: List[int]) -> Tuple[int, ...]:
+    c = np.array(codes, dtype=np.uint64)
+    n = len(c) - SHINGLE_SIZE + 1
+    h = np.zeros(n, dtype=np.uint64)
+    # uint64 运算按 2^64 取模回绕，与纯 Python 实现中的 & _MASK64 一致
+    with np.errstate(over='ignore'):
+        for k in range(SHINGLE_SIZE):
+            h = h * np.uint64(_BASE) + c[k:k + n]
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(_MIX1)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(_MIX2)
+    h = h ^ (h >> np.uint64(31))
+    slots = np.full(MINHASH_SLOTS, EMPTY_SLOT, dtype=np.uint64)
+    np.minimum.at(slots, (h >> np.uint64(58)).astype(np.intp), (h & np.uint64(_VALUE_MASK)) >> np.uint64(26))
+    return tuple(int(v) for v in slots)
+
+
+def minhash(text: str) -> Tuple[int, ...]:
+    """canonical_text 的 MinHash 签名（MINHASH_SLOTS 个 32 位整数，空桶为 EMPTY_SLOT）；
+    少于 SHINGLE_SIZE 个字符时返回空元组。NumPy 可用时向量化计算，否则逐片段计算，两者结果相同。"""
+    codes = [ord(ch) for ch in canonical_text(text)]
+    if len(codes) < SHINGLE_SIZE:
+        return ()
+    return _minhash_np(codes) if _HAS_NUMPY else _minhash_py(codes)
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """两个签名的 Jaccard 相似度估计（两者都为空桶的位置不计入）。"""
+    both = [(x, y) for x, y in zip(a, b) if x != EMPTY_SLOT or y != EMPTY_SLOT]
+    if not both:
+        return 0.0
+    return sum(x == y for x, y in both) / len(both)
+
+
+def lsh_keys(sig: Sequence[int]) -> List[int]:
+    """每段（LSH_ROWS 个桶，连同段号）的 63 位哈希键，用于 SQLite 中的等值索引查询。"""
+    keys = []
+    for band in range(LSH_BANDS):
+        h = band
+        for v in sig[band * LSH_ROWS:(band + 1) * LSH_ROWS]:
+            h = _mix64((h * _BASE + v) & _MASK64)
+        keys.append(h >> 1)
+    return keys
+
+
+def pack_signature(sig: Sequence[int]) -> bytes:
+    """签名的存储形式：小端 uint32 数组。"""
+    arr = array('I', sig)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def unpack_signature(data: bytes) -> Tuple[int, ...]:
+    arr = array('I')
+    arr.frombytes(data)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return tuple(arr)
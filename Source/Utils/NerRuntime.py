@@ -0,0 +1,194 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# NER 生命周期状态
+NER_STATUS_UNLOADED = 'unloaded'
+NER_STATUS_LOADING = 'loading'
+NER_STATUS_LOADED = 'loaded'
+NER_STATUS_DISABLED = 'disabled'
+
+# 加载失败后的重试退避（秒）：首次等待 NER_RETRY_BACKOFF，之后每次翻倍，最多 NER_RETRY_BACKOFF_MAX
+NER_RETRY_BACKOFF = 60.0
+NER_RETRY_BACKOFF_MAX = 3600.0
+
+# 默认使用的中文 NER 模型（可替换为你偏好的模型）
+DEFAULT_NER_MODEL = 'ckiplab/bert-base-chinese-ner'
+
+# NER 推理后端（可通过环境变量覆盖，生产环境无网络/无 GPU 时使用本地目录）：
+#   hub       —— 按模型名从 HuggingFace Hub / 本地缓存加载 DEFAULT_NER_MODEL（原行为）
+#   local     —— 从本地模型目录 NER_MODEL_DIR 加载，只读本地文件，不访问网络
+#   quantized —— 本地模型目录 + PyTorch 动态 int8 量化（Linear 层），CPU 推理
+#   onnx      —— 本地目录中的 ONNX 导出模型（NER_ONNX_FILE，可为 int8 量化后的文件），onnxruntime 推理；
+#                目录可由 `optimum-cli export onnx --model <模型目录> --task token-classification <输出目录>` 生成
+# 所有后端都包装为 transformers 的 token-classification pipeline（aggregation_strategy='simple'），
+# 输出同样的 entity_group/word/start/end 结构。
+NER_BACKEND = os.environ.get('CCRESUME_NER_BACKEND', 'hub')
+NER_MODEL_DIR = os.environ.get('CCRESUME_NER_MODEL_DIR', os.path.join('Saved', 'Models', 'bert-base-chinese-ner'))
+NER_ONNX_FILE = os.environ.get('CCRESUME_NER_ONNX_FILE', 'model.onnx')
+
+
+def _load_hub_pipeline():
+    from transformers import pipeline
+    return pipeline('ner', model=DEFAULT_NER_MODEL, tokenizer=DEFAULT_NER_MODEL, aggregation_strategy='simple')
+
+
+def _load_local_pipeline():
+    from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
+    tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_DIR, local_files_only=True)
+    model = AutoModelForTokenClassification.from_pretrained(NER_MODEL_DIR, local_files_only=True)
+    model.eval()
+    return pipeline('ner', model=model, tokenizer=tokenizer, aggregation_strategy='simple', device=-1)
+
+
+def _load_quantized_pipeline():
+    import torch
+    from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
+    tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_DIR, local_files_only=True)
+    model = AutoModelForTokenClassification.from_pretrained(NER_MODEL_DIR, local_files_only=True)
+    model.eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline('ner', model=model, tokenizer=tokenizer, aggregation_strategy='simple', device=-1)
+
+
+def _load_onnx_pipeline():
+    from transformers import pipeline, AutoTokenizer
+    from optimum.onnxruntime import ORTModelForTokenClassification
+    tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_DIR, local_files_only=True)
+    model = ORTModelForTokenClassification.from_pretrained(
+        NER_MODEL_DIR, file_name=NER_ONNX_FILE, provider='CPUExecutionProvider', local_files_only=True)
+    return pipeline('ner', model=model, tokenizer=tokenizer, aggregation_strategy='simple')
+
+
+NER_BACKENDS: Dict[str, Callable[[], Any]] = {
+    'hub': _load_hub_pipeline,
+    'local': _load_local_pipeline,
+    'quantized': _load_quantized_pipeline,
+    'onnx': _load_onnx_pipeline,
+}
+
+
+def ner_backend_label(backend: str) -> str:
+    """状态/日志中展示的后端描述，例如 'local:Saved/Models/bert-base-chinese-ner'。"""
+    if backend == 'hub':
+        return f'hub:{DEFAULT_NER_MODEL}'
+    if backend == 'onnx':
+        return f'onnx:{os.path.join(NER_MODEL_DIR, NER_ONNX_FILE)}'
+    return f'{backend}:{NER_MODEL_DIR}'
+
+
+def _load_configured_pipeline():
+    loader = NER_BACKENDS.get(NER_BACKEND)
+    if loader is None:
+        raise ValueError(f'unknown NER backend: {NER_BACKEND}')
+    return loader()
+
+
+class NerRuntime:
+    """NER pipeline 的生命周期管理：加载状态、失败的负缓存与退避重试、后台预热。
+
+    - Get() 永不在请求线程里等待正在进行的加载：加载中或处于退避期时返回 None，调用方按无 NER 处理；
+    - 加载失败会被记住，退避期内不再尝试导入/构建模型，到期后在后台线程重试；
+    - 从未加载过且没有预热时（例如脚本直接调用 ResumeParse），Get() 同步加载一次，与旧行为一致。"""
+
+    def __init__(self, loader: Optional[Callable[[], Any]] = None, name: Optional[str] = None):
+        # 未指定 loader 时使用 NER_BACKEND 配置的后端
+        self._loader = loader or _load_configured_pipeline
+        self.name = name or ner_backend_label(NER_BACKEND)
+        self._lock = threading.Lock()
+        self._pipeline = None
+        self._status = NER_STATUS_UNLOADED
+        self._enabled = True
+        self._load_seconds: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    # 返回已加载的 pipeline；不可用时返回 None
+    def Get(self):
+        with self._lock:
+            status = self._status
+            if status == NER_STATUS_LOADED:
+                return self._pipeline
+            if not self._enabled or status == NER_STATUS_LOADING:
+                return None
+            if status == NER_STATUS_DISABLED:
+                if time.time() < self._retry_at:
+                    return None
+                # 退避到期：在后台重试，本次调用不等待
+                self._StartBackgroundLoad()
+                return None
+            self._status = NER_STATUS_LOADING
+        self._Load()
+        with self._lock:
+            return self._pipeline if self._status == NER_STATUS_LOADED else None
+
+    # 预热：在后台线程加载模型（应用启动时调用），已加载或加载中时忽略
+    def Warmup(self, background: bool = True):
+        with self._lock:
+            if not self._enabled or self._status in (NER_STATUS_LOADED, NER_STATUS_LOADING):
+                return
+            if self._status == NER_STATUS_DISABLED and time.time() < self._retry_at:
+                # 仍处于失败退避期，重复预热（例如多个工作进程初始化）不重新尝试加载
+                return
+            if not background:
+                self._status = NER_STATUS_LOADING
+            else:
+                self._StartBackgroundLoad()
+                return
+        self._Load()
+
+    def SetEnabled(self, enabled: bool):
+        with self._lock:
+            self._enabled = enabled
+
+    def Status(self) -> Dict[str, Any]:
+        with self._lock:
+            status = self._status if self._enabled else NER_STATUS_DISABLED
+            retry_in = None
+            if self._enabled and self._status == NER_STATUS_DISABLED:
+                retry_in = max(0.0, self._retry_at - time.time())
+            return {
+                'status': status,
+                'model': self.name,
+                'load_seconds': self._load_seconds,
+                'failures': self._failures,
+                'last_error': self._last_error,
+                'retry_in_seconds': retry_in,
+            }
+
+    # 需在持有 _lock 时调用
+    def _StartBackgroundLoad(self):
+        self._status = NER_STATUS_LOADING
+        self._thread = threading.Thread(target=self._Load, name='ner-warmup', daemon=True)
+        self._thread.start()
+
+    def _Load(self):
+        t0 = time.perf_counter()
+        try:
+            pipe = self._loader()
+        except Exception as e:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self._pipeline = None
+                self._failures += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+                self._load_seconds = elapsed
+                backoff = min(NER_RETRY_BACKOFF * (2 ** (self._failures - 1)), NER_RETRY_BACKOFF_MAX)
+                self._retry_at = time.time() + backoff
+                self._status = NER_STATUS_DISABLED
+            logger.warning('NER model %s failed to load after %.2fs, retry in %.0fs: %s',
+                           self.name, elapsed, backoff, self._last_error)
+            return
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self._pipeline = pipe
+            self._load_seconds = elapsed
+            self._last_error = None
+            self._status = NER_STATUS_LOADED
+        logger.info('NER model %s loaded in %.2fs', self.name, elapsed)
@@ -0,0 +1,346 @@
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from Source.Utils.Metrics import NER_SERVICE_BATCH_TEXTS, NER_SERVICE_REQUESTS, enable_metrics
+from Source.Utils.NerRuntime import NerRuntime, NER_STATUS_LOADED
+
+logger = logging.getLogger(__name__)
+
+# 本机共享 NER 服务：单独的进程加载一次模型，通过 Unix socket 为所有 Web/解析工作进程提供推理，
+# 并把同一时间窗口内来自不同进程的请求合并为一个批次，避免每个工作进程各自加载一份数百 MB 的模型。
+# 设置 CCRESUME_NER_SOCKET 后客户端使用该服务；服务不可用时 ResumeParse 回退到进程内 NER。
+# 启动服务：python -m Source.Utils.NerService --socket Saved/ner.sock
+NER_SERVICE_SOCKET = os.environ.get('CCRESUME_NER_SOCKET', '')
+# 收到第一个请求后等待合批的时间窗口（毫秒），以及一个批次最多包含的文本段数
+NER_SERVICE_WINDOW_MS = float(os.environ.get('CCRESUME_NER_BATCH_WINDOW_MS', '5'))
+NER_SERVICE_MAX_BATCH = int(os.environ.get('CCRESUME_NER_MAX_BATCH', '64'))
+# 客户端单次请求超时；请求失败后在 NER_SERVICE_RETRY_SECONDS 内不再尝试服务，直接走回退
+NER_SERVICE_TIMEOUT = float(os.environ.get('CCRESUME_NER_SERVICE_TIMEOUT', '30'))
+NER_SERVICE_RETRY_SECONDS = 5.0
+# 健康检查结果的缓存时间（秒）
+NER_SERVICE_PING_SECONDS = 1.0
+# 前向推理的 batch_size（与 ResumeParseUtils.NER_BATCH_SIZE 一致）
+NER_SERVICE_FORWARD_BATCH = 16
+
+_FRAME_HEADER = struct.Struct('>I')
+_MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class NerServiceUnavailable(Exception):
+    pass
+
+
+def _json_default(obj):
+    # pipeline 输出中的 numpy 标量（score 等）
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+
+def _send_frame(sock: socket.socket, payload: Dict[str, Any]):
+    data = json.dumps(payload, ensure_ascii=False, default=_json_default).encode('utf-8')
+    sock.sendall(_FRAME_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(min(size - len(buf), 1024 * 1024))
+        if not chunk:
+            raise ConnectionError('connection closed')
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _recv_frame(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    if size > _MAX_FRAME_BYTES:
+        raise ValueError(f'frame too large: {size}')
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+class _BatchRequest:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.results: Optional[List[List[Dict[str, Any]]]] = None
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+
+
+class NerBatcher:
+    """跨请求的微批处理：第一个请求到达后最多等待 window_ms，把期间到达的请求（不超过 max_batch 段文本）
+    合并为一次 pipeline 调用，再按请求拆分结果。单个线程执行推理，请求线程阻塞等待自己的结果。"""
+
+    def __init__(self, get_pipeline: Callable[[], Any], window_ms: float = NER_SERVICE_WINDOW_MS,
+                 max_batch: int = NER_SERVICE_MAX_BATCH):
+        self._get_pipeline = get_pipeline
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self._pending: List[_BatchRequest] = []
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._Run, name='ner-batcher', daemon=True)
+        self._thread.start()
+
+    def Submit(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        if not texts:
+            return []
+        request = _BatchRequest(texts)
+        with self._cond:
+            self._pending.append(request)
+            self._cond.notify()
+        request.done.wait()
+        if request.error:
+            raise RuntimeError(request.error)
+        return request.results
+
+    def Stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(5.0)
+
+    def _Take(self) -> List[_BatchRequest]:
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return []
+            deadline = time.monotonic() + self.window
+            while sum(len(r.texts) for r in self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            # 至少取一个请求；超长请求单独成批
+            batch = [self._pending.pop(0)]
+            total = len(batch[0].texts)
+            while self._pending and total + len(self._pending[0].texts) <= self.max_batch:
+                total += len(self._pending[0].texts)
+                batch.append(self._pending.pop(0))
+            return batch
+
+    def _Run(self):
+        while True:
+            batch = self._Take()
+            if not batch:
+                return
+            texts = [t for r in batch for t in r.texts]
+            NER_SERVICE_BATCH_TEXTS.Observe(len(texts))
+            try:
+                pipe = self._get_pipeline()
+                if pipe is None:
+                    raise RuntimeError('NER model not loaded')
+                try:
+                    outputs = pipe(texts, batch_size=NER_SERVICE_FORWARD_BATCH)
+                except Exception:
+                    # 批量失败时逐段重试，避免一个异常片段拖累同批的其他请求
+                    outputs = []
+                    for text in texts:
+                        try:
+                            outputs.append(pipe(text))
+                        except Exception:
+                            logger.exception('NER inference failed for one text')
+                            outputs.append([])
+                pos = 0
+                for r in batch:
+                    r.results = [list(ents or []) for ents in outputs[pos:pos + len(r.texts)]]
+                    pos += len(r.texts)
+            except Exception as e:
+                logger.exception('NER batch failed')
+                for r in batch:
+                    r.error = f'{type(e).__name__}: {e}'
+            for r in batch:
+                r.done.set()
+
+
+class _NerRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: 'NerServer' = self.server
+        try:
+            request = _recv_frame(self.request)
+            if request.get('op') == 'status':
+                _send_frame(self.request, {'ok': True, 'status': server.Status()})
+                return
+            texts = [str(t) for t in request.get('texts') or []]
+            results = server.batcher.Submit(texts)
+            NER_SERVICE_REQUESTS.Inc(outcome='ok')
+            _send_frame(self.request, {'ok': True, 'results': results})
+        except Exception as e:
+            NER_SERVICE_REQUESTS.Inc(outcome='error')
+            logger.exception('NER service request failed')
+            try:
+                _send_frame(self.request, {'ok': False, 'error': f'{type(e).__name__}: {e}'})
+            except OSError:
+                pass
+
+
+class NerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """NER 服务进程：每个连接一个线程接收请求，推理统一交给 NerBatcher。"""
+    daemon_threads = True
+    # 所有工作进程并发连接，默认的 listen backlog（5）满时 connect 会直接返回 EAGAIN
+    request_queue_size = 256
+
+    def __init__(self, socket_path: str, runtime: Optional[NerRuntime] = None,
+                 window_ms: float = NER_SERVICE_WINDOW_MS, max_batch: int = NER_SERVICE_MAX_BATCH):
+        self.socket_path = socket_path
+        self.runtime = runtime or NerRuntime()
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _NerRequestHandler)
+        self.batcher = NerBatcher(self.runtime.Get, window_ms, max_batch)
+
+    def Status(self) -> Dict[str, Any]:
+        status = self.runtime.Status()
+        status.update({'pid': os.getpid(), 'window_ms': self.batcher.window * 1000, 'max_batch': self.batcher.max_batch})
+        return status
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.Stop()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(path: str):
+    """上次异常退出留下的 socket 文件：无人监听时删除，仍有服务在监听时报错。"""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f'NER service already listening on {path}')
+    finally:
+        probe.close()
+
+
+class NerServiceClient:
+    """NER 服务的客户端，调用方式与 transformers pipeline 相同：传入字符串返回实体列表，传入列表返回列表的列表。
+    请求失败时在 NER_SERVICE_RETRY_SECONDS 内视服务为不可用，改用 fallback() 返回的进程内 pipeline；
+    fallback 也不可用时抛出 NerServiceUnavailable。"""
+
+    def __init__(self, socket_path: str, fallback: Optional[Callable[[], Any]] = None,
+                 timeout: float = NER_SERVICE_TIMEOUT):
+        self.socket_path = socket_path
+        self.name = f'service:{socket_path}'
+        self.timeout = timeout
+        self._fallback = fallback
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self._last_error: Optional[str] = None
+        self._ping_at = 0.0
+        self._ping_ok = False
+
+    def __call__(self, inputs, batch_size: Optional[int] = None):
+        single = isinstance(inputs, str)
+        texts = [inputs] if single else list(inputs)
+        if self.Available():
+            try:
+                results = self._Request({'texts': texts})['results']
+                return results[0] if single else results
+            except Exception as e:
+                self._MarkDown(e)
+        pipe = self._fallback() if self._fallback is not None else None
+        if pipe is None:
+            raise NerServiceUnavailable(self._last_error or 'NER service unavailable')
+        return pipe(inputs) if batch_size is None else pipe(inputs, batch_size=batch_size)
+
+    def Available(self) -> bool:
+        """最近没有失败（不访问服务）。"""
+        with self._lock:
+            return time.time() >= self._down_until
+
+    def Healthy(self) -> bool:
+        """服务可连接且模型已加载；结果缓存 NER_SERVICE_PING_SECONDS。"""
+        if not self.Available():
+            return False
+        now = time.time()
+        with self._lock:
+            if now - self._ping_at < NER_SERVICE_PING_SECONDS:
+                return self._ping_ok
+        try:
+            ok = self._Request({'op': 'status'}, timeout=1.0)['status'].get('status') == NER_STATUS_LOADED
+        except Exception as e:
+            self._MarkDown(e)
+            ok = False
+        with self._lock:
+            self._ping_at = now
+            self._ping_ok = ok
+        return ok
+
+    def Status(self) -> Dict[str, Any]:
+        healthy = self.Healthy()
+        with self._lock:
+            return {
+                'socket': self.socket_path,
+                'status': 'up' if healthy else 'down',
+                'last_error': self._last_error,
+                'retry_in_seconds': max(0.0, self._down_until - time.time()) or None,
+            }
+
+    def _Request(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout or self.timeout)
+            sock.connect(self.socket_path)
+            _send_frame(sock, payload)
+            response = _recv_frame(sock)
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error') or 'NER service error')
+        return response
+
+    def _MarkDown(self, error: Exception):
+        with self._lock:
+            first = time.time() >= self._down_until
+            self._down_until = time.time() + NER_SERVICE_RETRY_SECONDS
+            self._last_error = f'{type(error).__name__}: {error}'
+            self._ping_ok = False
+        if first:
+            logger.warning('NER service %s unavailable, using in-process NER for %.0fs: %s',
+                           self.socket_path, NER_SERVICE_RETRY_SECONDS, self._last_error)
+
+
+def serve(socket_path: str, window_ms: float = NER_SERVICE_WINDOW_MS, max_batch: int = NER_SERVICE_MAX_BATCH):
+    """加载模型后在 socket_path 上提供服务，直到收到 SIGINT/SIGTERM。模型加载失败时以非零状态退出。"""
+    runtime = NerRuntime()
+    runtime.Warmup(background=False)
+    status = runtime.Status()
+    if status['status'] != NER_STATUS_LOADED:
+        raise SystemExit(f"NER model {status['model']} failed to load: {status['last_error']}")
+    server = NerServer(socket_path, runtime, window_ms, max_batch)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    logger.info('NER service (%s) listening on %s, window %.1f ms, max batch %d',
+                status['model'], socket_path, window_ms, max_batch)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared local NER inference service over a Unix socket.')
+    parser.add_argument('--socket', default=NER_SERVICE_SOCKET or os.path.join('Saved', 'ner.sock'))
+    parser.add_argument('--window-ms', type=float, default=NER_SERVICE_WINDOW_MS)
+    parser.add_argument('--max-batch', type=int, default=NER_SERVICE_MAX_BATCH)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    enable_metrics()
+    serve(args.socket, args.window_ms, args.max_batch)
+
+
+if __name__ == '__main__':
+    main()
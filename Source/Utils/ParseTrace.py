@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 慢解析采样：单次 ResumeParse 超过该耗时（毫秒）时，把脱敏后的输入文本写入回放目录，便于离线复现热点样本；
+# 设为 0 或负数关闭采样。未设置 CCRESUME_REPLAY_SALT 时同样不采样
+SLOW_PARSE_MS = float(os.environ.get('CCRESUME_SLOW_PARSE_MS', '500'))
+REPLAY_DIR = os.environ.get('CCRESUME_REPLAY_DIR', os.path.join('Saved', 'Replay'))
+# 脱敏哈希的盐：同一盐下相同的原值映射到相同的替换值，不同部署之间不可关联。
+# 无盐时手机号等取值空间很小的字段可被穷举还原，因此必须由部署方显式设置，否则不写回放样本
+REPLAY_SALT = os.environ.get('CCRESUME_REPLAY_SALT', '')
+# 回放目录中最多保留的样本数，超出后不再写入
+REPLAY_MAX_FILES = int(os.environ.get('CCRESUME_REPLAY_MAX_FILES', '200'))
+
+_EMAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+# 身份证号，以及电话号码等数字串：数字之间可有空格、-、.、括号等分隔（135-5891-0629、+86 135 5891 0629、
+# (010) 8888-6666），可带 +86 等国家码；共 6 位以上数字时脱敏，覆盖 ResumeParse 的手机号与宽松电话号码规则
+_ID_CARD_RE = re.compile(r'(?<!\d)\d{17}[\dXx](?!\d)')
+_NUMBER_RE = re.compile(r'(?<![\dA-Za-z+])(?:\+[ \t]?)?\(?\d(?:[ \t.\-()]{0,2}\d)+\)?(?!\d)')
+_DIGIT_GROUP_RE = re.compile(r'\d+')
+_COUNTRY_CODE_RE = re.compile(r'^(\+[ \t]?\d{1,3}|86)[ \t.\-]')
+_MIN_MASKED_DIGITS = 6
+# 替换姓名使用的常见字，保持中文字符与长度不变，使脱敏后的文本走与原文相同的解析分支
+_NAME_CHARS = '李王张刘陈杨赵黄周吴徐孙胡朱高林何郭马罗伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂'
+# 因缺少盐而跳过采样的提示只记录一次
+_warned_no_salt = False
+
+
+class ParseTrace:
+    """一次解析的分阶段计时。各阶段依次执行，Stage(name) 结束上一阶段并开始新阶段，
+    同名阶段（例如分散在多处的 header 提取）累加耗时与次数；Finish() 结束最后一个阶段。"""
+
+    def __init__(self):
+        self._spans: Dict[str, Dict[str, Any]] = {}
+        self._current: Optional[str] = None
+        self._t0 = time.perf_counter()
+        self._stage_t0 = self._t0
+        self.total_ms = 0.0
+
+    def Stage(self, name: str):
+        now = time.perf_counter()
+        self._Close(now)
+        self._current = name
+        self._stage_t0 = now
+
+    def Finish(self) -> List[Dict[str, Any]]:
+        now = time.perf_counter()
+        self._Close(now)
+        self._current = None
+        self.total_ms = (now - self._t0) * 1000
+        return self.Spans()
+
+    def Spans(self) -> List[Dict[str, Any]]:
+        """[{'name', 'ms', 'calls'}, ...]，按阶段首次出现的顺序。"""
+        return [{'name': name, 'ms': round(span['ms'], 3), 'calls': span['calls']}
+                for name, span in self._spans.items()]
+
+    def _Close(self, now: float):
+        if self._current is None:
+            return
+        span = self._spans.setdefault(self._current, {'ms': 0.0, 'calls': 0})
+        span['ms'] += (now - self._stage_t0) * 1000
+        span['calls'] += 1
+
+
+def format_spans(spans: List[Dict[str, Any]]) -> str:
+    return ' '.join(f"{s['name']}={s['ms']:.1f}ms" for s in spans)
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256((REPLAY_SALT + value).encode('utf-8')).hexdigest()
+
+
+def _mask_digits(value: str, keep: int = 1) -> str:
+    """按哈希生成同样长度的数字串，保留前 keep 位（手机号的 1 开头、证件号位数），末位 X 保留。"""
+    digest = _digest(value)
+    digits = ''.join(str(int(ch, 16) % 10) for ch in digest)
+    body = value[:keep] + (digits * (len(value) // len(digits) + 1))[:len(value) - keep]
+    if value[-1] in 'Xx':
+        body = body[:-1] + value[-1]
+    return body
+
+
+def _is_date_like(groups: List[str]) -> bool:
+    """由年份（19xx/20xx）与 1~2 位月日组成的数字串（2018.07-2021.04、2018-2021、201807），不是电话号码。"""
+    if len(groups) == 1:
+        g = groups[0]
+        return len(g) in (6, 8) and g[:2] in ('19', '20') and '01' <= g[4:6] <= '12'
+    return (any(len(g) == 4 and g[:2] in ('19', '20') for g in groups)
+            and all(len(g) <= 2 or (len(g) == 4 and g[:2] in ('19', '20')) for g in groups))
+
+
+def _mask_number(value: str) -> str:
+    """电话号码等数字串脱敏：分隔符与国家码保持原样，其余数字按去掉分隔符后的号码整体替换，
+    同一号码的不同写法得到相同的替换值；手机号保留 1[3-9] 开头，使脱敏后仍按手机号解析。"""
+    m = _COUNTRY_CODE_RE.match(value)
+    prefix_len = m.end(1) if m else 0
+    body = value[prefix_len:]
+    groups = _DIGIT_GROUP_RE.findall(body)
+    digits = ''.join(groups)
+    if len(digits) < _MIN_MASKED_DIGITS or _is_date_like(groups):
+        return value
+    # 紧接号码的 86（+8613558910629）同样视为国家码
+    skip = 2 if len(digits) == 13 and digits.startswith('86') and digits[2] == '1' else 0
+    national = digits[skip:]
+    keep = 2 if len(national) == 11 and national[0] == '1' and national[1] in '3456789' else 1
+    masked = iter(digits[:skip] + _mask_digits(national, keep))
+    return value[:prefix_len] + _DIGIT_GROUP_RE.sub(lambda g: ''.join(next(masked) for _ in g.group(0)), body)
+
+
+def _mask_email(value: str) -> str:
+    return f'u{_digest(value)[:10]}@example.com'
+
+
+def _mask_name(value: str) -> str:
+    digest = _digest(value)
+    return ''.join(_NAME_CHARS[int(digest[i * 2:i * 2 + 2], 16) % len(_NAME_CHARS)] for i in range(len(value)))
+
+
+def redact_pii(text: str, names: Optional[List[str]] = None) -> str:
+    """把邮箱、证件号、电话号码等数字串以及给定的姓名替换为加盐哈希派生的同形值：
+    长度与字符类别不变，解析路径基本与原文一致，但无法还原原值。年份、日期区间不替换。"""
+    text = _EMAIL_RE.sub(lambda m: _mask_email(m.group(0)), text)
+    text = _ID_CARD_RE.sub(lambda m: _mask_digits(m.group(0)), text)
+    text = _NUMBER_RE.sub(lambda m: _mask_number(m.group(0)), text)
+    for name in names or []:
+        if name and name.strip():
+            text = text.replace(name, _mask_name(name))
+    return text
+
+
+def capture_slow_parse(text: str, trace: ParseTrace, names: Optional[List[str]] = None,
+                       meta: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """解析耗时超过 SLOW_PARSE_MS 时把脱敏后的输入与分阶段耗时写入 REPLAY_DIR，返回写入的路径。
+    未设置 REPLAY_SALT 时不写入；写入失败只记录日志，不影响解析结果。"""
+    global _warned_no_salt
+    if SLOW_PARSE_MS <= 0 or trace.total_ms < SLOW_PARSE_MS:
+        return None
+    if not REPLAY_SALT:
+        if not _warned_no_salt:
+            _warned_no_salt = True
+            logger.warning('Slow parse (%.1f ms) not captured: set CCRESUME_REPLAY_SALT to enable replay capture',
+                           trace.total_ms)
+        return None
+    try:
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+        if len(os.listdir(REPLAY_DIR)) >= REPLAY_MAX_FILES:
+            return None
+        record = {
+            'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_ms': round(trace.total_ms, 3),
+            'spans': trace.Spans(),
+            'text_sha256': _digest(text),
+            'text': redact_pii(text, names),
+        }
+        record.update(meta or {})
+        path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.json")
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(record, fh, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        logger.info('Slow parse (%.1f ms) saved to %s: %s', trace.total_ms, path, format_spans(record['spans']))
+        return path
+    except Exception:
+        logger.exception('Failed to save slow parse sample')
+        return None
+
+
+def load_replay(path: str) -> Dict[str, Any]:
+    """读取回放样本，record['text'] 可直接交给 ResumeParse 复现。"""
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
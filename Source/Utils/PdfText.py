@@ -0,0 +1,142 @@
+import io
+import logging
+import os
+import re
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# PDF 文本提取：PyPDF2 逐页提取，单页失败时只对该页改用 pdfplumber（此前任何一页出错都会丢弃全部结果，
+# 整份文件交给 pdfplumber 重新解析）；提取前先探测文本层，纯图片（扫描件）直接返回 no_text_layer，
+# 不再让两个库各跑一遍；页数较多时按连续页段分给进程池并行提取，结果按页序拼接，与串行提取完全一致。
+
+# 达到该页数才并行提取（可通过环境变量 CCRESUME_PDF_PARALLEL_PAGES 覆盖，0 表示不并行）；每个任务至少包含的页数
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('CCRESUME_PDF_PARALLEL_PAGES', '32'))
+PDF_PAGES_PER_TASK = 8
+# 探测 Form XObject 嵌套的最大深度
+_PROBE_MAX_DEPTH = 3
+# 文本显示操作符（Tj/TJ/'/"）紧跟在字符串或数组操作数之后
+_TEXT_SHOW_RE = re.compile(rb'[)>\]]\s*(?:Tj|TJ|\'|")')
+
+NO_TEXT_LAYER = 'no_text_layer'
+
+
+class NoTextLayer(Exception):
+    """PDF 没有可提取的文本层（扫描件/纯图片）。"""
+
+    def __init__(self, page_count: int):
+        super().__init__(f'{NO_TEXT_LAYER}: {page_count} pages without text')
+        self.page_count = page_count
+
+
+def _has_text(obj: Any, inherited_fonts: bool = False, depth: int = 0) -> bool:
+    """页面（或 Form XObject）是否有文本：资源中有字体，且内容流中出现文本显示操作符。"""
+    resources = obj.get('/Resources')
+    resources = resources.get_object() if resources is not None else {}
+    fonts = bool(resources.get('/Font')) or inherited_fonts
+    if fonts:
+        contents = obj.get_contents() if hasattr(obj, 'get_contents') else obj
+        if contents is not None and _TEXT_SHOW_RE.search(contents.get_data()):
+            return True
+    if depth >= _PROBE_MAX_DEPTH:
+        return False
+    xobjects = resources.get('/XObject')
+    for ref in (xobjects.get_object().values() if xobjects is not None else ()):
+        xobject = ref.get_object()
+        if xobject.get('/Subtype') == '/Form' and _has_text(xobject, fonts, depth + 1):
+            return True
+    return False
+
+
+def has_text_layer(reader) -> bool:
+    """快速探测 PyPDF2 PdfReader 是否有文本层：只解压内容流做字节匹配，不做文本提取，遇到第一页有文本即返回。
+    探测出错时按有文本层处理（交给正常提取流程）。"""
+    try:
+        return any(_has_text(page) for page in reader.pages)
+    except Exception:
+        logger.debug('Text layer probe failed', exc_info=True)
+        return True
+
+
+def _pdfplumber_pages(data: bytes, indices: List[int]) -> List[str]:
+    import pdfplumber
+    texts = []
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for i in indices:
+            try:
+                texts.append(pdf.pages[i].extract_text() or '')
+            except Exception:
+                logger.debug('pdfplumber failed on page %d', i, exc_info=True)
+                texts.append('')
+    return texts
+
+
+def extract_page_range(data: bytes, start: int, stop: int, reader=None) -> Tuple[List[str], int]:
+    """用 PyPDF2 提取 [start, stop) 页的文本，失败的页统一改用 pdfplumber 提取。返回 (各页文本, 回退页数)。
+    进程池任务：工作进程自行打开文件内容。"""
+    if reader is None:
+        import PyPDF2
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+    texts: List[Optional[str]] = []
+    failed = []
+    for i in range(start, stop):
+        try:
+            texts.append(reader.pages[i].extract_text() or '')
+        except Exception:
+            logger.debug('PyPDF2 failed on page %d, falling back to pdfplumber', i, exc_info=True)
+            texts.append(None)
+            failed.append(i)
+    if failed:
+        try:
+            recovered = _pdfplumber_pages(data, failed)
+        except Exception:
+            logger.debug('pdfplumber unavailable for page fallback', exc_info=True)
+            recovered = [''] * len(failed)
+        for i, text in zip(failed, recovered):
+            texts[i - start] = text
+    return texts, len(failed)
+
+
+def _page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    tasks = max(1, min(workers, page_count // PDF_PAGES_PER_TASK))
+    size, extra = divmod(page_count, tasks)
+    ranges = []
+    start = 0
+    for k in range(tasks):
+        stop = start + size + (1 if k < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def extract_pdf_pages(data: bytes, get_pool: Optional[Callable[[], Any]] = None, workers: int = 1,
+                      reset_pool: Optional[Callable[[], None]] = None) -> Tuple[List[str], int]:
+    """PyPDF2 打开并探测文本层后逐页提取，返回 (各页文本, 回退到 pdfplumber 的页数)。
+    没有文本层时抛出 NoTextLayer；PyPDF2 无法打开文件时异常交给调用方整份回退。
+    页数达到 PDF_PARALLEL_MIN_PAGES 时通过 get_pool() 取得进程池按页段并行提取；
+    进程池损坏时调用 reset_pool()（下次重新创建），本次改为串行。"""
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    if page_count and not has_text_layer(reader):
+        raise NoTextLayer(page_count)
+    if get_pool is None or workers <= 1 or PDF_PARALLEL_MIN_PAGES <= 0 or page_count < PDF_PARALLEL_MIN_PAGES:
+        return extract_page_range(data, 0, page_count, reader)
+    try:
+        pool = get_pool()
+        futures = [pool.submit(extract_page_range, data, start, stop)
+                   for start, stop in _page_ranges(page_count, workers)]
+        texts: List[str] = []
+        fallbacks = 0
+        for fut in futures:
+            part, failed = fut.result()
+            texts.extend(part)
+            fallbacks += failed
+        return texts, fallbacks
+    except Exception as e:
+        logger.exception('Parallel PDF extraction failed, extracting %d pages serially', page_count)
+        if isinstance(e, BrokenProcessPool) and reset_pool is not None:
+            reset_pool()
+        return extract_page_range(data, 0, page_count, reader)
+
@@ -1,6 +1,30 @@
+import logging
 import re
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
+from Source.Utils.BlockMemo import BlockMemo, block_key, BLOCK_MEMO_SIZE
+from Source.Utils.Gazetteer import get_gazetteer
+from Source.Utils.SkillTaxonomy import get_skill_taxonomy
+from Source.Utils.KeywordScanner import KeywordScanner, KeywordScan
+from Source.Utils.NerRuntime import NerRuntime, NER_STATUS_DISABLED, NER_STATUS_LOADED
+from Source.Utils.NerService import NerServiceClient, NER_SERVICE_SOCKET
+from Source.Utils.ParseTrace import ParseTrace, capture_slow_parse, format_spans
+from Source.Utils.Metrics import PARSE_SECONDS, NER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# 解析器版本标记：修改解析规则导致输出变化时需递增，使旧的解析缓存自动失效
+RESUME_PARSER_VERSION = '3'
+
+# 解析模式：accurate 使用 transformers NER 与 jieba 词性标注；fast 用于批量回填，二者都跳过，
+# 公司/学校改由机构名词表（见 Gazetteer）与公司后缀规则识别，联系方式等字段的提取与 accurate 相同
+# （姓名只用 header 规则，不再用 jieba 的人名标注兜底）
+PARSE_MODE_ACCURATE = 'accurate'
+PARSE_MODE_FAST = 'fast'
+PARSE_MODES = (PARSE_MODE_ACCURATE, PARSE_MODE_FAST)
 
 # 可选的中文分词/词性标注增强（jieba）
 try:
@@ -10,37 +34,421 @@ try:
 except Exception:
     _HAS_JIEBA = False
 
-# 可选的 transformers-based NER（懒加载）
-_NER_PIPELINE = None
+# 可选的 transformers-based NER（懒加载；加载状态、失败退避与预热由 NerRuntime 管理）
+_NER_RUNTIME = NerRuntime()
 _USE_TRANSFORMERS_NER = True
+# 块级记忆化（见 BlockMemo）：重新解析修改过的简历时，未改动的块复用归类、结构化拆分与 NER 结果；
+# 改动过的块重新打分时，其中未改动的行复用 jieba 词性标注结果（按行记忆，条目数更多）
+_BLOCK_MEMO = BlockMemo()
+_LINE_TOKENS_MEMO = BlockMemo(BLOCK_MEMO_SIZE * 8)
+def clear_block_memo():
+    """清空块记忆与行分词记忆（例如更新 jieba 词典之后）。"""
+    _BLOCK_MEMO.Clear()
+    _LINE_TOKENS_MEMO.Clear()
+
+
+def _in_process_ner():
+    """共享 NER 服务不可用时的进程内回退：首次回退时在后台加载模型，加载完成前返回 None（本次解析不做 NER）。"""
+    _NER_RUNTIME.Warmup(background=True)
+    return _NER_RUNTIME.Get()
+
+
+# 可选的共享 NER 服务（见 NerService）：配置 CCRESUME_NER_SOCKET 后优先使用，
+# 服务不可用期间改用进程内 NER，不可用状态由客户端记录并定期重试
+_NER_SERVICE = NerServiceClient(NER_SERVICE_SOCKET, fallback=_in_process_ner) if NER_SERVICE_SOCKET else None
+
+
 def _get_ner_pipeline():
-    global _NER_PIPELINE
-    if _NER_PIPELINE is not None:
-        return _NER_PIPELINE
+    if not _USE_TRANSFORMERS_NER:
+        return None
+    if _NER_SERVICE is None:
+        return _NER_RUNTIME.Get()
+    if _NER_SERVICE.Available():
+        return _NER_SERVICE
+    return _in_process_ner()
+
+
+def warmup_ner(background: bool = True):
+    """预热 NER 模型与 jieba 词典（应用启动时调用），使首个请求不必承担模型加载耗时。
+    配置了共享 NER 服务时不在进程内加载模型，只在服务不可用时才回退加载。"""
+    if _USE_TRANSFORMERS_NER and _NER_SERVICE is None:
+        _NER_RUNTIME.Warmup(background=background)
+    if _HAS_JIEBA:
+        if background:
+            threading.Thread(target=jieba.initialize, name='jieba-warmup', daemon=True).start()
+        else:
+            jieba.initialize()
+
+
+def parser_version_tag(mode: str = PARSE_MODE_ACCURATE) -> str:
+    """当前解析输出的版本标记：RESUME_PARSER_VERSION 与技能词表指纹，NER 已加载时附加 '+ner'。
+    有无 NER 的解析结果不同，缓存等按此标记区分，避免把预热期间的无 NER 结果当作最终结果复用。
+    fast 模式附加 '+fast:' 与机构名词表指纹；修改词表后旧结果不再命中。"""
+    base = f'{RESUME_PARSER_VERSION}:{get_skill_taxonomy().version}'
+    if mode == PARSE_MODE_FAST:
+        return f'{base}+fast:{get_gazetteer().version}'
+    if _USE_TRANSFORMERS_NER and (_NER_RUNTIME.Status()['status'] == NER_STATUS_LOADED
+                                  or (_NER_SERVICE is not None and _NER_SERVICE.Healthy())):
+        return base + '+ner'
+    return base
+
+
+def get_ner_status() -> Dict[str, Any]:
+    """NER 状态：loaded / loading / disabled / unloaded，以及加载耗时、失败次数和下次重试时间。
+    配置了共享 NER 服务时附带 service（up / down），服务可用即视为已加载。"""
+    status = _NER_RUNTIME.Status()
+    if _NER_SERVICE is not None:
+        status['service'] = _NER_SERVICE.Status()
+        if status['service']['status'] == 'up':
+            status['status'] = NER_STATUS_LOADED
+    if not _USE_TRANSFORMERS_NER:
+        status['status'] = NER_STATUS_DISABLED
+    return status
+
+
+# NER 批量推理参数：每个前向批次的文本段数，以及单段最大字符数
+# （bert-base-chinese 基本一字一 token，512 需扣除 [CLS]/[SEP]）
+NER_BATCH_SIZE = 16
+NER_MAX_LENGTH = 510
+
+
+def _split_ner_chunks(text: str, max_length: int) -> List[tuple]:
+    """把超长文本切为不超过 max_length 的片段，尽量在换行处切分，返回 [(offset, chunk), ...]。"""
+    chunks = []
+    pos = 0
+    while pos < len(text):
+        end = min(pos + max_length, len(text))
+        if end < len(text):
+            cut = text.rfind('\n', pos, end)
+            if cut > pos:
+                end = cut + 1
+        chunks.append((pos, text[pos:end]))
+        pos = end
+    return chunks
+
+
+def _run_ner_batch(texts: List[str]) -> List[List[Dict[str, Any]]]:
+    """对一组文本做一次批量 NER，返回与 texts 一一对应的实体列表（entity_group/word/start/end）。
+    超长文本先切片再一起入批，片段内的 start/end 会加上片段偏移映射回原文本；空文本不参与推理。
+    同一 pipeline 对相同文本的结果不变，块记忆中已有的文本不再推理。"""
+    results: List[List[Dict[str, Any]]] = [[] for _ in texts]
+    ner_pipe = _get_ner_pipeline()
+    if not ner_pipe:
+        return results
+    model_tag = f'{_NER_RUNTIME.name}:{id(ner_pipe)}'
+    memo_keys: Dict[int, bytes] = {}
+    owners = []
+    chunks = []
+    for idx, t in enumerate(texts):
+        if not t or not t.strip():
+            continue
+        key = block_key(model_tag, t)
+        cached = _BLOCK_MEMO.Get('ner', key)
+        if cached is not None:
+            results[idx] = [dict(ent) for ent in cached]
+            continue
+        memo_keys[idx] = key
+        for offset, chunk in _split_ner_chunks(t, NER_MAX_LENGTH):
+            owners.append((idx, offset))
+            chunks.append(chunk)
+    if not chunks:
+        return results
+    t0 = time.perf_counter()
     try:
-        from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
-        # 使用一个通用的中文 NER 模型（可替换为你偏好的模型）
-        model_name = 'ckiplab/bert-base-chinese-ner'
-        _NER_PIPELINE = pipeline('ner', model=model_name, tokenizer=model_name, aggregation_strategy='simple')
+        outputs = ner_pipe(chunks, batch_size=NER_BATCH_SIZE)
     except Exception:
-        _NER_PIPELINE = None
-    return _NER_PIPELINE
+        # 批量失败时逐段重试，避免单个异常片段拖累整份简历；仍失败的文本不写入块记忆
+        outputs = []
+        for (idx, _), chunk in zip(owners, chunks):
+            try:
+                outputs.append(ner_pipe(chunk))
+            except Exception:
+                outputs.append([])
+                memo_keys.pop(idx, None)
+    NER_SECONDS.Observe(time.perf_counter() - t0)
+    for (idx, offset), ents in zip(owners, outputs):
+        for ent in ents or []:
+            ent = dict(ent)
+            if offset:
+                if ent.get('start') is not None:
+                    ent['start'] += offset
+                if ent.get('end') is not None:
+                    ent['end'] += offset
+            results[idx].append(ent)
+    for idx, key in memo_keys.items():
+        _BLOCK_MEMO.Put('ner', key, [dict(ent) for ent in results[idx]])
+    return results
+
+
+class _SegmentedDocument:
+    """一篇文本的 jieba 词性标注结果，每个词记录 (word, flag, start, end) 文档偏移，供各处按区间查询。
+    jieba 会在换行等非词字符处切分，所以某一行的分词结果与单独切分该行完全一致；
+    因此按行懒加载：首次查询到某些行时把它们拼成一次 pseg.cut 调用，之后重复查询（header、
+    相互重叠的块）直接复用，每一行在整个文档中至多被切分一次。"""
+
+    def __init__(self, lines: List[str]):
+        self._lines = lines
+        self.line_offsets: List[int] = []
+        self._line_index: Dict[str, int] = {}
+        off = 0
+        for i, ln in enumerate(lines):
+            self.line_offsets.append(off)
+            self._line_index.setdefault(ln, i)
+            off += len(ln) + 1
+        self._line_tokens: Dict[int, List[Tuple[str, str, int, int]]] = {}
+
+    def _ensure(self, indices: List[int]):
+        pending = [i for i in dict.fromkeys(indices) if i not in self._line_tokens and self._lines[i]]
+        if not pending:
+            return
+        # 之前解析中切分过的行（按行内容记忆）直接复用，只平移到本文档的偏移
+        missed = []
+        for i in pending:
+            cached = _LINE_TOKENS_MEMO.Get('pos', block_key(self._lines[i]))
+            if cached is None:
+                missed.append(i)
+                self._line_tokens[i] = []
+                continue
+            off = self.line_offsets[i]
+            self._line_tokens[i] = [(word, flag, off + start, off + end) for word, flag, start, end in cached]
+        pending = missed
+        if not pending:
+            return
+        # 待切分的行拼成一段文本，一次 pseg.cut，再按换行把词分回各行
+        k = 0
+        col = 0
+        for word, flag in pseg.cut('\n'.join(self._lines[i] for i in pending)):
+            if word == '\n':
+                k += 1
+                col = 0
+                continue
+            i = pending[k]
+            start = self.line_offsets[i] + col
+            col += len(word)
+            self._line_tokens[i].append((word, flag, start, start + len(word)))
+        for i in pending:
+            off = self.line_offsets[i]
+            _LINE_TOKENS_MEMO.Put('pos', block_key(self._lines[i]),
+                                  tuple((word, flag, start - off, end - off) for word, flag, start, end in self._line_tokens[i]))
+
+    def tokens_in_range(self, start: int, end: int) -> List[Tuple[str, str, int, int]]:
+        first = max(0, bisect_right(self.line_offsets, start) - 1)
+        last = bisect_left(self.line_offsets, end)
+        indices = list(range(first, last))
+        self._ensure(indices)
+        return [t for i in indices for t in self._line_tokens.get(i, ()) if t[2] >= start and t[3] <= end]
+
+    def line_range(self, first: int, last: int) -> Tuple[int, int]:
+        """第 first 行到第 last 行（不含）覆盖的字符区间。"""
+        if last <= first:
+            return (0, 0)
+        return (self.line_offsets[first], self.line_offsets[last - 1] + len(self._lines[last - 1]))
+
+    def tokens_for_text(self, text: str) -> List[Tuple[str, str, int, int]]:
+        """查询一段由文档行组成的文本（例如一个块）的分词结果。"""
+        lines = [ln for ln in text.splitlines() if ln]
+        missing = [ln for ln in lines if ln not in self._line_index]
+        if missing:
+            # 不是文档中的原始行（理论上不会发生），追加为新行后同样只切分一次
+            for ln in missing:
+                if ln not in self._line_index:
+                    self._line_index[ln] = len(self._lines)
+                    self.line_offsets.append(-1)
+                    self._lines.append(ln)
+        indices = [self._line_index[ln] for ln in lines]
+        self._ensure(indices)
+        return [t for i in indices for t in self._line_tokens[i]]
 
 
 def _normalize(text: str) -> str:
     return re.sub(r"\r", "\n", text or "").strip()
 
 
+# 中文字符之间的空白。以空白字符开头并用后顾断言检查前一个字符，正则只在空白处尝试匹配，
+# 而不是在每个中文字符处（等价于 ([\u4e00-\u9fff])\s+(?=[\u4e00-\u9fff]) 替换为 \1）
+_CJK_SPACE_RE = re.compile(r'\s(?<=[\u4e00-\u9fff]\s)\s*(?=[\u4e00-\u9fff])')
+
+
 def normalize_cjk_spacing(text: str) -> str:
     """去除中文字符之间不必要的空白（把 '工 作 经 历' -> '工作经历'），并删除零宽字符。"""
     if not text:
         return text
     # 删除零宽空格等
     text = text.replace('\u200b', '')
-    # 把中文字符之间的空白去除，多次替换以覆盖连续拆分的情况
-    # 匹配: 中文字符 + 空白 + 中文字符
-    text = re.sub(r'([\u4e00-\u9fff])\s+(?=[\u4e00-\u9fff])', r"\1", text)
-    return text
+    # 把中文字符之间的空白去除（连续拆分的每一段空白都会被去掉）
+    return _CJK_SPACE_RE.sub('', text)
+
+
+# 全文噪声清洗使用的正则。各步骤按固定顺序依次执行（前一步的删除可能使后一步产生新的命中，
+# 例如长 ID 中的十六进制串先被删除），每一步先用子串检查跳过不可能命中的情况。
+# 'Page'、'[object Object]' 原先用 re.I 匹配；两者都不含 i/s/k 等有特殊 Unicode 大小写折叠的字母，
+# 这里展开为大小写字符类，结果不变但正则可以使用首字符快速扫描。
+# 同理，以 \b 或后顾断言开头的模式改写为先匹配一个字符再在其位置上做断言，只在候选字符处尝试匹配
+_PAGE_OF_RE = re.compile(r'第\s*\d+\s*页\s*共\s*\d+\s*页')
+_PAGE_NO_RE = re.compile(r'第\s*\d+\s*页')
+_PAGE_TOTAL_RE = re.compile(r'共\s*\d+\s*页')
+_PAGE_EN_RE = re.compile(r'[Pp][Aa][Gg][Ee]\s*\d+')
+_HEX_RUN_RE = re.compile(r'[A-Fa-f0-9](?<![A-Fa-f0-9].)[A-Fa-f0-9]{15,}')
+_TILDE_RUN_RE = re.compile(r'~{2,}')
+# 导出/黏贴残留的长混合字母数字 ID（例如 "XV639S5FVpSwJG7U_yfRearmg"），等价于 \b[A-Za-z0-9_\-]{12,}\b
+_LONG_ID_RE = re.compile(r"[A-Za-z0-9_\-](?<=\b.)[A-Za-z0-9_\-]{11,}\b")
+_OBJECT_TEXT_RE = re.compile(r'\[[Oo][Bb][Jj][Ee][Cc][Tt] [Oo][Bb][Jj][Ee][Cc][Tt]\]')
+# 逐行去噪要丢弃的页码/十六进制行；全文不含这些模式时逐行检查可以整体跳过。
+# 分为三个各自能快速扫描首字符的正则（合并为一个分支正则后首字符集合过大，反而更慢）
+_LINE_PAGE_ZH_RE = re.compile(r'[第共]\s*\d+\s*页')
+_LINE_HEX_RE = re.compile(r'[A-Fa-f0-9](?<![A-Fa-f0-9].)[A-Fa-f0-9]{11}')
+
+
+def normalize_resume_text(text: str) -> Tuple[str, bool]:
+    """ResumeParse 的全文规范化与噪声清洗：换行/首尾空白、零宽字符与中文间空白、页眉页脚页码、
+    长十六进制串、连续 ~、长 ID 和 '[object Object]'。
+    返回 (s, line_noise)：line_noise 为 False 表示清洗后的全文已不含页码或 12 位以上的十六进制串，
+    label_lines 可跳过逐行的这两项检查。"""
+    s = normalize_cjk_spacing(_normalize(text))
+    # 删除典型的页码标记（第1页共7页 / 第1页 / 共7页 / Page 1）
+    if '页' in s and '第' in s and '共' in s:
+        s = _PAGE_OF_RE.sub('', s)
+    if '页' in s and '第' in s:
+        s = _PAGE_NO_RE.sub('', s)
+    if '页' in s and '共' in s:
+        s = _PAGE_TOTAL_RE.sub('', s)
+    s = _PAGE_EN_RE.sub('', s)
+    # 去掉长的十六进制/随机串（例如 OCR/导出残留）
+    s = _HEX_RUN_RE.sub('', s)
+    # 去掉连续的 ~ 或特殊分隔符
+    if '~~' in s:
+        s = _TILDE_RUN_RE.sub('', s)
+    s = _LONG_ID_RE.sub('', s)
+    # 去掉 JS 对象被字符串化后的占位文本
+    if '[' in s:
+        s = _OBJECT_TEXT_RE.sub('', s)
+    line_noise = bool(('页' in s and _LINE_PAGE_ZH_RE.search(s)) or _PAGE_EN_RE.search(s) or _LINE_HEX_RE.search(s))
+    return s, line_noise
+
+
+# 块分类关键词：按类别列出，导入时一次性构建为单遍扫描器（_BLOCK_SCANNER）
+_PERSONAL_KW = ['姓名', '性别', '手机', '电话', '微信', '邮箱', '年龄', '婚姻', '户籍', '居住地', '基本资料']
+_BLOCK_KEYWORDS = {
+    'project': ['项目', '项目经验', 'project', '实现', '功能', '优化', '技术栈', 'GitHub', '仓库', '负责', '实现了', '解决', '业绩', '项目描述', '项目名称', '成果', '完成'],
+    'education': ['学校', '学位', '毕业', '本科', '硕士', '博士', '专业'],
+    'work': ['公司', '任职', '职位', '职责', '负责', '工作内容'],
+    # 个人信息：score_block 中降权；personal_block 额外包含 目前公司/目前职位，用于跳过短的个人信息块
+    'personal': _PERSONAL_KW,
+    'personal_block': _PERSONAL_KW + ['目前公司', '目前职位'],
+    # 明显的项目指示词
+    'project_strong': ['业绩', '项目描述', '项目名称', '成果'],
+    # 教育优先判定、career 判定与 project 判定时使用的指示词
+    'education_indicator': ['大学', '学院', '学校', '本科', '硕士', '博士', '学位', '毕业', '培训经历', '培训机构', '培训'],
+    'career_hint': ['公司', '任职', '职位', '工作地点', '职责', '业绩'],
+    'project_hint': ['项目', '项目经验', '职责', '业绩', '完成', '负责'],
+}
+# 技术关键词（计数，等价于 findall 的不重叠命中次数）
+_TECH_TERMS = ['Python', 'Java', 'C++', 'C#', 'React', 'Django', 'Flask', 'Docker', 'Kubernetes', 'MySQL', 'PostgreSQL', 'SQL', 'FPGA', 'WiFi', 'BT', '5G', '4G', 'SMF', 'Golang', 'Go', 'OpenWrt', 'openwrt', 'FPGA', 'Ethernet']
+_BLOCK_SCANNER = KeywordScanner(_BLOCK_KEYWORDS, counted_terms=_TECH_TERMS)
+
+
+# 行标签（位标志）：清洗后的每一行只做一次分类，个人信息剥离、分块、块首元信息剥离、打分、
+# 碎片合并与教育经历回退都读取标签，不再对同一行重复正则匹配
+LINE_PERSONAL = 1 << 0          # 较短的个人信息行（年龄/性别/联系方式/户籍/现任职位等）
+LINE_SECTION = 1 << 1           # 章节标题行（分块边界）
+LINE_PROJECT_HEADER = 1 << 2    # 以项目经验/项目经历/项目开头
+LINE_EDUCATION_HEADER = 1 << 3  # 以教育经历/教育背景/教育开头
+LINE_CAREER_HEADER = 1 << 4     # 以工作经历/工作经验/职业经历/任职/公司开头
+LINE_COMPANY = 1 << 5           # 含公司/科技/集团/股份（公司行）
+LINE_META = 1 << 6              # 块首可剥离的短元信息行（姓名+性别、公司、职位、地点、时间段）
+LINE_PERIOD = 1 << 7            # 含年份日期（2019. / 2019- / 2019年）
+LINE_NUMBERED = 1 << 8          # 编号开头（1. / 1、 / 1.2. / (1) / （1））
+LINE_LIST_ITEM = 1 << 9         # 编号后紧跟空白的列表项（1. xxx）
+LINE_LIST_MARK = 1 << 10        # 整行只有编号（1. / 1、），与下一行构成列表项
+LINE_SCHOOL = 1 << 11           # 含学校/学位关键词
+
+_NOISE_PAGE_RE = re.compile(r'第\s*\d+\s*页|共\s*\d+\s*页|Page\s*\d+', re.I)
+_NOISE_HEX_RE = re.compile(r'[A-Fa-f0-9]{12,}')
+_NOISE_PUNCT_RE = re.compile(r'^[\W_~]+$')
+_WORD_CHAR_RE = re.compile(r'[\u4e00-\u9fffA-Za-z0-9]')
+_PERSONAL_LINE_RE = re.compile(
+    r'年龄[:：]?\s*\d{1,3}\b|^\s*(?:男|女)\s*$|性别[:：]|手机[:：]?|电话[:：]?|微信[:：]?|邮箱|@'
+    r'|户籍|居住地|婚姻|基本资料|目前公司|现公司|现任|目前职位|职位[:：]')
+SECTION_HEADERS = r'教育经历|教育背景|教育|项目经验|项目经历|项目|工作经历|工作经验|职业经历|实习经历|自我评价|主要技能|培训经历|培训'
+_SECTION_RE = re.compile(r'(?:' + SECTION_HEADERS + r')\b')
+_PROJECT_HEADER_RE = re.compile(r'(?:项目经验|项目经历|项目)\b', re.I)
+_EDUCATION_HEADER_RE = re.compile(r'(?:教育经历|教育背景|教育)\b', re.I)
+_CAREER_HEADER_RE = re.compile(r'(?:工作经历|工作经验|职业经历|任职|公司)\b', re.I)
+_COMPANY_LINE_RE = re.compile(r'公司|科技|集团|股份')
+# 元信息行：姓名+性别、公司/职位/地点/时间段关键词，或不超过 40 字符的纯词/分隔符短行
+_META_NAME_GENDER_RE = re.compile(r'[\u4e00-\u9fa5]{2,4}\s*(?:男|女)$')
+# 不使用 re.I（忽略大小写会关闭字面量前缀优化），Inc/LLC 的大小写变体直接写在字符类中
+_META_KEYWORD_RE = re.compile(r'有限|[Ii][Nn][Cc]|[Ll][Ll][Cc]|职位|软件|工程师|主管|责任|工作地点|至今|\d{4}[-年]')
+_META_SHORT_RE = re.compile(r'[\|/;\-\w\s]{1,40}$')
+# 各类标题行与编号行的首字符，首字符不符时跳过对应的匹配
+_HEADER_FIRST_CHARS = frozenset('教项工职实自主培任公')
+_NUMBERED_FIRST_CHARS = frozenset('0123456789(（')
+_PERIOD_RE = re.compile(r'\d{4}[\.\-年]')
+_NUMBERED_RE = re.compile(r'(?:\d+[\.、\)\-]|\d+\.?\d+\s*\.|\(\d+\)|（\d+）)')
+_LIST_ITEM_RE = re.compile(r'\d+[\.|\)|、](\s|$)')
+_SCHOOL_RE = re.compile(r'大学|学院|学校|本科|硕士|博士|学位')
+
+
+def _label_line(t: str) -> int:
+    """对一行已 strip 的非空文本分类，返回 LINE_* 位标志的组合。"""
+    labels = 0
+    short = len(t) < 120
+    if short and _PERSONAL_LINE_RE.search(t):
+        labels |= LINE_PERSONAL
+    if t[0] in _HEADER_FIRST_CHARS:
+        if _SECTION_RE.match(t):
+            labels |= LINE_SECTION
+        if _PROJECT_HEADER_RE.match(t):
+            labels |= LINE_PROJECT_HEADER
+        elif _EDUCATION_HEADER_RE.match(t):
+            labels |= LINE_EDUCATION_HEADER
+        elif _CAREER_HEADER_RE.match(t):
+            labels |= LINE_CAREER_HEADER
+    if _COMPANY_LINE_RE.search(t):
+        labels |= LINE_COMPANY
+    if short and (labels & LINE_COMPANY or (len(t) <= 40 and _META_SHORT_RE.match(t))
+                  or _META_KEYWORD_RE.search(t) or (t[-1] in '男女' and _META_NAME_GENDER_RE.match(t))):
+        labels |= LINE_META
+    if _PERIOD_RE.search(t):
+        labels |= LINE_PERIOD
+    if t[0] in _NUMBERED_FIRST_CHARS:
+        if _NUMBERED_RE.match(t):
+            labels |= LINE_NUMBERED
+        m = _LIST_ITEM_RE.match(t)
+        if m:
+            labels |= LINE_LIST_ITEM if m.group(1) else LINE_LIST_MARK
+    if _SCHOOL_RE.search(t):
+        labels |= LINE_SCHOOL
+    return labels
+
+
+def _is_noise_line(t: str, check_patterns: bool = True) -> bool:
+    """t 为已 strip 的非空行。check_patterns 为 False 时（全文已确认不含页码/十六进制串）只做纯符号与过短检查。"""
+    # 如果包含页码、长十六进制串（通常是导出残留或加密串）或是纯符号行，则跳过
+    if check_patterns and (_NOISE_PAGE_RE.search(t) or _NOISE_HEX_RE.search(t)):
+        return True
+    if _NOISE_PUNCT_RE.match(t) and len(t) > 4:
+        return True
+    # 如果行过短且不包含中文/字母数字，跳过
+    return len(t) < 4 and not _WORD_CHAR_RE.search(t)
+
+
+def label_lines(lines: List[str], line_noise: bool = True) -> Tuple[List[str], List[int]]:
+    """逐行去噪并打标签：丢弃页码、长十六进制串、纯符号及过短的无意义行，空行保留为 ''。
+    line_noise 为 normalize_resume_text 的第二个返回值。返回 (clean_lines, labels)，两者一一对应，行文本已 strip。"""
+    clean_lines: List[str] = []
+    labels: List[int] = []
+    for ln in lines:
+        t = ln.strip()
+        if not t:
+            clean_lines.append('')
+            labels.append(0)
+            continue
+        if _is_noise_line(t, line_noise):
+            continue
+        clean_lines.append(t)
+        labels.append(_label_line(t))
+    return clean_lines, labels
 
 
 @dataclass
@@ -55,6 +463,8 @@ class ResumeParseResult:
     # 结构化输出
     careers_struct: List[Dict[str, Any]] = field(default_factory=list)
     education_struct: List[Dict[str, Any]] = field(default_factory=list)
+    # 与之前某次上传近似重复时为那次上传的内容哈希（见 ResumeInputHandler 的近似重复检测）
+    duplicate_of: Optional[str] = None
     def to_dict(self) -> Dict[str, Any]:
         return {
             'name': self.name,
@@ -66,62 +476,241 @@ class ResumeParseResult:
             'careers_struct': self.careers_struct,
             'education': self.education,
             'education_struct': self.education_struct,
+            'duplicate_of': self.duplicate_of,
         }
 
 
-def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
+# 启发式结构化拆分（尽量提取 company/title/period/responsibilities/technologies）
+def split_career_block(block: str, ner_entities: Optional[List[Dict[str, Any]]] = None,
+                       result: Optional[ResumeParseResult] = None) -> Dict[str, Any]:
+    """把一个职业经历块拆分为 company/title/period/responsibilities/technologies。
+    ner_entities 为该块的 NER 结果；result 为所属简历的解析结果（可选），用于补全姓名、排除与年龄相同的日期。"""
+    lines = [l.strip() for l in block.splitlines() if l.strip()]
+    item: Dict[str, Any] = { 'company': None, 'title': None, 'period': None, 'responsibilities': [], 'technologies': [] }
+    if not lines:
+        return item
+    # 第一行若包含公司关键词，则作为 company 或 title
+    first = lines[0]
+    # 清理 company 字段：去掉页码/长随机串/重复标记等噪声
+    def clean_company_name(name: str) -> str:
+        if not name:
+            return None
+        n = name.strip()
+        # 删除明显的页码/页眉标记
+        n = re.sub(r'第\s*\d+\s*页\s*共\s*\d+\s*页', '', n)
+        n = re.sub(r'第\s*\d+\s*页', '', n)
+        # 删除长混合 ID
+        n = re.sub(r'[A-Za-z0-9_\-]{12,}', '', n)
+        # 删除重复的分隔符和不可见字符
+        n = re.sub(r'[~]{2,}', '', n)
+        n = n.replace('\u200b', '')
+        n = n.strip()
+        return n or None
+
+    if re.search(r'公司|有限公司|科技|集团|股份', first):
+        item['company'] = clean_company_name(first)
+        rest = lines[1:]
+    else:
+        # 尝试用行内模式提取 title 与 company
+        # 例如: "哲库（ZEKU）科技上海有限公司\n软件开发（高级主管工程师） 2022.12-至今"
+        if len(lines) > 1 and re.search(r'\d{4}', lines[1]):
+            item['company'] = first
+            rest = lines[1:]
+        else:
+            rest = lines
+
+    # 查找 period（形如 2022.12-至今 或 2018.09-2021.09）
+    period_re = re.compile(r'(\d{4}[\.\-年]?\d{0,2})\s*[-—–到至]\s*(\d{4}[\.\-年]?\d{0,2}|至今)', re.I)
+    title_re = re.compile(r'(职位|职务|软件|工程师|主管|经理|技术|开发|负责人|专家)', re.I)
+    # 技术栈：技能词表中的名称/同义词，输出规范 id（见 SkillTaxonomy）
+    skills = get_skill_taxonomy()
+    # ner_entities 为整个块的 NER 结果（由 ResumeParse 批量推理后传入），用于获取 ORG/DATE/PER 提示并优先采用
+
+    # 解析 NER 输出，尽可能保留 offset(start/end)以便合并相邻实体
+    ner_orgs: List[Dict[str, Any]] = []
+    ner_pers: List[Dict[str, Any]] = []
+    ner_dates: List[Dict[str, Any]] = []
+    if ner_entities:
+        for ent in ner_entities:
+            g = (ent.get('entity_group') or ent.get('entity') or '').upper()
+            w = (ent.get('word') or ent.get('entity') or '').strip()
+            if not w:
+                continue
+            start = ent.get('start')
+            end = ent.get('end')
+            rec = {'word': w, 'start': start, 'end': end}
+            if g in ('ORG', 'ORGANIZATION'):
+                ner_orgs.append(rec)
+            elif g in ('PER', 'PERSON'):
+                ner_pers.append(rec)
+            elif g in ('DATE', 'TIME'):
+                ner_dates.append(rec)
+
+    # helper to sort by start if available else keep original order
+    def _sort_by_start(lst: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not lst:
+            return lst
+        if all(x.get('start') is not None for x in lst):
+            return sorted(lst, key=lambda x: x['start'])
+        return lst
+
+    ner_orgs = _sort_by_start(ner_orgs)
+    ner_pers = _sort_by_start(ner_pers)
+    ner_dates = _sort_by_start(ner_dates)
+
+    # company: 选择最长的 ORG（排除过短的噪声）
+    if ner_orgs:
+        cand = [o['word'] for o in ner_orgs if len(re.sub(r'\s+', '', o['word'])) > 1]
+        if cand:
+            cand = sorted(cand, key=lambda x: len(x), reverse=True)
+            item['company'] = clean_company_name(cand[0])
+
+    # name: 首个 PER
+    if ner_pers and result is not None and not result.name:
+        result.name = ner_pers[0]['word']
+
+    # period: 合并相邻的 DATE 实体为一个 period 字符串
+    if ner_dates:
+        merged_dates: List[str] = []
+        if all(d.get('start') is not None for d in ner_dates):
+            # 使用 start/end 进行合并：当相邻实体间距很小（例如 <=2）视为同一日期片段
+            cur = ner_dates[0].copy()
+            for nxt in ner_dates[1:]:
+                if cur.get('end') is not None and nxt.get('start') is not None and (nxt['start'] - cur['end'] <= 2):
+                    # 合并
+                    cur['word'] = cur['word'] + nxt['word']
+                    cur['end'] = nxt.get('end')
+                else:
+                    merged_dates.append(cur['word'])
+                    cur = nxt.copy()
+            merged_dates.append(cur['word'])
+        else:
+            # 没有偏移信息，按顺序合并连续的数字/年/月/token序列
+            buf = ner_dates[0]['word']
+            for rec in ner_dates[1:]:
+                w = rec['word']
+                # 如果当前 buf 或 w 包含中文年/月或 '.' 或 '-'，把它们合并
+                if re.search(r'[年月/\.-]', buf) or re.search(r'[年月/\.-]', w) or (len(w) <= 4 and w.isdigit() and len(buf) <= 6):
+                    buf = buf + w
+                else:
+                    merged_dates.append(buf)
+                    buf = w
+            merged_dates.append(buf)
+
+        # 过滤掉明显是年龄（例如单个数字 28 且与 result.age 相等）的候选
+        cleaned_md = []
+        for md in merged_dates:
+            md_clean = re.sub(r'[^0-9年月日/\.-]', '', md)
+            if result is not None and result.age and re.fullmatch(r'\d{1,3}', md_clean) and md_clean == str(result.age):
+                continue
+            cleaned_md.append(md)
+        if cleaned_md:
+            if len(cleaned_md) == 1:
+                item['period'] = cleaned_md[0]
+            else:
+                item['period'] = ' - '.join(cleaned_md)
+
+    for ln in rest:
+        # period
+        pm = period_re.search(ln)
+        if pm and not item['period']:
+            item['period'] = pm.group(0)
+            continue
+        # title
+        if not item['title'] and title_re.search(ln):
+            item['title'] = ln
+            continue
+        # techs
+        item['technologies'].extend(skills.Match(ln))
+        # responsibilities（非标题/时间行则归为职责）
+        if not title_re.search(ln) and not period_re.search(ln):
+            item['responsibilities'].append(ln)
+
+    # 简单去重
+    item['technologies'] = list(dict.fromkeys(item['technologies']))
+    # 进一步标准化 company 名称
+    if item.get('company'):
+        item['company'] = clean_company_name(item['company'])
+    return item
+
+
+def _copy_career_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: list(v) if isinstance(v, list) else v for k, v in item.items()}
+
+
+def _split_career_block_memo(block: str, ner_entities: Optional[List[Dict[str, Any]]],
+                             result: ResumeParseResult) -> Dict[str, Any]:
+    """split_career_block 的块级记忆化：结果只取决于块文本、NER 实体、result.age 与技能词表；
+    对 result 的唯一副作用（用首个 PER 补全姓名）随结果一起缓存并重放。返回值可以被调用方修改。"""
+    fingerprint = repr([(e.get('entity_group'), e.get('entity'), e.get('word'), e.get('start'), e.get('end'))
+                        for e in ner_entities or []])
+    key = block_key(block, str(result.age), fingerprint, get_skill_taxonomy().version)
+    cached = _BLOCK_MEMO.Get('career', key)
+    if cached is None:
+        probe = ResumeParseResult(age=result.age)
+        item = split_career_block(block, ner_entities, probe)
+        cached = (_copy_career_item(item), probe.name or '')
+        _BLOCK_MEMO.Put('career', key, cached)
+    else:
+        item = _copy_career_item(cached[0])
+    if cached[1] and not result.name:
+        result.name = cached[1]
+    return item
+
+
+def ResumeParse(text: str, debug: bool = False, trace: bool = False, mode: str = PARSE_MODE_ACCURATE):
     """根据块分类启发式从简历文本中提取 name, age, phone, education，以及工作/项目类信息合并在 careers 中。
         it2_clean = re.sub(r'[^\u4e00-\u9fa5A-Za-z0-9]', '', it2)
     返回 ResumeParseResult 实例。
+    mode 为 PARSE_MODE_ACCURATE（默认）或 PARSE_MODE_FAST（不使用 NER 与 jieba，机构名由词表识别）。
+    trace=True 时返回 (result, spans)，spans 为各阶段耗时 [{'name', 'ms', 'calls'}, ...]；
+    无论是否返回，分阶段耗时都会以 DEBUG 级别记录，超过慢解析阈值的输入会脱敏后写入回放目录（见 ParseTrace）。
     """
+    if mode not in PARSE_MODES:
+        raise ValueError(f'unknown parse mode: {mode}')
+    tracer = ParseTrace()
+    result = _resume_parse(text, debug, tracer, mode)
+    spans = tracer.Finish()
+    PARSE_SECONDS.Observe(tracer.total_ms / 1000)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('ResumeParse %.1f ms: %s', tracer.total_ms, format_spans(spans))
+    if text:
+        capture_slow_parse(text, tracer, names=[result.name] if result.name else None,
+                           meta={'parser_version': parser_version_tag(mode)})
+    return (result, spans) if trace else result
+
+
+def _resume_parse(text: str, debug: bool, tracer: ParseTrace, mode: str = PARSE_MODE_ACCURATE) -> ResumeParseResult:
     if not text or not text.strip():
         return ResumeParseResult()
+    fast = mode == PARSE_MODE_FAST
+    use_jieba = _HAS_JIEBA and not fast
 
-    s = _normalize(text)
-    # 先规范中文间的空格（把 '工 作 经 历' 之类的拆分恢复为连写）
-    s = normalize_cjk_spacing(s)
-    # 先清洗常见噪声：页眉/页脚（第1页共7页 等）、长的十六进制或重复编码串、纯符号行等
-    # 删除典型的页码标记
-    s = re.sub(r'第\s*\d+\s*页\s*共\s*\d+\s*页', '', s)
-    s = re.sub(r'第\s*\d+\s*页', '', s)
-    s = re.sub(r'共\s*\d+\s*页', '', s)
-    s = re.sub(r'Page\s*\d+', '', s, flags=re.I)
-    # 去掉长的十六进制/随机串（例如 OCR/导出残留）
-    s = re.sub(r'[A-Fa-f0-9]{16,}', '', s)
-    # 去掉连续的 ~ 或特殊分隔符
-    s = re.sub(r'~{2,}', '', s)
-    # 去掉常见的导出/黏贴残留的长混合字母数字ID，例如 "XV639S5FVpSwJG7U_yfRearmg"
-    # 匹配长度较长(12+) 的字母数字下划线或连字符序列
-    s = re.sub(r"\b[A-Za-z0-9_\-]{12,}\b", '', s)
-    # 去掉 JS 对象被字符串化后的占位文本
-    s = re.sub(r'\[object Object\]', '', s, flags=re.I)
-
-    # 按行过滤明显噪声行
-    lines = [ln for ln in s.splitlines()]
-    clean_lines = []
-    long_hex_re = re.compile(r'[A-Fa-f0-9]{12,}')
-    page_re = re.compile(r'第\s*\d+\s*页|共\s*\d+\s*页|Page\s*\d+', re.I)
-    punct_re = re.compile(r'^[\W_~]+$')
-    for ln in lines:
-        t = ln.strip()
-        if not t:
-            clean_lines.append('')
-            continue
-        # 如果包含页码、长十六进制串或是纯符号行，则跳过
-        if page_re.search(t):
-            continue
-        if long_hex_re.search(t):
-            # 这一类通常是导出残留或加密串，丢弃
-            continue
-        if punct_re.match(t) and len(t) > 4:
-            continue
-        # 如果行过短且不包含中文/字母数字，跳过
-        if len(t) < 4 and not re.search(r'[\u4e00-\u9fffA-Za-z0-9]', t):
-            continue
-        clean_lines.append(t)
+    tracer.Stage('noise_cleanup')
+    # 规范化并清洗常见噪声：页眉/页脚（第1页共7页 等）、长的十六进制或重复编码串等
+    s, line_noise = normalize_resume_text(text)
+    # 按行过滤明显噪声行，并一次性给每行打上分类标签
+    clean_lines, line_labels = label_lines(s.splitlines(), line_noise)
 
+    tracer.Stage('header_extraction')
     # 在分块前，先从清洗后的前几行中尝试提取姓名（以保留原始header信息用于姓名提取）
-    header_candidate = '\n'.join([ln for ln in clean_lines if ln.strip()][:6])
+    header_line_idx = [i for i, ln in enumerate(clean_lines) if ln.strip()][:6]
+    header_candidate = '\n'.join(clean_lines[i] for i in header_line_idx)
+
+    # jieba 分词/词性标注对整篇清洗后文本只做一次（首次使用时），姓名识别与块打分按偏移区间查询
+    doc_lines = list(clean_lines)
+    segmented: Optional[_SegmentedDocument] = None
+    segmented_done = False
+    def get_segmented() -> Optional[_SegmentedDocument]:
+        nonlocal segmented, segmented_done
+        if not segmented_done:
+            segmented_done = True
+            if use_jieba:
+                try:
+                    segmented = _SegmentedDocument(doc_lines)
+                except Exception:
+                    segmented = None
+        return segmented
 
     # 有时 header 是多项由 | 或 / 分隔的短项（例如: "男 | 年龄：28岁 | 13558910629 | 期望薪资"）
     # 把这些行拆分并把能识别的个人信息剥离
@@ -136,8 +725,8 @@ def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
     # 初始化结果对象（确保 header 处理可以直接写入字段）
     result = ResumeParseResult()
 
-    # 把 header_items 里的个人域识别出来并从 clean_lines 中移除相应短行
-    personal_short_re = re.compile(r'^(男|女|\d{1,3}岁|\+?\d{6,15}|\d{6,}|[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})$', re.I)
+    # 把 header_items 里的个人域识别出来，与之完全相同的行稍后不参与分块
+    removed_lines = set()
     # 先从 header_items 中直接识别联系方式/年龄/性别等，并优先设置 result 的字段
     for it in header_items:
         if not it:
@@ -147,94 +736,25 @@ def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
         m_mobile = re.search(r'(?<!\d)(?:\+?86[-\s]?)?(1[3-9]\d{9})(?!\d)', it_strip)
         if m_mobile:
             result.phone = m_mobile.group(1)
-            # 从 clean_lines 中移除
-            clean_lines = [ln for ln in clean_lines if ln.strip() != it_strip]
+            removed_lines.add(it_strip)
             continue
         # email
         if re.search(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}', it_strip):
             result.email = re.search(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}', it_strip).group(0)
-            clean_lines = [ln for ln in clean_lines if ln.strip() != it_strip]
+            removed_lines.add(it_strip)
             continue
         # 年龄
         age_m_h = re.search(r'(\d{2})岁|年龄[:：]?\s*(\d{1,3})', it_strip)
         if age_m_h:
             age_val = age_m_h.group(1) or age_m_h.group(2)
             result.age = age_val
-            clean_lines = [ln for ln in clean_lines if ln.strip() != it_strip]
+            removed_lines.add(it_strip)
             continue
         # 性别
         if re.match(r'^(男|女)$', it_strip):
             result.sex = it_strip
-            clean_lines = [ln for ln in clean_lines if ln.strip() != it_strip]
+            removed_lines.add(it_strip)
             continue
-    # 如果 header_items 没设置 name，在 header_candidate 中寻找候选姓名（排除诸如'年龄'等词）
-    result = ResumeParseResult() if 'result' not in locals() else result
-    stop_words_for_name = set(['年龄', '性别', '个人优势', '求职意向', '期望薪资', '期望城市', '工作经验'])
-    candidate_name = None
-    # 优先使用 transformers NER 在 header_candidate 上识别人名 (PER)
-    if _USE_TRANSFORMERS_NER:
-        try:
-            ner_pipe = _get_ner_pipeline()
-            if ner_pipe and header_candidate and re.search(r'[\u4e00-\u9fffA-Za-z]', header_candidate):
-                try:
-                    ents = ner_pipe(header_candidate)
-                except Exception:
-                    ents = []
-                # ents 可能为 [{'entity_group':'PER','word':'张三',...}, ...] 或 transformers 早期格式
-                if ents:
-                    for ent in ents:
-                        g = (ent.get('entity_group') or ent.get('entity') or '').upper()
-                        w = (ent.get('word') or ent.get('entity') or '').strip()
-                        if not w:
-                            continue
-                        if g in ('PER', 'PERSON', '人名'):
-                            # 优先接受 2-4 个汉字或常见 latin 名称（含空格或 .），避免把职位/公司误识别
-                            clean_w = re.sub(r'[^\u4e00-\u9fa5A-Za-z\s\.-]', '', w)
-                            # 验证 NER 输出不是乱码（例如包含替换字符）且至少含有合理汉字或英文字母
-                            if '\ufffd' in clean_w:
-                                continue
-                            if re.fullmatch(r'[\u4e00-\u9fa5]{2,4}', clean_w) or re.fullmatch(r'[A-Za-z\s\.-]{2,40}', clean_w):
-                                candidate_name = clean_w.strip()
-                                break
-        except Exception:
-            # 不阻塞，继续使用后续启发式方法
-            pass
-    # 优先从 header_items 中找纯中文 2-4 字项（可能含性别尾缀）
-    for it in header_items:
-        if not it:
-            continue
-        it2 = it.strip()
-        if any(sw in it2 for sw in stop_words_for_name):
-            continue
-        # 清理常见噪声
-        it2_clean = re.sub(r'[^-\u4e00-\u9fa5]', '', it2)
-        # 优先选择纯中文且长度为2-4的项
-        if re.fullmatch(r'[\u4e00-\u9fa5]{2,4}', it2_clean):
-            candidate_name = it2_clean
-            break
-    # 如果未找到且可用 jieba，尝试 posseg 在 header_candidate 上找 nr
-    if not candidate_name and _HAS_JIEBA and re.search(r'[\u4e00-\u9fff]', header_candidate):
-        try:
-            for w, flag in pseg.cut(header_candidate):
-                if flag == 'nr' and 2 <= len(w) <= 4 and w not in stop_words_for_name:
-                    candidate_name = w
-                    break
-        except Exception:
-            pass
-
-    # 如果找到候选姓名，写入 result
-    if candidate_name:
-        result.name = candidate_name
-
-    # 最后的回退：如果仍未识别到姓名，从 header_candidate 或全文抓取第一个符合姓名模式的中文词
-    if not result.name:
-        m = re.search(r'([\u4e00-\u9fa5]{2,4})\s*(?:男|女)?', header_candidate)
-        if m:
-            result.name = m.group(1)
-        else:
-            m2 = re.search(r'([\u4e00-\u9fa5]{2,4})\s*(?:男|女)?', s)
-            if m2:
-                result.name = m2.group(1)
 
     # 如果之前未通过 header_items 设置到 phone/email/age/sex，则后面再做更严格的提取
 
@@ -273,79 +793,50 @@ def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
         else:
             result.sex = sex
 
-    # 现在从清洗后的行里剥离明显的个人信息行，避免它们被当作工作/项目块
-    personal_line_re_list = [
-        re.compile(r'年龄[:：]?\s*\d{1,3}\b', re.I),
-        re.compile(r'^\s*(男|女)\s*$', re.I),
-        re.compile(r'性别[:：]', re.I),
-        re.compile(r'手机[:：]?|电话[:：]?|微信[:：]?', re.I),
-        re.compile(r'邮箱|@', re.I),
-        re.compile(r'户籍|居住地|婚姻|基本资料', re.I),
-        re.compile(r'目前公司|现公司|现任|目前职位|职位[:：]', re.I),
-    ]
-
-    filtered_lines = []
-    for ln in clean_lines:
-        t = ln.strip()
-        if not t:
-            filtered_lines.append('')
-            continue
-        # 如果这一行明显是个人信息且长度较短（通常是 header 行），则剥离掉
-        is_personal = False
-        for cre in personal_line_re_list:
-            if cre.search(t) and len(t) < 120:
-                is_personal = True
-                break
-        if is_personal:
-            # 跳过这类行，不加入用于块分割的文本
-            continue
-        filtered_lines.append(t)
-
-    s_clean = '\n'.join(filtered_lines)
-
-    # 优先按常见章节标题划分块，避免教育/项目/工作混在一块
-    header_patterns = [
-        r'^\s*教育经历\s*$', r'^\s*教育背景\s*$', r'^\s*教育\s*$',
-        r'^\s*项目经验\s*$', r'^\s*项目经历\s*$', r'^\s*项目\s*$',
-        r'^\s*工作经历\s*$', r'^\s*工作经验\s*$', r'^\s*职业经历\s*$',
-        r'^\s*实习经历\s*$', r'^\s*自我评价\s*$', r'^\s*主要技能\s*$', r'^\s*培训经历\s*$',
-    ]
-    header_re = re.compile('|'.join('(?:%s)' % p for p in header_patterns), re.I)
-
-    # 更稳健的块拆分：基于章节 header 关键词把文本拆分为多个块（保留 header 行）
-    split_headers = r'教育经历|教育背景|教育|项目经验|项目经历|项目|工作经历|工作经验|职业经历|实习经历|自我评价|主要技能|培训经历|培训'
-    # 使用多行模式，在 header 前进行拆分（保留 header 行作为新块首行）
-    blocks = [b.strip() for b in re.split(r'(?m)(?=^\s*(?:' + split_headers + r')\b)', s_clean) if b.strip()]
-    # 进一步，如果某个块本身为空，删除
-    blocks = [b for b in blocks if b]
-
-    # 如果某些块中间仍包含公司行或 '公司名 职位' 形式，把这些块按行拆分为更小块，
+    # 现在从清洗后的行里剥离明显的个人信息行（LINE_PERSONAL），避免它们被当作工作/项目块；
+    # 之后的块均以 clean_lines 的行下标列表表示，需要文本时再拼接
+    body_idx = [i for i, t in enumerate(clean_lines)
+                if not t or not (line_labels[i] & LINE_PERSONAL or t in removed_lines)]
+
+    def trim(idx: List[int]) -> List[int]:
+        # 去掉首尾空行（等价于对拼接后的文本 strip）
+        a, b = 0, len(idx)
+        while a < b and not clean_lines[idx[a]]:
+            a += 1
+        while b > a and not clean_lines[idx[b - 1]]:
+            b -= 1
+        return idx[a:b]
+
+    def block_text(idx: List[int]) -> str:
+        return '\n'.join(clean_lines[i] for i in idx)
+
+    tracer.Stage('block_split')
+    # 更稳健的块拆分：在章节标题行（LINE_SECTION）前拆分为多个块（保留标题行作为块首行）
+    sections: List[List[int]] = [[]]
+    for i in body_idx:
+        if line_labels[i] & LINE_SECTION and sections[-1]:
+            sections.append([])
+        sections[-1].append(i)
+
+    # 如果某些块中间仍包含公司行或 '公司名 职位' 形式，把这些块在公司行（非块首行）前拆分为更小块，
     # 以便公司行能作为独立块被识别为 career 的起始
-    company_line_re = re.compile(r'^[\s\S]*?(公司|有限公司|科技|集团|股份)[\s\S]*$', re.I)
-    refined_blocks = []
-    for b in blocks:
-        lines = [ln for ln in b.splitlines()]
-        # 如果某行匹配公司行且不是块首行，则切分
-        split_indices = []
-        for idx, ln in enumerate(lines):
-            if idx > 0 and company_line_re.match(ln.strip()):
-                split_indices.append(idx)
-        if not split_indices:
-            refined_blocks.append(b)
-            continue
+    blocks: List[List[int]] = []
+    for sec in sections:
+        sec = trim(sec)
         prev = 0
-        for si in split_indices:
-            part = '\n'.join(lines[prev:si]).strip()
-            if part:
-                refined_blocks.append(part)
-            prev = si
-        last = '\n'.join(lines[prev:]).strip()
+        for k in range(1, len(sec)):
+            if line_labels[sec[k]] & LINE_COMPANY:
+                part = trim(sec[prev:k])
+                if part:
+                    blocks.append(part)
+                prev = k
+        last = trim(sec[prev:])
         if last:
-            refined_blocks.append(last)
-    blocks = refined_blocks
+            blocks.append(last)
 
 
 
+    tracer.Stage('header_extraction')
     # phone 和 age
     # email
     email_m = re.search(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}', s)
@@ -380,28 +871,23 @@ def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
             except Exception:
                 pass
 
-    # 关键词
-    project_kw = [r'项目', r'项目经验', r'project', r'实现', r'功能', r'优化', r'技术栈', r'GitHub', r'仓库', r'负责', r'实现了', r'解决', r'业绩', r'项目描述', r'项目名称', r'成果', r'完成']
-    education_kw = [r'学校', r'学位', r'毕业', r'本科', r'硕士', r'博士', r'专业']
-    work_kw = [r'公司', r'任职', r'职位', r'职责', r'负责', r'工作内容']
-    tech_regex = re.compile(r'\b(Python|Java|C\+\+|C#|React|Django|Flask|Docker|Kubernetes|MySQL|PostgreSQL|SQL|FPGA|WiFi|BT|5G|4G|SMF|Golang|Go|OpenWrt|openwrt|FPGA|Ethernet)\b', re.I)
-
-    def score_block(block: str) -> Dict[str, int]:
-        p = e = w = 0
-        for kw in project_kw:
-            if re.search(kw, block, re.I):
-                p += 2
-        for kw in education_kw:
-            if re.search(kw, block, re.I):
-                e += 3
-        for kw in work_kw:
-            if re.search(kw, block, re.I):
-                w += 2
-        tech_count = len(tech_regex.findall(block))
+    tracer.Stage('scoring')
+    def score_block(block: str, scan: Optional[KeywordScan] = None, idx: Optional[List[int]] = None) -> Dict[str, int]:
+        # idx 为块对应的行下标，给出时编号列表判断直接读取行标签
+        if scan is None:
+            scan = _BLOCK_SCANNER.scan(block)
+        p = 2 * scan.count('project')
+        e = 3 * scan.count('education')
+        w = 2 * scan.count('work')
+        tech_count = scan.term_count
+        # fast 模式以词表/后缀规则识别到的公司名代替 jieba 的组织名 (nt)，增强工作得分
+        if fast:
+            w += 2 * sum(1 for _, kind, _, _ in get_gazetteer().Match(block) if kind == 'company')
         # 如果可用 jieba，对于中文文本，检测组织名 (nt) 增强工作得分
-        if _HAS_JIEBA and re.search(r'[\u4e00-\u9fff]', block):
+        elif use_jieba and re.search(r'[\u4e00-\u9fff]', block):
             try:
-                for word, flag in pseg.cut(block):
+                seg = get_segmented()
+                for word, flag, _, _ in (seg.tokens_for_text(block) if seg else []):
                     if flag == 'nt':
                         w += 2
                     # 人名在某些情况下提示该块可能为职责或项目的一部分
@@ -411,281 +897,114 @@ def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
                 pass
         p += tech_count
         # 如果块中包含明显的个人信息（电话/邮箱/年龄/性别），对其进行惩罚，避免误判为工作/项目
-        if re.search(r'(姓名|性别|手机|电话|微信|邮箱|年龄|婚姻|户籍|居住地|基本资料)', block, re.I):
+        if scan.has('personal'):
             w = max(0, w - 2)
             p = max(0, p - 2)
         # 如果块包含 '业绩' 或 '项目描述' 等明显的项目指示词，提高 project 得分
-        if re.search(r'(业绩|项目描述|项目名称|成果)', block, re.I):
+        if scan.has('project_strong'):
             p += 3
         # 如果块含有编号列表且出现技术关键词，则很可能是项目经历/项目说明
-        if re.search(r'(?m)^\s*\d+[\.|\)|、]\s+', block) and tech_count > 0:
+        if idx is None:
+            has_list = bool(re.search(r'(?m)^\s*\d+[\.|\)|、]\s+', block))
+        else:
+            # 只有编号的一行后面紧跟换行，同样构成列表项（块的最后一行除外）
+            has_list = any(line_labels[i] & LINE_LIST_ITEM or (line_labels[i] & LINE_LIST_MARK and i != idx[-1])
+                           for i in idx)
+        if has_list and tech_count > 0:
             p += 3
         return {"project": p, "education": e, "work": w}
 
-    # 只把满足一定条件的块归为 projects/education，过滤残余噪声块
-    def strip_leading_meta_lines(block: str) -> str:
-        """去掉块开头的短个人/公司/职位元信息行，例如：姓名+性别、公司名、职位行、工作地点等。"""
-        lines = [l for l in block.splitlines() if l.strip()]
-        if not lines:
+    def classify_block(block: str, idx: List[int]) -> str:
+        """块的归类：'education'、'career'（职业/项目经历）或 ''（个人信息块/非目标块，忽略）。
+        只取决于块文本（行标签与分词都按行计算）以及 jieba 是否可用（fast 模式下为词表），因此按块内容记忆化。"""
+        # 单遍扫描块内所有类别的关键词，后续打分与归类都读取这一结果
+        scan = _BLOCK_SCANNER.scan(block)
+        # 如果块明显包含个人信息关键词且内容较短，跳过（避免被误判为工作经历）
+        if scan.has('personal_block') and len(block) < 200:
             return ''
-        # 模式：姓名+性别（如 蒋大伟男）
-        name_gender_re = re.compile(r'^[\u4e00-\u9fa5]{2,4}\s*(男|女)$')
-        # 公司行模式（含 公司 有限公司 科技 集团 等）
-        company_re = re.compile(r'(公司|有限公司|科技|集团|股份|有限|Inc|LLC)', re.I)
-        # 职位/职称/工作地点/时间段 行
-        title_re = re.compile(r'(职位|软件|工程师|主管|责任|工作地点|至今|\d{4}[-年])', re.I)
-
-        # 连续剥离前几行，只要它们匹配元信息模式且较短
-        i = 0
-        while i < len(lines) and i < 4:
-            ln = lines[i].strip()
-            # 对于非常短的 header-like 行（例如 '男 | 28岁' 或 '公司名'），也应剥离
-            if len(ln) < 120 and (name_gender_re.search(ln) or company_re.search(ln) or title_re.search(ln) or re.search(r'^[\|/;\-\w\s]{1,40}$', ln)):
-                i += 1
-                continue
-            break
-        if i > 0:
-            return '\n'.join(lines[i:]).strip()
-        return block
+        # 如果块中包含学校/学院/大学/本科/硕士/学位/培训等关键词，优先判为 education
+        if scan.has('education_indicator'):
+            return 'education'
+        sc = score_block(block, scan, idx)
+        # 判为 career（职业/公司经历）：包含公司/任职/职位/工作地点等关键词且篇幅较长
+        if (sc['work'] >= 2 or scan.has('career_hint')):
+            return 'career'
+        # 要判为 education，需要 education 特征明显（放在 career 检测之后，避免混淆）
+        if sc['education'] >= 3:
+            return 'education'
+        # 判为 project 的额外要求：要么有项目关键词/职责/业绩等，要么包含技术关键词；项目并入 careers
+        has_project_keywords = scan.has('project_hint')
+        tech_count = scan.term_count
+        if (sc['project'] >= 2 and (has_project_keywords or tech_count > 0)):
+            return 'career'
+        # 其余视为非目标块，忽略
+        return ''
 
-    # 预编译标题匹配用于直接归类
-    project_header_re = re.compile(r'^(项目经验|项目经历|项目)\b', re.I)
-    education_header_re = re.compile(r'^(教育经历|教育背景|教育)\b', re.I)
-    career_header_re = re.compile(r'^(工作经历|工作经验|职业经历|任职|公司)\b', re.I)
+    # 只把满足一定条件的块归为 projects/education，过滤残余噪声块
+    def strip_leading_meta_lines(idx: List[int]) -> List[int]:
+        """去掉块开头的短个人/公司/职位元信息行（LINE_META），例如：姓名+性别、公司名、职位行、工作地点等。"""
+        lines = [i for i in idx if clean_lines[i]]
+        # 连续剥离前几行（最多 4 行），只要它们是元信息行
+        k = 0
+        while k < len(lines) and k < 4 and line_labels[lines[k]] & LINE_META:
+            k += 1
+        if k > 0:
+            return lines[k:]
+        return idx
 
     if debug:
         print('\n[DEBUG] Found blocks:')
-        for i, b in enumerate(blocks):
+        for i, b_idx in enumerate(blocks):
+            b = block_text(b_idx)
             snippet = b.replace('\n', ' || ')[:200]
-            sc_tmp = score_block(b)
+            sc_tmp = score_block(b, idx=b_idx)
             print(f'  [{i}] len={len(b)} score={sc_tmp} header={b.splitlines()[0] if b.splitlines() else ""}')
             print('    ', snippet)
 
-    for block in blocks:
+    # 与 result.careers 一一对应的首行下标，供碎片合并读取首行标签
+    career_heads: List[int] = []
+    for b_idx in blocks:
         # 如果块以项目/教育标题开头，直接归类，避免关键字稀释或误判
-        first_line = block.splitlines()[0].strip() if block.splitlines() else ''
+        head = b_idx[0]
+        first_line = clean_lines[head]
         # 如果首行看起来像公司名（例如包含 公司/有限公司/科技/集团/股份），直接归类为 career
-        if re.search(r'(公司|有限公司|科技|集团|股份)', first_line, re.I):
-            body = '\n'.join(block.splitlines()[1:]).strip()
+        if line_labels[head] & LINE_COMPANY:
+            body = block_text(trim(b_idx[1:]))
             # 把公司行与后续正文合并，便于后续的结构化解析识别 company/title/period
             if body:
                 career_text = first_line + '\n' + body
             else:
                 career_text = first_line
-            if career_text:
-                result.careers.append(career_text)
-            continue
-        if project_header_re.match(first_line):
-            # 去掉标题行后保存作为一个 careers 条目（把项目经验并入 careers）
-            body = '\n'.join(block.splitlines()[1:]).strip()
-            if body:
-                result.careers.append(body)
+            result.careers.append(career_text)
+            career_heads.append(head)
             continue
-        if education_header_re.match(first_line):
-            body = '\n'.join(block.splitlines()[1:]).strip()
+        if line_labels[head] & (LINE_PROJECT_HEADER | LINE_EDUCATION_HEADER | LINE_CAREER_HEADER):
+            # 去掉标题行：项目经验与职业/公司经历作为 careers 条目（把项目经验并入 careers），教育作为 education 条目
+            body = trim(b_idx[1:])
             if body:
-                result.education.append(body)
-            continue
-        if career_header_re.match(first_line):
-            # 去掉标题行，整块作为 career 条目（职业/公司经历）
-            body = '\n'.join(block.splitlines()[1:]).strip()
-            if body:
-                result.careers.append(body)
+                if line_labels[head] & LINE_EDUCATION_HEADER:
+                    result.education.append(block_text(body))
+                else:
+                    result.careers.append(block_text(body))
+                    career_heads.append(body[0])
             continue
         # 先剥离块前面的元信息行
-        block = strip_leading_meta_lines(block)
-        if not block:
-            continue
-        # 如果块明显包含个人信息关键词且内容较短，跳过（避免被误判为工作经历）
-        personal_block_re = re.compile(r'(姓名|性别|手机|电话|微信|邮箱|年龄|婚姻|户籍|居住地|基本资料|目前公司|目前职位)', re.I)
-        if personal_block_re.search(block) and len(block) < 200:
-            continue
-
-        sc = score_block(block)
-        # 如果块中包含学校/学院/大学/本科/硕士/学位/培训等关键词，优先判为 education
-        education_indicators = re.compile(r'(大学|学院|学校|本科|硕士|博士|学位|毕业|培训经历|培训机构|培训)', re.I)
-        if education_indicators.search(block):
-            result.education.append(block)
+        b_idx = strip_leading_meta_lines(b_idx)
+        if not b_idx:
             continue
-        # 判为 career（职业/公司经历）：包含公司/任职/职位/工作地点等关键词且篇幅较长
-        if (sc['work'] >= 2 or re.search(r'公司|任职|职位|工作地点|职责|业绩', block, re.I)):
-            result.careers.append(block)
-            continue
-        # 要判为 education，需要 education 特征明显（放在 career 检测之后，避免混淆）
-        if sc['education'] >= 3:
+        block = block_text(b_idx)
+        memo_key = block_key(block, f'fast:{get_gazetteer().version}' if fast else 'jieba' if use_jieba else '')
+        category = _BLOCK_MEMO.Get('classify', memo_key)
+        if category is None:
+            category = classify_block(block, b_idx)
+            _BLOCK_MEMO.Put('classify', memo_key, category)
+        if category == 'education':
             result.education.append(block)
-            continue
-
-        # 判为 project 的额外要求：要么有项目关键词/职责/业绩等，要么包含技术关键词
-        has_project_keywords = any(re.search(kw, block, re.I) for kw in [r'项目', r'项目经验', r'职责', r'业绩', r'完成', r'负责'])
-        tech_count = len(tech_regex.findall(block))
-        if (sc['project'] >= 2 and (has_project_keywords or tech_count > 0)):
-            # 明确为项目段，把项目并入 careers 列表
+        elif category == 'career':
             result.careers.append(block)
-            continue
-
-        # 其余视为非目标块，忽略
-        continue
-
-        # 启发式结构化拆分（尽量提取 company/title/period/responsibilities/technologies）
-    def split_career_block(block: str) -> Dict[str, Any]:
-        lines = [l.strip() for l in block.splitlines() if l.strip()]
-        item: Dict[str, Any] = { 'company': None, 'title': None, 'period': None, 'responsibilities': [], 'technologies': [] }
-        if not lines:
-            return item
-        # 第一行若包含公司关键词，则作为 company 或 title
-        first = lines[0]
-        # 清理 company 字段：去掉页码/长随机串/重复标记等噪声
-        def clean_company_name(name: str) -> str:
-            if not name:
-                return None
-            n = name.strip()
-            # 删除明显的页码/页眉标记
-            n = re.sub(r'第\s*\d+\s*页\s*共\s*\d+\s*页', '', n)
-            n = re.sub(r'第\s*\d+\s*页', '', n)
-            # 删除长混合 ID
-            n = re.sub(r'[A-Za-z0-9_\-]{12,}', '', n)
-            # 删除重复的分隔符和不可见字符
-            n = re.sub(r'[~]{2,}', '', n)
-            n = n.replace('\u200b', '')
-            n = n.strip()
-            return n or None
-
-        if re.search(r'公司|有限公司|科技|集团|股份', first):
-            item['company'] = clean_company_name(first)
-            rest = lines[1:]
-        else:
-            # 尝试用行内模式提取 title 与 company
-            # 例如: "哲库（ZEKU）科技上海有限公司\n软件开发（高级主管工程师） 2022.12-至今"
-            if len(lines) > 1 and re.search(r'\d{4}', lines[1]):
-                item['company'] = first
-                rest = lines[1:]
-            else:
-                rest = lines
-
-        # 查找 period（形如 2022.12-至今 或 2018.09-2021.09）
-        period_re = re.compile(r'(\d{4}[\.\-年]?\d{0,2})\s*[-—–到至]\s*(\d{4}[\.\-年]?\d{0,2}|至今)', re.I)
-        title_re = re.compile(r'(职位|职务|软件|工程师|主管|经理|技术|开发|负责人|专家)', re.I)
-        tech_regex_local = re.compile(r'\b(Python|Java|C\+\+|C#|Go|Golang|Django|Flask|Docker|Kubernetes|FPGA|WiFi|BT|5G|4G|SMF)\b', re.I)
-        # 先把整个块传给 NER（若可用），以获取 ORG/DATE/PER 提示，然后优先使用 NER 结果
-        ner_entities = []
-        if _USE_TRANSFORMERS_NER:
-            ner_pipe = _get_ner_pipeline()
-            if ner_pipe:
-                try:
-                    ner_entities = ner_pipe(block)
-                except Exception:
-                    ner_entities = []
-
-        # 解析 NER 输出，尽可能保留 offset(start/end)以便合并相邻实体
-        ner_orgs: List[Dict[str, Any]] = []
-        ner_pers: List[Dict[str, Any]] = []
-        ner_dates: List[Dict[str, Any]] = []
-        if ner_entities:
-            for ent in ner_entities:
-                g = (ent.get('entity_group') or ent.get('entity') or '').upper()
-                w = (ent.get('word') or ent.get('entity') or '').strip()
-                if not w:
-                    continue
-                start = ent.get('start')
-                end = ent.get('end')
-                rec = {'word': w, 'start': start, 'end': end}
-                if g in ('ORG', 'ORGANIZATION'):
-                    ner_orgs.append(rec)
-                elif g in ('PER', 'PERSON'):
-                    ner_pers.append(rec)
-                elif g in ('DATE', 'TIME'):
-                    ner_dates.append(rec)
-
-        # helper to sort by start if available else keep original order
-        def _sort_by_start(lst: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-            if not lst:
-                return lst
-            if all(x.get('start') is not None for x in lst):
-                return sorted(lst, key=lambda x: x['start'])
-            return lst
-
-        ner_orgs = _sort_by_start(ner_orgs)
-        ner_pers = _sort_by_start(ner_pers)
-        ner_dates = _sort_by_start(ner_dates)
-
-        # company: 选择最长的 ORG（排除过短的噪声）
-        if ner_orgs:
-            cand = [o['word'] for o in ner_orgs if len(re.sub(r'\s+', '', o['word'])) > 1]
-            if cand:
-                cand = sorted(cand, key=lambda x: len(x), reverse=True)
-                item['company'] = clean_company_name(cand[0])
-
-        # name: 首个 PER
-        if ner_pers and not result.name:
-            result.name = ner_pers[0]['word']
-
-        # period: 合并相邻的 DATE 实体为一个 period 字符串
-        if ner_dates:
-            merged_dates: List[str] = []
-            if all(d.get('start') is not None for d in ner_dates):
-                # 使用 start/end 进行合并：当相邻实体间距很小（例如 <=2）视为同一日期片段
-                cur = ner_dates[0].copy()
-                for nxt in ner_dates[1:]:
-                    if cur.get('end') is not None and nxt.get('start') is not None and (nxt['start'] - cur['end'] <= 2):
-                        # 合并
-                        cur['word'] = cur['word'] + nxt['word']
-                        cur['end'] = nxt.get('end')
-                    else:
-                        merged_dates.append(cur['word'])
-                        cur = nxt.copy()
-                merged_dates.append(cur['word'])
-            else:
-                # 没有偏移信息，按顺序合并连续的数字/年/月/token序列
-                buf = ner_dates[0]['word']
-                for rec in ner_dates[1:]:
-                    w = rec['word']
-                    # 如果当前 buf 或 w 包含中文年/月或 '.' 或 '-'，把它们合并
-                    if re.search(r'[年月/\.-]', buf) or re.search(r'[年月/\.-]', w) or (len(w) <= 4 and w.isdigit() and len(buf) <= 6):
-                        buf = buf + w
-                    else:
-                        merged_dates.append(buf)
-                        buf = w
-                merged_dates.append(buf)
-
-            # 过滤掉明显是年龄（例如单个数字 28 且与 result.age 相等）的候选
-            cleaned_md = []
-            for md in merged_dates:
-                md_clean = re.sub(r'[^0-9年月日/\.-]', '', md)
-                if result.age and re.fullmatch(r'\d{1,3}', md_clean) and md_clean == str(result.age):
-                    continue
-                cleaned_md.append(md)
-            if cleaned_md:
-                if len(cleaned_md) == 1:
-                    item['period'] = cleaned_md[0]
-                else:
-                    item['period'] = ' - '.join(cleaned_md)
-
-        for ln in rest:
-            # period
-            pm = period_re.search(ln)
-            if pm and not item['period']:
-                item['period'] = pm.group(0)
-                continue
-            # title
-            if not item['title'] and title_re.search(ln):
-                item['title'] = ln
-                continue
-            # techs
-            techs = tech_regex_local.findall(ln)
-            if techs:
-                item['technologies'].extend([t for t in techs if t])
-            # responsibilities（非标题/时间行则归为职责）
-            if not title_re.search(ln) and not period_re.search(ln):
-                item['responsibilities'].append(ln)
-
-        # 简单去重
-        item['technologies'] = list(dict.fromkeys(item['technologies']))
-        # 进一步标准化 company 名称
-        if item.get('company'):
-            item['company'] = clean_company_name(item['company'])
-        return item
+            career_heads.append(b_idx[0])
 
+    tracer.Stage('career_structuring')
     # 构建结构化列表（对所有 careers 进行结构化拆分）
     # 去重/清理列表的辅助函数
     def clean_list(lst: List[str]) -> List[str]:
@@ -700,13 +1019,11 @@ def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
 
     # 先对碎片做一次预处理：把短段/编号段合并到其上一条 career（如果合适），以减少断裂
     merged_careers = []
-    numbered_prefix_re = re.compile(r'^\s*(?:\d+[\.、\)\-]|\d+\.?\d+\s*\.|\(\d+\)|（\d+）)')
-    for c in result.careers:
+    for c, head in zip(result.careers, career_heads):
         c_strip = c.strip()
         # 短片段判断：长度较短或首行为编号或只有一行且以小写词/数字开头
-        lines_c = [l for l in c_strip.splitlines() if l.strip()]
-        is_short = len(c_strip) < 120 or len(lines_c) == 1 and len(lines_c[0]) < 80
-        starts_numbered = bool(lines_c and numbered_prefix_re.match(lines_c[0]))
+        is_short = len(c_strip) < 120 or '\n' not in c_strip and len(c_strip) < 80
+        starts_numbered = bool(line_labels[head] & LINE_NUMBERED)
         if (is_short or starts_numbered) and merged_careers:
             # 如果上一条很长或上一条包含公司信息，合并到上一条
             prev = merged_careers[-1]
@@ -719,8 +1036,86 @@ def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
     # 用合并后的列表替代
     result.careers = merged_careers
 
-    for c in result.careers:
-        item = split_career_block(c)
+    tracer.Stage('ner')
+    # 一次批量 NER：header_candidate 与全部 career 条目合并为同一批次推理，
+    # 结果按下标映射回各自文本（header 用于姓名识别，career 用于结构化拆分）
+    header_ents: List[Dict[str, Any]] = []
+    career_ents: List[List[Dict[str, Any]]] = [[] for _ in result.careers]
+    if fast:
+        # 词表只识别机构名，header 用于姓名识别，不需要
+        career_ents = [get_gazetteer().Entities(c) for c in result.careers]
+    elif _USE_TRANSFORMERS_NER:
+        try:
+            header_text = header_candidate if header_candidate and re.search(r'[\u4e00-\u9fffA-Za-z]', header_candidate) else ''
+            ner_results = _run_ner_batch([header_text] + result.careers)
+            header_ents, career_ents = ner_results[0], ner_results[1:]
+        except Exception:
+            # 不阻塞，继续使用后续启发式方法
+            pass
+
+    tracer.Stage('header_extraction')
+    # 在 header_candidate 中寻找候选姓名（排除诸如'年龄'等词）；需在结构化拆分前确定 result.name
+    stop_words_for_name = set(['年龄', '性别', '个人优势', '求职意向', '期望薪资', '期望城市', '工作经验'])
+    candidate_name = None
+    # 优先从 header_items 中找纯中文 2-4 字项（可能含性别尾缀）
+    for it in header_items:
+        if not it:
+            continue
+        it2 = it.strip()
+        if any(sw in it2 for sw in stop_words_for_name):
+            continue
+        # 清理常见噪声
+        it2_clean = re.sub(r'[^-\u4e00-\u9fa5]', '', it2)
+        # 优先选择纯中文且长度为2-4的项
+        if re.fullmatch(r'[\u4e00-\u9fa5]{2,4}', it2_clean):
+            candidate_name = it2_clean
+            break
+    # 其次使用 transformers NER 在 header_candidate 上识别的人名 (PER)
+    # ents 可能为 [{'entity_group':'PER','word':'张三',...}, ...] 或 transformers 早期格式
+    if not candidate_name:
+        for ent in header_ents:
+            g = (ent.get('entity_group') or ent.get('entity') or '').upper()
+            w = (ent.get('word') or ent.get('entity') or '').strip()
+            if not w:
+                continue
+            if g in ('PER', 'PERSON', '人名'):
+                # 优先接受 2-4 个汉字或常见 latin 名称（含空格或 .），避免把职位/公司误识别
+                clean_w = re.sub(r'[^\u4e00-\u9fa5A-Za-z\s\.-]', '', w)
+                # 验证 NER 输出不是乱码（例如包含替换字符）且至少含有合理汉字或英文字母
+                if '\ufffd' in clean_w:
+                    continue
+                if re.fullmatch(r'[\u4e00-\u9fa5]{2,4}', clean_w) or re.fullmatch(r'[A-Za-z\s\.-]{2,40}', clean_w):
+                    candidate_name = clean_w.strip()
+                    break
+    # 如果未找到且可用 jieba，尝试 posseg 在 header_candidate 上找 nr
+    if not candidate_name and use_jieba and re.search(r'[\u4e00-\u9fff]', header_candidate):
+        try:
+            seg = get_segmented()
+            header_tokens = seg.tokens_in_range(*seg.line_range(0, header_line_idx[-1] + 1)) if seg else []
+            for w, flag, _, _ in header_tokens:
+                if flag == 'nr' and 2 <= len(w) <= 4 and w not in stop_words_for_name:
+                    candidate_name = w
+                    break
+        except Exception:
+            pass
+
+    # 如果找到候选姓名，写入 result
+    if candidate_name:
+        result.name = candidate_name
+
+    # 最后的回退：如果仍未识别到姓名，从 header_candidate 或全文抓取第一个符合姓名模式的中文词
+    if not result.name:
+        m = re.search(r'([\u4e00-\u9fa5]{2,4})\s*(?:男|女)?', header_candidate)
+        if m:
+            result.name = m.group(1)
+        else:
+            m2 = re.search(r'([\u4e00-\u9fa5]{2,4})\s*(?:男|女)?', s)
+            if m2:
+                result.name = m2.group(1)
+
+    tracer.Stage('career_structuring')
+    for c, c_ents in zip(result.careers, career_ents):
+        item = _split_career_block_memo(c, c_ents, result)
         if item.get('company') is None and result.careers_struct:
             prev = result.careers_struct[-1]
             # 如果当前片段有 title 且前一条没有 title，则填充为 title；否则把 title 当作一条职责插入
@@ -742,16 +1137,17 @@ def ResumeParse(text: str, debug: bool = False) -> ResumeParseResult:
     for e in result.education:
         result.education_struct.append({'raw': e})
 
+    tracer.Stage('education_fallback')
     # 回退扫描：如果未识别到教育经历，从全文中查找包含学校/学院/本科/学位/培训等关键词的行
     if not result.education:
         edu_candidates = []
-        lines = [ln.strip() for ln in s_clean.splitlines() if ln.strip()]
-        for i, ln in enumerate(lines):
-            if re.search(r'(大学|学院|学校|本科|硕士|博士|学位)', ln, re.I):
+        lines = [i for i in body_idx if clean_lines[i]]
+        for k, i in enumerate(lines):
+            if line_labels[i] & LINE_SCHOOL:
                 # 合并相邻的时间/学位行
-                group = ln
-                if i+1 < len(lines) and re.search(r'\d{4}[\.\-年]', lines[i+1]):
-                    group = group + ' ' + lines[i+1]
+                group = clean_lines[i]
+                if k + 1 < len(lines) and line_labels[lines[k + 1]] & LINE_PERIOD:
+                    group = group + ' ' + clean_lines[lines[k + 1]]
                 edu_candidates.append(group)
         if edu_candidates:
             result.education = clean_list(edu_candidates)
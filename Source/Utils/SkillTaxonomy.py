@@ -0,0 +1,95 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from Source.Utils.KeywordScanner import build_trie_pattern, fold_case
+from Source.Utils.Gazetteer import GAZETTEER_DIR
+
+# 技能词表：每个技能有一个规范 id 与若干名称/同义词（例如 go: Go | Golang | Go语言，kubernetes: Kubernetes | K8s），
+# careers_struct[*]['technologies'] 中保存规范 id。词表为可编辑的纯文本文件，路径可通过环境变量 CCRESUME_SKILLS_FILE 覆盖。
+# 全部名称构建为一棵字典树正则（ASCII 单词边界，忽略大小写），扫描代价与文本长度成线性、与词表规模无关；
+# 修改词表后调用 reload_skill_taxonomy()
+SKILLS_FILE = os.environ.get('CCRESUME_SKILLS_FILE', os.path.join(GAZETTEER_DIR, 'skills.txt'))
+
+_ID_RE = re.compile(r'[a-z0-9][a-z0-9_.+#\-]*')
+
+
+def load_skills_file(path: str) -> Dict[str, List[str]]:
+    """读取 `id: 名称 | 同义词 | ...` 格式的词表（# 开头为注释），返回 {id: [名称, ...]}，第一个名称为显示名。"""
+    skills: Dict[str, List[str]] = {}
+    with open(path, encoding='utf-8') as fh:
+        for lineno, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            skill_id, sep, names = line.partition(':')
+            skill_id = skill_id.strip()
+            if not sep or not _ID_RE.fullmatch(skill_id):
+                raise ValueError(f'{path}:{lineno}: expected "id: name | synonym ...", got {line!r}')
+            skills.setdefault(skill_id, []).extend(n.strip() for n in names.split('|') if n.strip())
+    return skills
+
+
+class SkillTaxonomy:
+    """技能名称到规范 id 的匹配器。同一起点取最长的名称（K8s 集群 -> kubernetes，C++ 不会被当作 C）；
+    ASCII 名称要求两侧不是 ASCII 字母/数字，汉字相邻不受影响（熟悉Golang开发 -> go）。
+    同一名称出现在多个 id 下时以先出现的为准。只匹配词表中列出的名称，规范 id 本身（c、can 等）不参与匹配。"""
+
+    def __init__(self, skills: Dict[str, Iterable[str]]):
+        self._id_of: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        for skill_id, names in skills.items():
+            names = list(names) or [skill_id]
+            self._names[skill_id] = names[0]
+            for name in names:
+                self._id_of.setdefault(fold_case(name), skill_id)
+        self._regex = None
+        if self._id_of:
+            # 起始字符集前置检查，使正则引擎能快速跳过不可能命中的位置（同 KeywordScanner）
+            first = '[' + ''.join(sorted({re.escape(ch) for k in self._id_of for ch in (k[0], k[0].upper())})) + ']'
+            self._regex = re.compile(f'(?={first})(?:{build_trie_pattern(self._id_of, word_boundaries=True)})')
+        h = hashlib.blake2b(digest_size=4)
+        for key in sorted(self._id_of):
+            h.update(f'{key}\t{self._id_of[key]}\n'.encode('utf-8'))
+        # 词表内容的指纹，用于区分不同词表下的解析结果（见 parser_version_tag）
+        self.version = h.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def Scan(self, text: str) -> List[Tuple[str, int, int]]:
+        """全部不重叠的命中 (skill_id, start, end)，按出现顺序。"""
+        if not text or self._regex is None:
+            return []
+        return [(self._id_of[fold_case(m.group())], m.start(), m.end()) for m in self._regex.finditer(text)]
+
+    def Match(self, text: str) -> List[str]:
+        """文本中出现的技能 id，按首次出现顺序去重。"""
+        return list(dict.fromkeys(skill_id for skill_id, _, _ in self.Scan(text)))
+
+    def CanonicalId(self, name: str) -> Optional[str]:
+        """名称/同义词（或 id 本身）对应的规范 id，不在词表中时返回 None。"""
+        key = fold_case((name or '').strip())
+        return self._id_of.get(key) or (key if key in self._names else None)
+
+    def DisplayName(self, skill_id: str) -> str:
+        return self._names.get(skill_id, skill_id)
+
+
+_SKILL_TAXONOMY: Optional[SkillTaxonomy] = None
+_SKILL_TAXONOMY_LOCK = threading.Lock()
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """懒加载 SKILLS_FILE；文件缺失时为空词表（不提取技术栈）。"""
+    global _SKILL_TAXONOMY
+    with _SKILL_TAXONOMY_LOCK:
+        if _SKILL_TAXONOMY is None:
+            _SKILL_TAXONOMY = SkillTaxonomy(load_skills_file(SKILLS_FILE) if os.path.exists(SKILLS_FILE) else {})
+        return _SKILL_TAXONOMY
+
+
+def reload_skill_taxonomy() -> SkillTaxonomy:
+    global _SKILL_TAXONOMY
+    with _SKILL_TAXONOMY_LOCK:
+        _SKILL_TAXONOMY = None
+    return get_skill_taxonomy()
@@ -0,0 +1,62 @@
+import re
+import pytest
+import Source.Utils.ParseTrace as ParseTrace
+from Source.Utils.ParseTrace import redact_pii
+
+MOBILE_RE = re.compile(r'(?<!\d)(?:\+?86[-\s]?)?(1[3-9]\d{9})(?!\d)')
+
+
+@pytest.fixture(autouse=True)
+def salt(monkeypatch):
+    monkeypatch.setattr(ParseTrace, 'REPLAY_SALT', 'test-salt')
+
+
+def _digits(text):
+    return re.sub(r'\D', '', text)
+
+
+@pytest.mark.parametrize('text', [
+    '13558910629',
+    '135-5891-0629',
+    '135 5891 0629',
+    '135.5891.0629',
+    '(135) 5891 0629',
+    '+8613558910629',
+    '8613558910629',
+    '+86 135 5891 0629',
+    '+86-135-5891-0629',
+    '86 13558910629',
+])
+def test_mobile_formats_are_masked(text):
+    redacted = redact_pii(f'电话：{text} | 邮箱：a@b.com')
+    assert '5891' not in redacted and '0629' not in redacted
+    # 脱敏后仍按手机号解析
+    compact = redacted.replace(' ', '').replace('-', '').replace('.', '').replace('(', '').replace(')', '')
+    assert MOBILE_RE.search(compact)
+
+
+@pytest.mark.parametrize('text', [
+    '010-88886666',
+    '(010) 8888-6666',
+    '0755 8888 6666',
+    '+1 415 555 0100',
+    '+1 444-217-0900',
+    '8888 6666',
+    '888-6666',
+    '123456',
+])
+def test_landline_and_loose_formats_are_masked(text):
+    redacted = redact_pii(f'Phone: {text}')
+    assert _digits(redacted) != _digits(f'Phone: {text}')
+    # 分隔符位置与数字个数不变
+    assert re.sub(r'\d', '0', redacted) == re.sub(r'\d', '0', f'Phone: {text}')
+
+
+def test_same_number_masks_the_same_in_every_format():
+    a, b = redact_pii('135-5891-0629'), redact_pii('+86 135 5891 0629')
+    assert _digits(a) == _digits(b)[2:]
+
+
+def test_dates_are_kept():
+    text = '2018.07-2021.04 2018-2021 2022年9月 - 2024年2月 201807'
+    assert redact_pii(text) == text
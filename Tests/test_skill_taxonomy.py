@@ -0,0 +1,21 @@
+from Source.Utils.SkillTaxonomy import SkillTaxonomy, get_skill_taxonomy
+
+
+def test_short_ids_are_not_matched_as_names():
+    taxonomy = get_skill_taxonomy()
+    for text in ['负责C端产品运营', 'B端和C端用户增长', '完成C轮融资', '方案 A/B/C 对比', 'Plan C', 'I can do it']:
+        assert taxonomy.Match(text) == [], text
+
+
+def test_listed_names_still_match():
+    taxonomy = get_skill_taxonomy()
+    assert taxonomy.Match('熟悉C语言和Golang，精通C++') == ['c', 'go', 'cpp']
+    assert taxonomy.Match('负责CAN总线协议调试') == ['can']
+
+
+def test_canonical_id_accepts_the_id_itself():
+    taxonomy = SkillTaxonomy({'c': ['C语言', 'ANSI C']})
+    assert taxonomy.Match('C端') == []
+    assert taxonomy.CanonicalId('c') == 'c'
+    assert taxonomy.CanonicalId('ansi c') == 'c'
+    assert taxonomy.CanonicalId('C端') is None
@@ -1,50 +1,74 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+from flask import Flask, Blueprint, Response, render_template, request, redirect, url_for, jsonify, current_app, g
+import atexit
 import os
-from werkzeug.utils import secure_filename
+import time
 from Source.ProgramInstance import ProgramInstance
-from Source.System.ResumeInput.ResumeInputHandler import ResumeInputHandler
+from Source.System.ResumeInput.ResumeInputHandler import ResumeInputHandler, UploadedResume
+from Source.System.ResumeInput.UploadArchive import upload_name, save_upload, archive_upload
+from Source.Utils.ResumeParseUtils import get_ner_status, PARSE_MODES, PARSE_MODE_ACCURATE
+from Source.Utils.Metrics import REQUESTS_IN_FLIGHT, UPLOAD_BYTES, JOBS, render_metrics
 
-app = Flask(__name__)
+bp = Blueprint('ccresume', __name__)
 
-# upload folder
-UPLOAD_DIR = os.path.join("Saved", "Uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+def create_app(begin_play: bool = True) -> Flask:
+    """应用工厂：创建 Flask 应用并执行一次 ProgramInstance.BeginPlay，进程退出时执行 EndPlay。
+    WSGI 服务器使用 `app:create_app()`；`flask --app app run` 会自动发现此工厂。"""
+    app = Flask(__name__)
+    app.register_blueprint(bp)
+    instance = ProgramInstance()
+    app.extensions['program_instance'] = instance
+    if begin_play:
+        instance.BeginPlay()
+        atexit.register(instance.EndPlay)
+    return app
+
+
+@bp.before_request
+def _track_in_flight():
+    g.in_flight_endpoint = request.endpoint or 'unknown'
+    REQUESTS_IN_FLIGHT.Inc(endpoint=g.in_flight_endpoint)
 
 
-@app.route("/")
+@bp.teardown_request
+def _untrack_in_flight(exc=None):
+    endpoint = g.pop('in_flight_endpoint', None)
+    if endpoint is not None:
+        REQUESTS_IN_FLIGHT.Dec(endpoint=endpoint)
+
+
+@bp.route("/")
 def home():
-    # 每次访问主页时，创建 ProgramInstance 并执行 BeginPlay
-    instance = ProgramInstance()
-    instance.BeginPlay()
     return render_template("Home.html")  # 假设你的 Home.html 在 templates 目录下
 
 
-@app.route("/ResumeInput", methods=["GET", "POST"])
+@bp.route("/ResumeInput", methods=["GET", "POST"])
 def resume_input():
     allowed_ext = {".pdf", ".doc", ".docx"}
 
     if request.method == "POST":
-        # 保存上传的单个文件（仅允许特定扩展）
+        # 读取上传的单个文件（仅允许特定扩展），在内存中解析，原件异步归档
         f = request.files.get("file")
-        saved_paths = []
+        uploads = []
         if f and f.filename:
             _, ext = os.path.splitext(f.filename)
             if ext.lower() not in allowed_ext:
-                return redirect(url_for("resume_input", error=1))
-            filename = secure_filename(f.filename)
-            dest = os.path.join(UPLOAD_DIR, filename)
-            f.save(dest)
-            saved_paths.append(dest)
+                return redirect(url_for(".resume_input", error=1))
+            filename, stored_name = upload_name(f.filename)
+            data = f.read()
+            UPLOAD_BYTES.Observe(len(data))
+            archive_upload(data, stored_name)
+            uploads.append(UploadedResume(filename, data))
 
         # 处理表单数据（示例）
         form = request.form.to_dict()
 
         handler = ResumeInputHandler()
         # 调用后端系统处理
-        handler.PerformSubmit(saved_paths)
+        handler.PerformSubmit(uploads, form)
 
         # 重定向回 GET 并显示成功
-        return redirect(url_for("resume_input", success=1))
+        return redirect(url_for(".resume_input", success=1))
 
     # GET 请求：渲染表单
     success = request.args.get("success")
@@ -52,62 +76,165 @@ def resume_input():
     return render_template("ResumeInput/ResumeInput.html", success=success, error=error)
 
 
-@app.route('/ResumeInput/ajax', methods=['POST'])
+@bp.route('/ResumeInput/ajax', methods=['POST'])
 def resume_input_ajax():
-    """AJAX 端点：接收文件和表单字段，保存文件并调用 PerformSubmit，返回 JSON。"""
+    """AJAX 端点：接收文件和表单字段，在内存中提取并解析（原件异步归档），返回 JSON。"""
     try:
         allowed_ext = {'.pdf', '.doc', '.docx'}
         files = request.files.getlist('file')
-        saved_paths = []
+        uploads = []
+        stored_names = []
         saved_names = []
-        import uuid
         for f in files:
             if not f or not f.filename:
                 continue
             _, ext = os.path.splitext(f.filename)
             if ext.lower() not in allowed_ext:
                 return jsonify(ok=False, error='bad_extension'), 400
-            short_name = secure_filename(f.filename)
-            saved_name = f"{uuid.uuid4().hex}_{short_name}"
-            dest = os.path.join(UPLOAD_DIR, saved_name)
-            try:
-                f.save(dest)
-            except Exception:
-                app.logger.exception('Failed to save ajax-uploaded file')
-                return jsonify(ok=False, error='save_failed'), 500
-            saved_paths.append(dest)
+            short_name, stored_name = upload_name(f.filename)
+            data = f.read()
+            UPLOAD_BYTES.Observe(len(data))
+            uploads.append(UploadedResume(short_name, data))
+            stored_names.append(stored_name)
             saved_names.append(short_name)
 
         form = request.form.to_dict()
         handler = ResumeInputHandler()
+        # 解析模式：accurate（默认）或 fast（批量回填，跳过 NER，机构名按词表识别）；后台任务只支持 accurate
+        mode = request.args.get('mode') or form.get('mode') or PARSE_MODE_ACCURATE
+        if mode not in PARSE_MODES:
+            return jsonify(ok=False, error='bad_mode'), 400
+        is_async = request.args.get('async') == '1' or form.get('async') == '1'
+        if is_async and mode != PARSE_MODE_ACCURATE:
+            return jsonify(ok=False, error='async_mode_unsupported'), 400
+
+        # 提交-轮询模式：只入队并立即返回任务 id，解析在后台工作进程中进行；
+        # 工作进程按路径读取文件，因此这里需要同步落盘
+        if is_async:
+            if not uploads:
+                return jsonify(ok=False, error='no_file'), 400
+            try:
+                saved_paths = [save_upload(u.data, name) for u, name in zip(uploads, stored_names)]
+            except Exception:
+                current_app.logger.exception('Failed to save ajax-uploaded file')
+                return jsonify(ok=False, error='save_failed'), 500
+            job_id = handler.SubmitDragResumes(saved_paths, saved_names)
+            return jsonify(ok=True, job_id=job_id, filenames=saved_names,
+                           status_url=url_for('.resume_input_job', job_id=job_id)), 202
+
+        for upload, stored_name in zip(uploads, stored_names):
+            archive_upload(upload.data, stored_name)
+
         texts = []
-        print(f"[ResumeInput]拖拽简历 saved_paths: {saved_paths}")
+        timings = []
+        print(f"[ResumeInput]拖拽简历 filenames: {saved_names}")
+        t0 = time.perf_counter()
         try:
-            if hasattr(handler, 'PerformDragResume') and saved_paths:
-                parsed = handler.PerformDragResume(saved_paths[0])
-                # 如果返回的是 dataclass（ResumeParseResult），将其转为字典以便 JSON 序列化
-                try:
-                    from dataclasses import asdict
-                    parsed_dict = asdict(parsed) if not isinstance(parsed, dict) else parsed
-                except Exception:
-                    # 不是 dataclass 或转换失败，直接使用原值
-                    parsed_dict = parsed
-                texts.append(parsed_dict)
-                # 也在顶层返回 parsed，以便前端直接读取（兼容旧客户端）
-                parsed_top = parsed_dict
+            if hasattr(handler, 'PerformDragResumes') and uploads:
+                # 所有上传文件在进程池中并行提取与解析，结果按上传顺序返回
+                outcomes = handler.PerformDragResumes(uploads, mode)
+                for name, out in zip(saved_names, outcomes):
+                    parsed = out['result']
+                    # 如果返回的是 dataclass（ResumeParseResult），将其转为字典以便 JSON 序列化
+                    try:
+                        from dataclasses import asdict
+                        parsed_dict = asdict(parsed) if parsed is not None and not isinstance(parsed, dict) else parsed
+                    except Exception:
+                        # 不是 dataclass 或转换失败，直接使用原值
+                        parsed_dict = parsed
+                    texts.append(parsed_dict)
+                    elapsed = out['elapsed_ms']
+                    timings.append({'filename': name, 'elapsed_ms': round(elapsed, 1) if elapsed is not None else None})
         except Exception:
-            app.logger.exception('Error while performing drag resume')
-            texts.append(None)
+            current_app.logger.exception('Error while performing drag resume')
+            texts = [None] * len(uploads)
+        total_ms = round((time.perf_counter() - t0) * 1000, 1)
 
-        # 如果存在解析结果，把第一个作为 top-level parsed
+        # 如果存在解析结果，把第一个作为 top-level parsed（兼容旧客户端）
         parsed_return = None
         if texts:
             parsed_return = texts[0]
-        return jsonify(ok=True, filenames=saved_names, texts=texts, parsed=parsed_return)
+        return jsonify(ok=True, filenames=saved_names, texts=texts, parsed=parsed_return, timings=timings, total_ms=total_ms)
     except Exception:
-        app.logger.exception('Unhandled exception in resume_input_ajax')
+        current_app.logger.exception('Unhandled exception in resume_input_ajax')
         return jsonify(ok=False, error='internal_error'), 500
 
 
+@bp.route('/ResumeInput/jobs/<job_id>')
+def resume_input_job(job_id):
+    """后台解析任务状态：queued/running/done/failed；完成后附带 texts 与 timings（与同步接口格式一致）。"""
+    job = ResumeInputHandler().GetJob(job_id)
+    if job is None:
+        return jsonify(ok=False, error='not_found'), 404
+    if job.get('texts'):
+        job['parsed'] = job['texts'][0]
+    return jsonify(ok=True, **job)
+
+
+@bp.route('/Resume/search')
+def resume_search():
+    """简历检索：q 为全文关键词（空格分隔，均需命中），name/company 前缀匹配，phone/email/tech 精确匹配；
+    page/per_page 分页。"""
+    args = request.args
+    try:
+        page = int(args.get('page', 1))
+        per_page = int(args.get('per_page', 20))
+    except ValueError:
+        return jsonify(ok=False, error='bad_page'), 400
+    t0 = time.perf_counter()
+    found = ResumeInputHandler().SearchResumes(
+        q=args.get('q'), name=args.get('name'), phone=args.get('phone'), email=args.get('email'),
+        company=args.get('company'), technology=args.get('tech'), page=page, per_page=per_page)
+    return jsonify(ok=True, elapsed_ms=round((time.perf_counter() - t0) * 1000, 2), **found)
+
+
+@bp.route('/Resume/rank', methods=['GET', 'POST'])
+def resume_rank():
+    """按与职位描述（jd，GET 参数或 POST 表单/JSON）的 BM25 相关度返回简历库中前 top_k 份简历。"""
+    values = request.get_json(silent=True) or request.values
+    jd = (values.get('jd') or '').strip()
+    if not jd:
+        return jsonify(ok=False, error='no_job_description'), 400
+    try:
+        top_k = int(values.get('top_k', 20))
+    except (TypeError, ValueError):
+        return jsonify(ok=False, error='bad_top_k'), 400
+    t0 = time.perf_counter()
+    try:
+        ranked = ResumeInputHandler().RankResumes(jd, top_k)
+    except RuntimeError:
+        current_app.logger.exception('Resume ranking unavailable')
+        return jsonify(ok=False, error='ranking_unavailable'), 503
+    return jsonify(ok=True, elapsed_ms=round((time.perf_counter() - t0) * 1000, 2), **ranked)
+
+
+@bp.route('/Resume/<int:resume_id>')
+def resume_detail(resume_id):
+    """简历库中一份简历的完整解析结果。"""
+    resume = ResumeInputHandler().GetResume(resume_id)
+    if resume is None:
+        return jsonify(ok=False, error='not_found'), 404
+    return jsonify(ok=True, resume=resume)
+
+
+@bp.route('/Ner/status')
+def ner_status():
+    """NER 模型状态：是否已加载/加载中/已禁用，以及加载耗时。"""
+    return jsonify(get_ner_status())
+
+
+@bp.route('/metrics')
+def metrics():
+    """Prometheus 指标（文本格式），合并 Web 进程、解析进程池与后台工作进程的数据。"""
+    try:
+        for status, count in ResumeInputHandler().GetJobCounts().items():
+            JOBS.Set(count, status=status)
+    except Exception:
+        current_app.logger.exception('Failed to read job queue counts')
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 if __name__ == "__main__":
+    # 调试重载器的父进程只负责监视文件变化，不初始化资源
+    app = create_app(begin_play=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
     app.run(debug=True)